@@ -10,11 +10,18 @@ Jinja to avoid fragile Python f-string/JS interactions.
 import os
 import json
 import ssl
+import tempfile
+import threading
+import time
 import urllib3
 import requests
 from datetime import datetime
 from flask import Flask, render_template_string, request, jsonify
 from pyairtable import Api
+from pyairtable.api.cache import NegativeCache, SchemaCache
+from pyairtable.api.circuit import META, RECORDS_READ, RECORDS_WRITE, CircuitBreaker
+from pyairtable.api.ratelimit import FileRateLimiter
+from pyairtable.exceptions import CircuitOpenError
 from dotenv import load_dotenv
 import re
 import unicodedata
@@ -40,13 +47,48 @@ AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
 if not AIRTABLE_TOKEN or not AIRTABLE_BASE_ID:
         raise RuntimeError('Set AIRTABLE_TOKEN and AIRTABLE_BASE_ID in environment')
 
+# All gunicorn workers on this host share one per-base request budget through
+# bucket files in this directory, so adding workers doesn't add 429s.
+AIRTABLE_RATE_LIMIT_DIR = os.getenv('AIRTABLE_RATE_LIMIT_DIR') or os.path.join(
+        tempfile.gettempdir(), 'pyairtable-ratelimit'
+)
+
+# Base schemas are shared by every api.base(...) call, kept for AIRTABLE_SCHEMA_TTL
+# seconds, and saved under AIRTABLE_SCHEMA_CACHE_DIR so restarts start warm.
+AIRTABLE_SCHEMA_TTL = int(os.getenv('AIRTABLE_SCHEMA_TTL', '300'))
+AIRTABLE_SCHEMA_CACHE_DIR = os.getenv('AIRTABLE_SCHEMA_CACHE_DIR') or os.path.join(
+        tempfile.gettempdir(), 'pyairtable-schema'
+)
+
+# Tables and endpoints the token can't use (403/404) fail fast for this many
+# seconds instead of spending the rate limit on the same refusal; 0 disables this.
+AIRTABLE_NEGATIVE_CACHE_TTL = int(os.getenv('AIRTABLE_NEGATIVE_CACHE_TTL', '300'))
+
+# Airtable calls give up after these timeouts instead of holding a worker indefinitely,
+# and once most recent calls of one kind (reading records, writing records, metadata)
+# have failed or been slow, the rest fail immediately for AIRTABLE_CIRCUIT_RESET_TIMEOUT
+# seconds so pages can fall back to cached data.
+AIRTABLE_CONNECT_TIMEOUT = float(os.getenv('AIRTABLE_CONNECT_TIMEOUT', '5'))
+AIRTABLE_READ_TIMEOUT = float(os.getenv('AIRTABLE_READ_TIMEOUT', '20'))
+AIRTABLE_CIRCUIT_RESET_TIMEOUT = float(os.getenv('AIRTABLE_CIRCUIT_RESET_TIMEOUT', '30'))
+
 app = Flask(__name__)
 
 # Use shared helpers from airtable_helpers.py (imported above)
 
 # Initialize Airtable client
 try:
-        api = Api(AIRTABLE_TOKEN)
+        api = Api(
+                AIRTABLE_TOKEN,
+                timeout=(AIRTABLE_CONNECT_TIMEOUT, AIRTABLE_READ_TIMEOUT),
+                circuit_breaker=CircuitBreaker(
+                        slow_call_duration=AIRTABLE_READ_TIMEOUT / 2,
+                        reset_timeout=AIRTABLE_CIRCUIT_RESET_TIMEOUT,
+                ),
+                rate_limit=FileRateLimiter(AIRTABLE_RATE_LIMIT_DIR),
+                schema_cache=SchemaCache(ttl=AIRTABLE_SCHEMA_TTL, path=AIRTABLE_SCHEMA_CACHE_DIR),
+                negative_cache=NegativeCache(ttl=AIRTABLE_NEGATIVE_CACHE_TTL) if AIRTABLE_NEGATIVE_CACHE_TTL > 0 else None,
+        )
         base = api.base(AIRTABLE_BASE_ID)
         try:
                 _ = base.schema()
@@ -60,6 +102,211 @@ except Exception as e:
         base = None
 
 
+# Tables are shown AIRTABLE_PAGE_SIZE records at a time. Airtable addresses pages by
+# offset tokens, so the token for each page we've served is kept (per table and page size)
+# for a few minutes: moving to the next page then costs a single request.
+AIRTABLE_PAGE_SIZE = int(os.getenv('AIRTABLE_PAGE_SIZE', '100'))
+_PAGE_CURSOR_TTL = 240
+_page_cursors = {}
+
+
+def _table_page(table_name, page, page_size):
+        """Return (records, has_next) for the given 1-based page of a table."""
+        key = (table_name, page_size)
+        saved_at, cursors = _page_cursors.get(key, (0, None))
+        if cursors is None or time.monotonic() - saved_at > _PAGE_CURSOR_TTL:
+                cursors = {1: None}
+        table = base.table(table_name)
+        try:
+                current = max(n for n in cursors if n <= page)
+                result = table.page(cursors[current], page_size=page_size)
+                while current < page and 'offset' in result:
+                        current += 1
+                        cursors[current] = result['offset']
+                        result = table.page(result['offset'], page_size=page_size)
+        except requests.HTTPError as e:
+                # Airtable expires offsets after a while; start again from the first page
+                if 'LIST_RECORDS_ITERATOR_NOT_AVAILABLE' not in str(e) or cursors == {1: None}:
+                        raise
+                _page_cursors.pop(key, None)
+                return _table_page(table_name, page, page_size)
+        if current < page:
+                return [], False
+        if 'offset' in result:
+                cursors[page + 1] = result['offset']
+        _page_cursors[key] = (time.monotonic(), cursors)
+        return result['records'], 'offset' in result
+
+
+# Record counts on the dashboard only page through record IDs (no fields),
+# and are reused for AIRTABLE_COUNT_TTL seconds before being recounted.
+AIRTABLE_COUNT_TTL = int(os.getenv('AIRTABLE_COUNT_TTL', '60'))
+
+
+# The dashboard's per-table counts are kept as a snapshot which a background thread
+# rebuilds every DASHBOARD_SUMMARY_INTERVAL seconds, so page views (and health checks)
+# never wait for a scan of the base. Each rebuild is saved to DASHBOARD_SUMMARY_PATH,
+# and a worker which finds a recent enough file there uses it instead of rebuilding.
+DASHBOARD_SUMMARY_INTERVAL = int(os.getenv('DASHBOARD_SUMMARY_INTERVAL', '60'))
+DASHBOARD_SUMMARY_PATH = os.getenv('DASHBOARD_SUMMARY_PATH') or os.path.join(
+        tempfile.gettempdir(), f'hse-dashboard-summary-{AIRTABLE_BASE_ID}.json'
+)
+
+
+def _build_summary():
+        """Count the records in every table we can access."""
+        meta = api.base(AIRTABLE_BASE_ID).schema()
+        tables = []
+        failed = []
+        total_records = 0
+        for t in meta.tables:
+                name = t.name
+                try:
+                        count = base.table(name).count(ttl=AIRTABLE_COUNT_TTL)
+                        # Only add table if we have permission to access it
+                        tables.append({'name': name, 'id': t.id, 'count': count})
+                        total_records += count
+                except CircuitOpenError:
+                        # Airtable is failing; keep the previous summary rather than an empty one
+                        raise
+                except Exception as e:
+                        # Skip tables we don't have permission to access
+                        error_msg = str(e).lower()
+                        if 'permission' in error_msg or 'forbidden' in error_msg or 'not found' in error_msg:
+                                print(f'[!] Skipping table {name} (permission denied)')
+                                continue
+                        # For other errors, still add the table with 0 count as fallback,
+                        # flagged so the dashboard and health check report it
+                        print(f'[!] Error counting records in {name}: {e}')
+                        tables.append({'name': name, 'id': t.id, 'count': 0, 'error': str(e)})
+                        failed.append(name)
+        return {
+                'tables': tables,
+                'total_records': total_records,
+                'failed_tables': failed,
+                'generated_at': time.time(),
+        }
+
+
+def _summary_error(summary):
+        """Describe the tables a summary could not count, or return None."""
+        failed = summary.get('failed_tables') or []
+        if not failed:
+                return None
+        return f'could not count records in {len(failed)} table(s): {", ".join(failed)}'
+
+
+class SummarySnapshot:
+        """The latest dashboard summary, rebuilt in the background."""
+
+        def __init__(self, path, interval):
+                self.path = path
+                self.interval = interval
+                self.summary = None
+                self.error = None
+                self._lock = threading.Lock()
+                self._pid = None
+
+        def get(self):
+                """Return the latest summary, building it now if there isn't one yet."""
+                self._start()
+                if self.summary is None:
+                        with self._lock:
+                                if self.summary is None:
+                                        self.refresh()
+                return self.summary
+
+        def age(self):
+                """Seconds since the current summary was built, or None."""
+                if self.summary is None:
+                        return None
+                return round(time.time() - self.summary['generated_at'], 1)
+
+        def refresh(self):
+                shared = self._read()
+                if shared and time.time() - shared['generated_at'] < self.interval:
+                        # Another worker rebuilt it recently
+                        self.summary = shared
+                        self.error = _summary_error(shared)
+                        return
+                try:
+                        self.summary = _build_summary()
+                        self.error = _summary_error(self.summary)
+                except Exception as e:
+                        self.error = str(e)
+                        if self.summary is None and shared:
+                                # Airtable is failing; an old summary is better than none
+                                self.summary = shared
+                                return
+                        raise
+                self._write(self.summary)
+
+        def _start(self):
+                # Threads don't survive gunicorn's fork, so each worker starts its own
+                if self._pid == os.getpid():
+                        return
+                with self._lock:
+                        if self._pid != os.getpid():
+                                self._pid = os.getpid()
+                                threading.Thread(target=self._run, name='SummarySnapshot', daemon=True).start()
+
+        def _run(self):
+                while True:
+                        time.sleep(self.interval / 2)
+                        try:
+                                with self._lock:
+                                        self.refresh()
+                        except Exception as e:
+                                print(f'[!] Error refreshing dashboard summary: {e}')
+
+        def _read(self):
+                try:
+                        with open(self.path) as f:
+                                summary = json.load(f)
+                        float(summary['generated_at'])
+                        return summary
+                except (OSError, ValueError, KeyError, TypeError):
+                        return None
+
+        def _write(self, summary):
+                try:
+                        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', suffix='.tmp')
+                        with os.fdopen(fd, 'w') as f:
+                                json.dump(summary, f)
+                        os.replace(tmp, self.path)
+                except OSError as e:
+                        print(f'[!] Could not save dashboard summary: {e}')
+
+
+summary_snapshot = SummarySnapshot(DASHBOARD_SUMMARY_PATH, DASHBOARD_SUMMARY_INTERVAL)
+
+# Health checks confirm Airtable is reachable at most once per HEALTH_CHECK_TTL seconds,
+# and not at all while the summary snapshot is being refreshed successfully.
+HEALTH_CHECK_TTL = int(os.getenv('HEALTH_CHECK_TTL', '60'))
+_airtable_check = {'checked_at': 0.0, 'reachable': None, 'error': None}
+
+
+def _check_airtable():
+        """Return whether Airtable was reachable recently, without scanning anything."""
+        now = time.time()
+        age = summary_snapshot.age()
+        if age is not None and age < HEALTH_CHECK_TTL and summary_snapshot.error is None:
+                return {'reachable': True, 'checked': 'summary', 'age': age}
+        if now - _airtable_check['checked_at'] >= HEALTH_CHECK_TTL:
+                try:
+                        api.whoami()
+                        _airtable_check.update(reachable=True, error=None)
+                except Exception as e:
+                        _airtable_check.update(reachable=False, error=str(e))
+                _airtable_check['checked_at'] = now
+        return {
+                'reachable': _airtable_check['reachable'],
+                'checked': 'whoami',
+                'age': round(now - _airtable_check['checked_at'], 1),
+                'error': _airtable_check['error'],
+        }
+
+
 # Dashboard template (dark themed cards + banner)
 _DASH = """
 <!doctype html>
@@ -227,7 +474,7 @@ a.card{text-decoration:none}
                                     </div>
                                     <div style="flex:1;min-width:0">
                                         <h3 style="margin:0;font-size:18px;white-space:nowrap;overflow:hidden;text-overflow:ellipsis">{{ t.name }}</h3>
-                                        <div class="meta">{{ t.count }} records</div>
+                                        <div class="meta">{% if t.error %}Count unavailable{% else %}{{ t.count }} records{% endif %}</div>
                                     </div>
                                 </div>
                                 <div class="footer-note">ID: {{ t.id }}</div>
@@ -240,6 +487,7 @@ a.card{text-decoration:none}
                   <button id="nextPageB" aria-label="Next page">›</button>
                 </div>
                 <div style="margin-top:10px;color:var(--muted);font-size:13px">Last updated: <strong>{{ last_updated }}</strong></div>
+                {% if summary_error %}<div style="margin-top:6px;color:#f87171;font-size:13px">Totals are incomplete: {{ summary_error }}</div>{% endif %}
                 <div class="site-footer">&copy; 2025 HSE TROJAN CONSTRUCTION GROUP &nbsp;&middot;&nbsp; Developed by Elius</div>
                 </div>
 
@@ -521,10 +769,12 @@ html[data-theme="dark"], body[data-theme="dark"] tbody tr:hover{background:rgba(
                 <header>
                         <div>
                                 <h2>{{ table_name }}</h2>
-                                <div class="muted">{{ fields|length }} columns • {{ display_records|length }} records</div>
+                                <div class="muted">{{ fields|length }} columns • {{ display_records|length }} of {{ total }} records • page {{ page }}</div>
                         </div>
                         <div style="display:flex;align-items:center;gap:8px;flex-wrap:wrap;justify-content:flex-end">
                                 <button class="theme-toggle" aria-label="Toggle theme" style="margin-right:6px"><span id="themeIcon" class="theme-icon">◐</span><span id="themeLabel" class="theme-label">Theme</span></button>
+                                {% if page > 1 %}<a href="?page={{ page - 1 }}" class="back-link">‹ Prev</a>{% endif %}
+                                {% if has_next %}<a href="?page={{ page + 1 }}" class="back-link">Next ›</a>{% endif %}
                                 <a href="/" class="back-link">Back</a>
                                 <button class="add-btn" id="openAddBtn">+ Add</button>
                         </div>
@@ -1051,37 +1301,53 @@ def dashboard():
         if api is None:
                 return 'Airtable API not initialized', 500
         try:
-                meta = api.base(AIRTABLE_BASE_ID).schema()
-                tables = []
-                total_records = 0
-                for t in meta.tables:
-                        name = t.name
-                        try:
-                                count = len(base.table(name).all())
-                                # Only add table if we have permission to access it
-                                tables.append({'name': name, 'id': t.id, 'count': count})
-                                total_records += count
-                        except Exception as e:
-                                # Skip tables we don't have permission to access
-                                error_msg = str(e).lower()
-                                if 'permission' in error_msg or 'forbidden' in error_msg or 'not found' in error_msg:
-                                        print(f'[!] Skipping table {name} (permission denied)')
-                                        continue
-                                # For other errors, still add the table with 0 count as fallback
-                                print(f'[!] Error counting records in {name}: {e}')
-                last_updated = datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')
-                return render_template_string(_DASH, tables=tables, total_records=total_records, last_updated=last_updated)
+                summary = summary_snapshot.get()
+                last_updated = datetime.utcfromtimestamp(summary['generated_at']).strftime('%Y-%m-%d %H:%M UTC')
+                return render_template_string(
+                        _DASH,
+                        tables=summary['tables'],
+                        total_records=summary['total_records'],
+                        last_updated=last_updated,
+                        summary_error=_summary_error(summary),
+                )
         except Exception as e:
                 return f'Error enumerating tables: {e}', 500
 
 
+@app.route('/healthz')
+def healthz():
+        """Health check for the load balancer: cheap, and never scans the base."""
+        if api is None:
+                return jsonify({'status': 'error', 'error': 'Airtable API not initialized'}), 503
+        airtable = _check_airtable()
+        # Airtable being unreachable is reported, but restarting this process wouldn't fix it
+        # Tables which could not be counted mean the dashboard is showing partial data
+        healthy = airtable['reachable'] and summary_snapshot.error is None
+        return jsonify({
+                'status': 'ok' if healthy else 'degraded',
+                'pid': os.getpid(),
+                'airtable': airtable,
+                'summary_age': summary_snapshot.age(),
+                'summary_error': summary_snapshot.error,
+                'retries': api.retry_stats.to_dict() if api.retry_stats else None,
+                'connections': api.pool_stats.to_dict(),
+                'circuits': {
+                        endpoint: api.circuit_breaker.state(endpoint)
+                        for endpoint in (RECORDS_READ, RECORDS_WRITE, META)
+                },
+        })
+
+
 @app.route('/table/<path:table_name>')
 def view_table(table_name):
         if api is None:
                 return 'Airtable API not initialized', 500
         try:
-                table = base.table(table_name)
-                records = table.all()
+                page = max(1, request.args.get('page', 1, type=int))
+                records, has_next = _table_page(table_name, page, AIRTABLE_PAGE_SIZE)
+                total = base.table(table_name).count(ttl=AIRTABLE_COUNT_TTL)
+        except CircuitOpenError as e:
+                return f'Airtable is not responding right now; try again in {e.retry_in:.0f} seconds. <a href="/">Back to dashboard</a>', 503
         except Exception as e:
                 error_msg = str(e).lower()
                 if 'permission' in error_msg or 'forbidden' in error_msg or 'not found' in error_msg:
@@ -1169,7 +1435,7 @@ def view_table(table_name):
         except Exception:
                 pass
 
-        return render_template_string(_TABLE, table_name=table_name, fields=fields, fields_meta=fields_meta, display_records=display_records, tables=tables, records=records)
+        return render_template_string(_TABLE, table_name=table_name, fields=fields, fields_meta=fields_meta, display_records=display_records, tables=tables, records=records, page=page, has_next=has_next, total=total)
 
 
 @app.route('/add_record/<path:table_name>', methods=['GET', 'POST'])
@@ -0,0 +1,598 @@
+"""
+An asyncio variant of :class:`~pyairtable.Api`, :class:`~pyairtable.Base`
+and :class:`~pyairtable.Table`, which allows a single event loop to keep many
+requests in flight at once (for example, when a page needs data from many tables).
+
+These classes mirror the synchronous API, and reuse its URL builders, parameter
+handling and response types; only the network I/O is different. They require
+the optional ``httpx`` dependency:
+
+.. code-block:: shell
+
+    % pip install 'pyairtable[async]'
+
+Usage:
+    >>> from pyairtable.api.aio import AsyncApi
+    >>> async with AsyncApi(access_token) as api:
+    ...     tables = [api.table(base_id, name) for name in ("Projects", "Tasks")]
+    ...     results = await asyncio.gather(*(table.all() for table in tables))
+"""
+
+import asyncio
+import sys
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import requests
+from urllib3.exceptions import MaxRetryError
+
+from pyairtable.api import ratelimit, retrying
+from pyairtable.api.api import Api, TimeoutTuple, _get_offset
+from pyairtable.api.base import Base
+from pyairtable.api.params import options_to_json_and_params, options_to_params
+from pyairtable.api.table import Table, _check_upsert_key_fields
+from pyairtable.api.types import (
+    FieldName,
+    RecordDeletedDict,
+    RecordDict,
+    RecordId,
+    UpdateRecordDict,
+    UpsertResultDict,
+    WritableFields,
+    assert_typed_dict,
+    assert_typed_dicts,
+)
+from pyairtable.formulas import Formula, to_formula_str
+from pyairtable.models.schema import BaseSchema
+from pyairtable.utils import Url
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    print(
+        "You are missing the 'httpx' library, which means you did not install\n"
+        "the optional dependencies required for pyairtable.api.aio.\n"
+        "Try again after running:\n\n"
+        "   % pip install 'pyairtable[async]'",
+        "\n",
+        file=sys.stderr,
+    )
+    raise
+
+
+class HTTPError(requests.exceptions.HTTPError):
+    """
+    Raised when the API responds with an error. This is a subclass of
+    ``requests.HTTPError`` (which :class:`~pyairtable.Api` raises), so the same
+    ``except`` clause handles errors from either API; ``response`` is the
+    ``httpx.Response`` which caused the error.
+    """
+
+    response: "httpx.Response"
+
+    def __init__(self, *args: Any, response: "httpx.Response"):
+        super().__init__(*args)
+        self.response = response
+        self.request = response.request
+
+
+class _RetryResponse:
+    """
+    Adapts an ``httpx.Response`` to the interface which
+    ``urllib3.util.Retry`` expects when deciding whether to retry.
+    """
+
+    def __init__(self, response: "httpx.Response"):
+        self.status = response.status_code
+        self.headers = response.headers
+
+    def get_redirect_location(self) -> bool:
+        return False
+
+
+class AsyncApi:
+    """
+    Represents an Airtable API, using asyncio for network I/O.
+    Accepts the same arguments as :class:`~pyairtable.Api`.
+
+    Usage:
+        >>> async with AsyncApi('auth_token') as api:
+        ...     table = api.table('base_id', 'table_name')
+        ...     records = await table.all()
+    """
+
+    #: The synchronous :class:`~pyairtable.Api` used for configuration and URL building.
+    sync: Api
+
+    retry_strategy: Optional[retrying.Retry]
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: Optional[TimeoutTuple] = None,
+        retry_strategy: Optional[Union[bool, retrying.Retry]] = True,
+        endpoint_url: str = "https://api.airtable.com",
+        use_field_ids: bool = False,
+        rate_limit: Optional[Union[bool, ratelimit.RateLimiter]] = None,
+        verify: Union[bool, str] = True,
+    ):
+        """
+        Args:
+            api_key: An Airtable API key or personal access token.
+            timeout: A tuple indicating a connect and read timeout.
+            retry_strategy: An instance of ``urllib3.util.Retry``, which will be
+                applied to each request. If ``True``, the default strategy
+                will be applied (see :func:`~pyairtable.retry_strategy`).
+            endpoint_url: The API endpoint to use.
+            use_field_ids: If ``True``, all API requests will return responses
+                with field IDs instead of field names.
+            rate_limit: An instance of :class:`~pyairtable.api.ratelimit.RateLimiter`
+                which will throttle requests before they are sent. Waiting for the
+                limiter does not block the event loop.
+            verify: Whether to verify TLS certificates, or the path to a CA bundle.
+        """
+        if retry_strategy is True:
+            retry_strategy = retrying.retry_strategy()
+        if retry_strategy:
+            retry_strategy = retrying.with_budget(retry_strategy)
+        self.retry_strategy = retry_strategy or None
+        self.sync = Api(
+            api_key,
+            timeout=timeout,
+            retry_strategy=None,
+            endpoint_url=endpoint_url,
+            use_field_ids=use_field_ids,
+            rate_limit=rate_limit,
+        )
+        self.verify = verify
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    def __repr__(self) -> str:
+        return "<pyairtable.AsyncApi>"
+
+    @property
+    def api_key(self) -> str:
+        """
+        Airtable API key or access token to use on all connections.
+        """
+        return self.sync.api_key
+
+    @api_key.setter
+    def api_key(self, value: str) -> None:
+        self.sync.api_key = value
+        if self._client:
+            self._client.headers["Authorization"] = f"Bearer {value}"
+
+    @property
+    def use_field_ids(self) -> bool:
+        return self.sync.use_field_ids
+
+    @property
+    def rate_limiter(self) -> Optional[ratelimit.RateLimiter]:
+        return self.sync.rate_limiter
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        """
+        The ``httpx.AsyncClient`` used for all requests. Created on first use.
+        """
+        if self._client is None:
+            timeout = self.sync.timeout
+            self._client = httpx.AsyncClient(
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=(
+                    httpx.Timeout(timeout[1], connect=timeout[0])
+                    if timeout
+                    else httpx.Timeout(None)
+                ),
+                verify=self.verify,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """
+        Close all open connections.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncApi":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def base(self, base_id: str) -> "AsyncBase":
+        """
+        Return a new :class:`AsyncBase` instance that uses this instance of :class:`AsyncApi`.
+        """
+        return AsyncBase(self, base_id)
+
+    def table(self, base_id: str, table_name: str) -> "AsyncTable":
+        """
+        Return a new :class:`AsyncTable` instance that uses this instance of :class:`AsyncApi`.
+        """
+        return self.base(base_id).table(table_name)
+
+    def build_url(self, *components: str) -> Url:
+        """
+        Build a URL to the Airtable API endpoint with the given URL components,
+        including the API version number.
+        """
+        return self.sync.build_url(*components)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        fallback: Optional[Tuple[str, str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Make a request to the Airtable API. See :meth:`Api.request <pyairtable.Api.request>`.
+
+        Raises:
+            HTTPError: if the API responds with an error.
+            requests.exceptions.RetryError: if the request was retried
+                too many times (the same exception raised by :class:`~pyairtable.Api`).
+        """
+        request_params = {
+            **options_to_params(options or {}),
+            **(params or {}),
+        }
+
+        # If our URL is too long, move *most* (not all) query params into a POST body.
+        if fallback and method.upper() == "GET":
+            full_url = httpx.URL(url, params=request_params)
+            if len(str(full_url)) >= self.sync.MAX_URL_LENGTH:
+                json, spare_params = options_to_json_and_params(options or {})
+                return await self.request(
+                    method=fallback[0],
+                    url=fallback[1],
+                    params={**spare_params, **(params or {})},
+                    json=json,
+                )
+
+        retry = self.retry_strategy
+        if budget := getattr(retry, "budget", None):
+            budget.deposit()
+        while True:
+            if self.rate_limiter:
+                base_id = ratelimit.base_id_from_url(url)
+                await asyncio.sleep(self.rate_limiter.reserve(self.api_key, base_id))
+
+            response = await self.client.request(
+                method.upper(),
+                url,
+                params=request_params,
+                json=json,
+            )
+            if not retry or not retry.is_retry(
+                method.upper(),
+                response.status_code,
+                "Retry-After" in response.headers,
+            ):
+                return self._process_response(response)
+
+            retry_response = _RetryResponse(response)
+            try:
+                retry = retry.increment(
+                    method.upper(),
+                    url,
+                    response=retry_response,  # type: ignore[arg-type]
+                )
+            except MaxRetryError as exc:
+                raise requests.exceptions.RetryError(exc) from exc
+            if isinstance(retry, retrying.AdaptiveRetry):
+                await asyncio.sleep(retry.wait_time(retry_response))
+            else:
+                await asyncio.sleep(
+                    retry.get_retry_after(retry_response)  # type: ignore[arg-type]
+                    or retry.get_backoff_time()
+                )
+
+    def _process_response(self, response: "httpx.Response") -> Any:
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            args = exc.args
+            try:
+                error_dict = response.json()
+            except ValueError:
+                pass
+            else:
+                if isinstance(error_dict, dict) and "error" in error_dict:
+                    args = (*args, repr(error_dict["error"]))
+            raise HTTPError(*args, response=response) from exc
+
+        # Some Airtable endpoints will respond with an empty body and a 200.
+        if not response.text:
+            return None
+        return response.json()
+
+    async def iterate_requests(
+        self,
+        method: str,
+        url: str,
+        fallback: Optional[Tuple[str, str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        offset_field: str = "offset",
+    ) -> AsyncIterator[Any]:
+        """
+        Make one or more requests and iterate through each result.
+        See :meth:`Api.iterate_requests <pyairtable.Api.iterate_requests>`.
+        """
+        options = options or {}
+        params = params or {}
+
+        while True:
+            response = await self.request(
+                method=method,
+                url=url,
+                fallback=fallback,
+                options=options,
+                params=params,
+            )
+            yield response
+            if not isinstance(response, dict):
+                return
+            if not (offset := _get_offset(response, offset_field)):
+                return
+            options = {**options, offset_field: offset}
+
+
+class AsyncBase:
+    """
+    Represents an Airtable base, using asyncio for network I/O.
+    """
+
+    #: The connection to the Airtable API.
+    api: AsyncApi
+
+    #: The synchronous :class:`~pyairtable.Base` used for URL building and models.
+    sync: Base
+
+    _schema: Optional[BaseSchema] = None
+    _schema_data: Optional[Dict[str, Any]] = None
+
+    def __init__(self, api: AsyncApi, base_id: str):
+        self.api = api
+        self.sync = api.sync.base(base_id)
+
+    def __repr__(self) -> str:
+        return f"<AsyncBase id={self.id!r}>"
+
+    @property
+    def id(self) -> str:
+        return self.sync.id
+
+    @property
+    def urls(self) -> Base._urls:
+        return self.sync.urls
+
+    def table(self, id_or_name: str) -> "AsyncTable":
+        """
+        Build a new :class:`AsyncTable` instance using this instance of :class:`AsyncBase`.
+        """
+        return AsyncTable(self, id_or_name)
+
+    async def schema(self, *, force: bool = False) -> BaseSchema:
+        """
+        Retrieve the schema of all tables in the base and cache it.
+        See :meth:`Base.schema <pyairtable.Base.schema>`.
+
+        Args:
+            force: |kwarg_force_metadata|
+        """
+        schema_cache = self.api.sync.schema_cache
+        data = None if force else self._schema_data
+        if schema_cache and not force:
+            data = schema_cache.get(self.id)
+        if data is None:
+            params = {"include": ["visibleFieldIds"]}
+            data = await self.api.request("GET", self.urls.tables, params=params)
+            if schema_cache:
+                schema_cache.set(self.id, data)
+        if self._schema is None or self._schema_data is not data:
+            self._schema = BaseSchema.from_api(data, self.api.sync, context=self.sync)
+            self._schema_data = data
+        return self._schema
+
+
+class AsyncTable:
+    """
+    Represents an Airtable table, using asyncio for network I/O.
+    """
+
+    #: The base that this table belongs to.
+    base: AsyncBase
+
+    #: The synchronous :class:`~pyairtable.Table` used for URL building.
+    sync: Table
+
+    def __init__(self, base: AsyncBase, name: str):
+        self.base = base
+        self.sync = base.sync.table(name)
+
+    def __repr__(self) -> str:
+        return f"<AsyncTable base={self.base.id!r} name={self.name!r}>"
+
+    @property
+    def name(self) -> str:
+        return self.sync.name
+
+    @property
+    def api(self) -> AsyncApi:
+        return self.base.api
+
+    @property
+    def urls(self) -> Table._urls:
+        return self.sync.urls
+
+    def _use_field_ids(self, use_field_ids: Optional[bool]) -> bool:
+        return self.api.use_field_ids if use_field_ids is None else use_field_ids
+
+    async def get(self, record_id: RecordId, **options: Any) -> RecordDict:
+        """
+        Retrieve a record by its ID. See :meth:`Table.get <pyairtable.Table.get>`.
+        """
+        if self.api.use_field_ids:
+            options.setdefault("use_field_ids", self.api.use_field_ids)
+        record = await self.api.request(
+            "GET", self.urls.record(record_id), options=options
+        )
+        return assert_typed_dict(RecordDict, record)
+
+    async def iterate(self, **options: Any) -> AsyncIterator[List[RecordDict]]:
+        """
+        Iterate through each page of results. See :meth:`Table.iterate <pyairtable.Table.iterate>`.
+
+        >>> async for page in table.iterate(page_size=10):
+        ...     print(len(page))
+        """
+        if isinstance(formula := options.get("formula"), Formula):
+            options["formula"] = to_formula_str(formula)
+        if self.api.use_field_ids:
+            options.setdefault("use_field_ids", self.api.use_field_ids)
+        async for page in self.api.iterate_requests(
+            method="get",
+            url=self.urls.records,
+            fallback=("post", self.urls.records_post),
+            options=options,
+        ):
+            yield assert_typed_dicts(RecordDict, page.get("records", []))
+
+    async def all(self, **options: Any) -> List[RecordDict]:
+        """
+        Retrieve all matching records in a single list. See :meth:`Table.all <pyairtable.Table.all>`.
+        """
+        return [record async for page in self.iterate(**options) for record in page]
+
+    async def batch_create(
+        self,
+        records: Iterable[WritableFields],
+        typecast: bool = False,
+        use_field_ids: Optional[bool] = None,
+    ) -> List[RecordDict]:
+        """
+        Create a number of new records in batches.
+        See :meth:`Table.batch_create <pyairtable.Table.batch_create>`.
+        """
+        inserted_records = []
+        for chunk in self.api.sync.chunked(list(records)):
+            response = await self.api.request(
+                "POST",
+                self.urls.records,
+                json={
+                    "records": [{"fields": fields} for fields in chunk],
+                    "typecast": typecast,
+                    "returnFieldsByFieldId": self._use_field_ids(use_field_ids),
+                },
+            )
+            inserted_records += assert_typed_dicts(RecordDict, response["records"])
+        return inserted_records
+
+    async def batch_update(
+        self,
+        records: Iterable[UpdateRecordDict],
+        replace: bool = False,
+        typecast: bool = False,
+        use_field_ids: Optional[bool] = None,
+    ) -> List[RecordDict]:
+        """
+        Update several records in batches.
+        See :meth:`Table.batch_update <pyairtable.Table.batch_update>`.
+        """
+        updated_records = []
+        method = "PUT" if replace else "PATCH"
+        for chunk in self.api.sync.chunked(list(records)):
+            response = await self.api.request(
+                method,
+                self.urls.records,
+                json={
+                    "records": [{"id": x["id"], "fields": x["fields"]} for x in chunk],
+                    "typecast": typecast,
+                    "returnFieldsByFieldId": self._use_field_ids(use_field_ids),
+                },
+            )
+            updated_records += assert_typed_dicts(RecordDict, response["records"])
+        return updated_records
+
+    async def batch_upsert(
+        self,
+        records: Iterable[Dict[str, Any]],
+        key_fields: List[FieldName],
+        replace: bool = False,
+        typecast: bool = False,
+        use_field_ids: Optional[bool] = None,
+    ) -> UpsertResultDict:
+        """
+        Update or create records in batches.
+        See :meth:`Table.batch_upsert <pyairtable.Table.batch_upsert>`.
+        """
+        records = list(records)
+        _check_upsert_key_fields(records, key_fields)
+
+        method = "PUT" if replace else "PATCH"
+        result: UpsertResultDict = {
+            "updatedRecords": [],
+            "createdRecords": [],
+            "records": [],
+        }
+        for chunk in self.api.sync.chunked(records):
+            response = await self.api.request(
+                method,
+                self.urls.records,
+                json={
+                    "records": [
+                        {k: v for (k, v) in record.items() if k in ("id", "fields")}
+                        for record in chunk
+                    ],
+                    "typecast": typecast,
+                    "returnFieldsByFieldId": self._use_field_ids(use_field_ids),
+                    "performUpsert": {"fieldsToMergeOn": key_fields},
+                },
+            )
+            result["updatedRecords"].extend(response["updatedRecords"])
+            result["createdRecords"].extend(response["createdRecords"])
+            result["records"].extend(
+                assert_typed_dicts(RecordDict, response["records"])
+            )
+        return result
+
+    async def batch_delete(
+        self, record_ids: Iterable[RecordId]
+    ) -> List[RecordDeletedDict]:
+        """
+        Delete the given records, operating in batches.
+        See :meth:`Table.batch_delete <pyairtable.Table.batch_delete>`.
+        """
+        deleted_records = []
+        for chunk in self.api.sync.chunked(list(record_ids)):
+            response = await self.api.request(
+                "DELETE", self.urls.records, params={"records[]": chunk}
+            )
+            deleted_records += assert_typed_dicts(
+                RecordDeletedDict, response["records"]
+            )
+        return deleted_records
+
+
+__all__ = [
+    "AsyncApi",
+    "AsyncBase",
+    "AsyncTable",
+]
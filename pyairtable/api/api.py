@@ -1,17 +1,42 @@
+import copy
+import json as jsonlib
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import cached_property
-from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import requests
 from requests.sessions import Session
 from typing_extensions import TypeAlias
 
-from pyairtable.api import retrying
+from pyairtable.api import cache, circuit
+from pyairtable.api import concurrency as _concurrency
+from pyairtable.api import ratelimit, retrying
 from pyairtable.api.base import Base
 from pyairtable.api.enterprise import Enterprise
 from pyairtable.api.params import options_to_json_and_params, options_to_params
 from pyairtable.api.table import Table
 from pyairtable.api.types import UserAndScopesDict, assert_typed_dict
 from pyairtable.api.workspace import Workspace
+from pyairtable.exceptions import BatchError
 from pyairtable.models.schema import Bases
 from pyairtable.utils import (
     Url,
@@ -22,9 +47,99 @@ from pyairtable.utils import (
 )
 
 T = TypeVar("T")
+R = TypeVar("R")
 TimeoutTuple: TypeAlias = Tuple[int, int]
 
 
+def _get_offset(response: Dict[str, Any], offset_field: str) -> Optional[str]:
+    """
+    Find the value that should be used to request the next page of results,
+    or return ``None`` if there are no more pages.
+    """
+    value = response.get("pagination") or response  # see Enterprise.audit_log
+    field_names = offset_field.split(".")
+    while field_names:
+        if not (value := value.get(field_names.pop(0))):
+            return None
+    return str(value)
+
+
+def _read_ahead(iterator: Iterator[T], depth: int) -> Iterator[T]:
+    """
+    Consume ``iterator`` in a background thread, staying up to ``depth`` items
+    ahead of the caller. Exceptions are re-raised in the caller's thread.
+    If the caller stops early, the background thread stops fetching.
+    """
+    buffer: "queue.Queue[Tuple[bool, Any]]" = queue.Queue()
+    slots = threading.Semaphore(depth + 1)
+    stopped = threading.Event()
+
+    def _produce() -> None:
+        try:
+            while True:
+                while not slots.acquire(timeout=0.1):
+                    if stopped.is_set():
+                        return
+                if stopped.is_set():
+                    return
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    buffer.put((False, None))
+                    return
+                buffer.put((True, item))
+        except BaseException as exc:
+            buffer.put((False, exc))
+
+    thread = threading.Thread(target=_produce, name="pyairtable-read-ahead")
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            ok, value = buffer.get()
+            if not ok:
+                if value is not None:
+                    raise value
+                return
+            yield value
+            slots.release()
+    finally:
+        stopped.set()
+
+
+@dataclass
+class ApiStats:
+    """
+    Counts of the requests made by an :class:`Api` instance.
+    """
+
+    #: Number of requests sent to the Airtable API.
+    sent: int = 0
+
+    #: Number of requests which were not sent, because an identical request
+    #: was already in flight and its response was shared instead.
+    #: See ``Api(coalesce_requests=...)``.
+    coalesced: int = 0
+
+
+class _InFlight:
+    """
+    A request which is being sent, and the number of identical requests waiting for it.
+    """
+
+    def __init__(self) -> None:
+        self.future: "Future[Any]" = Future()
+        self.waiters = 0
+
+
+def _is_read(method: str, url: str) -> bool:
+    """
+    Whether a request only reads data (and so can safely be shared between callers).
+    Listing records can be a POST when its parameters are too long for a URL.
+    """
+    return method.upper() == "GET" or url.rstrip("/").endswith("/listRecords")
+
+
 class Api:
     """
     Represents an Airtable API. Implements basic URL construction,
@@ -49,9 +164,37 @@ class Api:
     _bases: Optional[Dict[str, "Base"]] = None
 
     endpoint_url: Url
+
+    #: The session which holds the headers, ``verify``, ``cert`` and connection pools
+    #: used for every request. Changes to it apply to every thread.
     session: Session
+
+    #: Whether each thread sends requests through its own session
+    #: (see ``thread_sessions=`` in the constructor).
+    thread_sessions: bool
     use_field_ids: bool
 
+    #: Throttles outgoing requests, if ``rate_limit=`` was provided to the constructor.
+    rate_limiter: Optional[ratelimit.RateLimiter]
+
+    #: Whether concurrent identical read requests are sent only once.
+    coalesce_requests: bool
+
+    #: Counts of the requests made by this instance.
+    stats: ApiStats
+
+    #: Limits how many requests are in flight at once,
+    #: if ``concurrency=`` was provided to the constructor.
+    concurrency: Optional[_concurrency.AdaptiveConcurrency]
+
+    #: Fails requests fast while Airtable is failing,
+    #: if ``circuit_breaker=`` was provided to the constructor.
+    circuit_breaker: Optional[circuit.CircuitBreaker]
+
+    #: Remembers tables and endpoints which this instance's access token
+    #: cannot use, if ``negative_cache=`` was provided to the constructor.
+    negative_cache: Optional[cache.NegativeCache]
+
     class _urls(UrlBuilder):
         whoami = Url("meta/whoami")
         bases = Url("meta/bases")
@@ -66,6 +209,17 @@ class Api:
         retry_strategy: Optional[Union[bool, retrying.Retry]] = True,
         endpoint_url: str = "https://api.airtable.com",
         use_field_ids: bool = False,
+        rate_limit: Optional[Union[bool, ratelimit.RateLimiter]] = None,
+        schema_cache: Optional[Union[bool, cache.SchemaCache]] = None,
+        coalesce_requests: bool = False,
+        negative_cache: Optional[Union[bool, cache.NegativeCache]] = None,
+        concurrency: Optional[Union[bool, _concurrency.AdaptiveConcurrency]] = None,
+        circuit_breaker: Optional[Union[bool, circuit.CircuitBreaker]] = None,
+        pool_connections: int = retrying.DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        tcp_keepalive: Union[bool, float] = False,
+        thread_sessions: bool = True,
     ):
         """
         Args:
@@ -83,18 +237,150 @@ class Api:
                 a debugging or caching proxy.
             use_field_ids: If ``True``, all API requests will return responses
                 with field IDs instead of field names.
+            rate_limit: An instance of :class:`~pyairtable.api.ratelimit.RateLimiter`
+                which will throttle requests before they are sent.
+                If ``True``, a limiter shared by every :class:`Api` in the current
+                process will enforce Airtable's default limits
+                (see :func:`~pyairtable.api.ratelimit.default_rate_limiter`).
+                To share a budget between several processes on one host,
+                use :class:`~pyairtable.api.ratelimit.FileRateLimiter`.
+                If ``None`` or ``False``, requests will not be throttled.
+            schema_cache: An instance of :class:`~pyairtable.api.cache.SchemaCache`
+                which stores each base's schema, so that it is shared by every
+                :class:`~pyairtable.Base` returned by this :class:`Api`.
+                If ``True``, schemas will be kept in memory until invalidated.
+                If ``None`` or ``False`` (the default), each :class:`~pyairtable.Base`
+                will keep its own copy of its schema.
+            coalesce_requests: If ``True``, a read request (such as retrieving a
+                page of records or a base schema) made while an identical read request
+                is already in flight on another thread will wait for that request
+                and receive a copy of its response, instead of being sent again.
+                Defaults to ``False``. See :attr:`stats` for how many requests
+                were coalesced.
+            negative_cache: An instance of :class:`~pyairtable.api.cache.NegativeCache`
+                which remembers tables and endpoints that responded with 403 or 404,
+                so that further requests for them raise
+                :class:`~pyairtable.exceptions.CachedFailureError`
+                without being sent (or counting against the rate limit).
+                If ``True``, failures will be remembered for five minutes.
+                If ``None`` or ``False``, every request will be sent.
+            concurrency: An instance of
+                :class:`~pyairtable.api.concurrency.AdaptiveConcurrency` which limits
+                how many requests are in flight at once, raising the limit while
+                responses are healthy and cutting it when requests are throttled.
+                Batch methods on :class:`~pyairtable.Table` which are not given
+                ``max_workers=`` will send batches concurrently within that limit.
+                If ``True``, a limiter with default settings will be used.
+                If ``None`` or ``False``, concurrency is not limited.
+            circuit_breaker: An instance of :class:`~pyairtable.api.circuit.CircuitBreaker`
+                which tracks failures and slow responses for reading records, writing
+                records, and other endpoints. While too many recent requests of one kind
+                have failed, further requests of that kind raise
+                :class:`~pyairtable.exceptions.CircuitOpenError` without being sent.
+                If ``True``, a breaker with default settings will be used.
+                If ``None`` or ``False``, every request will be sent.
+            pool_connections: The number of hosts to keep connections open to.
+            pool_maxsize: The number of connections to keep open to each host.
+                This should be at least the number of threads sharing this instance,
+                or connections will be closed after each request and reopened
+                (see :attr:`pool_stats`). Defaults to the maximum set by
+                ``concurrency=``, or 10.
+            pool_block: If ``True``, threads will wait for a connection from the
+                pool instead of opening extra connections beyond ``pool_maxsize``.
+            tcp_keepalive: If ``True``, enable TCP keep-alive probes on each connection
+                (see :func:`~pyairtable.api.retrying.keepalive_socket_options`),
+                so idle pooled connections are not dropped by proxies or load balancers.
+                If a number, probes start after the connection has been idle
+                for that many seconds.
+            thread_sessions: If ``True``, each thread which uses this instance sends
+                requests through its own ``requests.Session``, with its own cookies,
+                which shares the connection pools, retry budget and settings of
+                :attr:`session`. This means threads do not share mutable session state
+                (such as load balancer cookies). If ``False``, every thread uses
+                :attr:`session` directly.
         """
         if retry_strategy is True:
             retry_strategy = retrying.retry_strategy()
-        if not retry_strategy:
-            self.session = Session()
-        else:
-            self.session = retrying._RetryingSession(retry_strategy)
+
+        if rate_limit is True:
+            rate_limit = ratelimit.default_rate_limiter()
+        self.rate_limiter = rate_limit or None
+
+        if schema_cache is True:
+            schema_cache = cache.SchemaCache()
+        self.schema_cache = schema_cache or None
+
+        if negative_cache is True:
+            negative_cache = cache.NegativeCache()
+        self.negative_cache = negative_cache or None
+
+        if concurrency is True:
+            concurrency = _concurrency.AdaptiveConcurrency()
+        self.concurrency = concurrency or None
+
+        if circuit_breaker is True:
+            circuit_breaker = circuit.CircuitBreaker()
+        self.circuit_breaker = circuit_breaker or None
+
+        if pool_maxsize is None:
+            pool_maxsize = retrying.DEFAULT_POOL_MAXSIZE
+            if self.concurrency:
+                pool_maxsize = max(pool_maxsize, self.concurrency.maximum)
+        socket_options = None
+        if tcp_keepalive:
+            idle = 60 if tcp_keepalive is True else tcp_keepalive
+            socket_options = retrying.keepalive_socket_options(idle=idle)
+        self.session = retrying._RetryingSession(
+            retry_strategy or None,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            socket_options=socket_options,
+        )
 
         self.endpoint_url = Url(endpoint_url)
         self.timeout = timeout
         self.api_key = api_key
         self.use_field_ids = use_field_ids
+        self._record_counts: Dict[Tuple[Any, ...], Tuple[float, int]] = {}
+        self.coalesce_requests = coalesce_requests
+        self.stats = ApiStats()
+        self._stats_lock = threading.Lock()
+        self._in_flight: Dict[str, _InFlight] = {}
+        self.thread_sessions = thread_sessions
+        self._local = threading.local()
+
+    def _session(self) -> Session:
+        """
+        Return the session which the current thread should send requests through.
+        """
+        if not self.thread_sessions:
+            return self.session
+        session = getattr(self._local, "session", None)
+        if session is None or session.parent is not self.session:
+            session = self._local.session = retrying._ThreadSession(self.session)
+        return session
+
+    @property
+    def pool_stats(self) -> Optional[retrying.PoolStats]:
+        """
+        Counts of the connections this instance has opened and reused.
+        """
+        return getattr(self.session, "pool_stats", None)
+
+    @property
+    def retry_stats(self) -> Optional[retrying.RetryStats]:
+        """
+        Counts of the requests this instance has retried, and how long it waited
+        before retrying them, if it uses :func:`~pyairtable.retry_strategy`
+        (or another :class:`~pyairtable.api.retrying.AdaptiveRetry`).
+        """
+        budget = cast(
+            Optional[retrying.RetryBudget], getattr(self.session, "retry_budget", None)
+        )
+        if budget:
+            return budget.stats
+        return None
 
     @property
     def api_key(self) -> str:
@@ -263,7 +549,7 @@ class Api:
         }
 
         # Build a requests.PreparedRequest so we can examine how long the URL is.
-        prepared = self.session.prepare_request(
+        prepared = self._session().prepare_request(
             requests.Request(
                 method,
                 url=url,
@@ -273,10 +559,15 @@ class Api:
         )
 
         # If our URL is too long, move *most* (not all) query params into a POST body.
+        # We also do this if the caller wants no fields at all, since ``fields=[]``
+        # disappears from a query string (which would mean "return all fields").
         if (
             fallback
             and method.upper() == "GET"
-            and len(str(prepared.url)) >= self.MAX_URL_LENGTH
+            and (
+                len(str(prepared.url)) >= self.MAX_URL_LENGTH
+                or (options or {}).get("fields") == []
+            )
         ):
             json, spare_params = options_to_json_and_params(options or {})
             return self.request(
@@ -286,13 +577,135 @@ class Api:
                 json=json,
             )
 
-        response = self.session.request(
-            method=method,
-            url=url,
-            params=request_params,
-            json=json,
+        if not (self.coalesce_requests and _is_read(method, url)):
+            return self._send(method, url, request_params, json)
+
+        key = jsonlib.dumps(
+            [method.upper(), url, request_params, json], sort_keys=True, default=str
         )
-        return self._process_response(response)
+        leader = False
+        with self._stats_lock:
+            if in_flight := self._in_flight.get(key):
+                in_flight.waiters += 1
+                self.stats.coalesced += 1
+            else:
+                in_flight = self._in_flight[key] = _InFlight()
+                leader = True
+        if not leader:
+            # each caller gets its own copy, in case it modifies the response
+            return copy.deepcopy(in_flight.future.result())
+
+        try:
+            result = self._send(method, url, request_params, json)
+        except BaseException as exc:
+            with self._stats_lock:
+                del self._in_flight[key]
+            in_flight.future.set_exception(exc)
+            raise
+        with self._stats_lock:
+            del self._in_flight[key]
+        in_flight.future.set_result(result)
+        return copy.deepcopy(result) if in_flight.waiters else result
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: Dict[str, Any],
+        json: Optional[Dict[str, Any]],
+    ) -> Any:
+        if self.negative_cache:
+            self.negative_cache.check(self.api_key, url, _is_read(method, url))
+
+        # fail fast, without waiting for (or using up) a rate limit token
+        if self.circuit_breaker:
+            endpoint = circuit.endpoint_class(method, url)
+            allowed_at = self.circuit_breaker.before_request(endpoint)
+
+        try:
+            if self.rate_limiter:
+                base_id = ratelimit.base_id_from_url(url)
+                self.rate_limiter.acquire(self.api_key, base_id)
+            started = self.concurrency.acquire() if self.concurrency else None
+        except BaseException:
+            # don't let a request which was never sent hold on to a probe
+            if self.circuit_breaker:
+                self.circuit_breaker.cancel_request(endpoint, allowed_at)
+            raise
+
+        with self._stats_lock:
+            self.stats.sent += 1
+        response = self._send_within_limit(method, url, params, json, started)
+
+        try:
+            return self._process_response(response)
+        except requests.HTTPError as exc:
+            if self.negative_cache:
+                read = _is_read(method, url)
+                self.negative_cache.record(self.api_key, url, read, exc)
+            raise
+
+    def _send_within_limit(
+        self,
+        method: str,
+        url: str,
+        params: Dict[str, Any],
+        json: Optional[Dict[str, Any]],
+        started: Optional[float],
+    ) -> requests.Response:
+        """
+        Send a request in the slot which was taken from :attr:`concurrency`
+        (if configured) at ``started``, then release the slot and report back
+        whether the request was throttled.
+        """
+        if not self.concurrency or started is None:
+            return self._send_now(method, url, params, json)
+        congested = False
+        try:
+            response = self._send_now(method, url, params, json)
+        except (requests.Timeout, requests.exceptions.RetryError):
+            congested = True
+            raise
+        else:
+            congested = _concurrency.is_congested(response)
+        finally:
+            self.concurrency.release(started, congested)
+        return response
+
+    def _send_now(
+        self,
+        method: str,
+        url: str,
+        params: Dict[str, Any],
+        json: Optional[Dict[str, Any]],
+    ) -> requests.Response:
+        """
+        Send a request through the current thread's session, and report its outcome
+        to :attr:`circuit_breaker` (if configured). The request is timed from here,
+        so time spent waiting for the rate limiter or a concurrency slot
+        does not count towards ``slow_call_duration``.
+        """
+        if not self.circuit_breaker:
+            return self._session().request(
+                method=method,
+                url=url,
+                params=params,
+                json=json,
+            )
+        endpoint = circuit.endpoint_class(method, url)
+        started = self.circuit_breaker.clock()
+        failed = True
+        try:
+            response = self._session().request(
+                method=method,
+                url=url,
+                params=params,
+                json=json,
+            )
+            failed = response.status_code >= 500
+        finally:
+            self.circuit_breaker.after_request(endpoint, started, failed)
+        return response
 
     def get(self, url: str, **kwargs: Any) -> Any:
         """
@@ -349,6 +762,7 @@ class Api:
         options: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
         offset_field: str = "offset",
+        prefetch: int = 0,
     ) -> Iterator[Any]:
         """
         Make one or more requests and iterates through each result.
@@ -360,6 +774,9 @@ class Api:
         If the response payload is not a 'dict', it will be yielded as normal
         and the method will return.
 
+        If ``prefetch`` is greater than zero, subsequent pages will be requested in a
+        background thread while the caller is still working on the current one.
+
         Args:
             method: HTTP method to use.
             url: The URL we're attempting to call.
@@ -369,18 +786,29 @@ class Api:
             params: Additional query params to append to the URL as-is.
             offset_field: The key to use in the API response to determine whether
                 there are additional pages to retrieve.
+            prefetch: |kwarg_prefetch|
         """
-        options = options or {}
-        params = params or {}
-
-        def _get_offset_field(response: Dict[str, Any]) -> Optional[str]:
-            value = response.get("pagination") or response  # see Enterprise.audit_log
-            field_names = offset_field.split(".")
-            while field_names:
-                if not (value := value.get(field_names.pop(0))):
-                    return None
-            return str(value)
+        pages = self._iterate_requests(
+            method=method,
+            url=url,
+            fallback=fallback,
+            options=(options or {}),
+            params=(params or {}),
+            offset_field=offset_field,
+        )
+        if prefetch > 0:
+            pages = _read_ahead(pages, prefetch)
+        yield from pages
 
+    def _iterate_requests(
+        self,
+        method: str,
+        url: str,
+        fallback: Optional[Tuple[str, str]],
+        options: Dict[str, Any],
+        params: Dict[str, Any],
+        offset_field: str,
+    ) -> Iterator[Any]:
         while True:
             response = self.request(
                 method=method,
@@ -392,17 +820,140 @@ class Api:
             yield response
             if not isinstance(response, dict):
                 return
-            if not (offset := _get_offset_field(response)):
+            if not (offset := _get_offset(response, offset_field)):
                 return
             options = {**options, offset_field: offset}
 
-    def chunked(self, iterable: Sequence[T]) -> Iterator[Sequence[T]]:
+    def chunked(self, iterable: Iterable[T]) -> Iterator[Sequence[T]]:
         """
         Iterate through chunks of the given sequence that are equal in size
         to the maximum number of records per request allowed by the API.
+        Iterators are consumed lazily, one chunk at a time.
         """
         return chunked(iterable, self.MAX_RECORDS_PER_REQUEST)
 
+    def _map_chunks(
+        self,
+        func: Callable[[Sequence[T]], R],
+        iterable: Sequence[T],
+        max_workers: Optional[int] = None,
+    ) -> List[R]:
+        """
+        Call ``func`` with each chunk of ``iterable`` (see :meth:`chunked`)
+        and return the results in input order.
+
+        If ``max_workers`` is greater than one, chunks will be sent concurrently
+        from a thread pool. Every chunk will be attempted even if some of them fail,
+        and any failures will be reported together via
+        :class:`~pyairtable.exceptions.BatchError`.
+        """
+        chunks = list(self.chunked(iterable))
+        max_workers = self._default_workers(max_workers)
+        if not max_workers or max_workers <= 1 or len(chunks) <= 1:
+            return [func(chunk) for chunk in chunks]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(func, chunk) for chunk in chunks]
+
+        succeeded = {}
+        failed = {}
+        for index, (chunk, future) in enumerate(zip(chunks, futures)):
+            if (exc := future.exception()) is not None:
+                failed[index] = (chunk, exc)
+            else:
+                succeeded[index] = future.result()
+        if failed:
+            raise BatchError(succeeded, failed)
+        return [succeeded[index] for index in range(len(chunks))]
+
+    def _default_workers(self, max_workers: Optional[int]) -> Optional[int]:
+        """
+        If the caller did not choose a number of threads for a bulk operation,
+        allow as many as :attr:`concurrency` could ever permit; the limiter
+        decides how many of them actually have a request in flight.
+        """
+        if max_workers is None and self.concurrency:
+            return self.concurrency.maximum
+        return max_workers
+
+    def _stream_chunks(
+        self,
+        func: Callable[[Sequence[T]], R],
+        chunks: Iterable[Sequence[T]],
+        max_workers: Optional[int] = None,
+        check: Optional[Callable[[Sequence[T]], None]] = None,
+    ) -> Iterator[R]:
+        """
+        Call ``func`` with each chunk pulled from ``chunks`` and yield the results
+        in input order, as each one completes.
+
+        If ``max_workers`` is greater than one, up to that many chunks will be
+        in flight at once; no further chunks are pulled from ``chunks`` until the
+        oldest one has been yielded. If a chunk fails, the other chunks in flight
+        are allowed to finish, and any failures are reported via
+        :class:`~pyairtable.exceptions.BatchError`. Results already yielded
+        are not included in that exception.
+
+        If ``check`` is provided, it is called with each chunk before it is sent,
+        and any exception it raises stops the operation. If other chunks are in flight
+        at the time, they are allowed to finish and the exception is reported via
+        :class:`~pyairtable.exceptions.BatchError` along with their results.
+        """
+        max_workers = self._default_workers(max_workers)
+        if not max_workers or max_workers <= 1:
+            for chunk in chunks:
+                if check:
+                    check(chunk)
+                yield func(chunk)
+            return
+
+        pending: Deque[Tuple[int, Sequence[T], "Future[R]"]] = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for index, chunk in enumerate(chunks):
+                if check:
+                    try:
+                        check(chunk)
+                    except Exception as exc:
+                        if not pending:
+                            raise
+                        self._drain_chunks(pending, {index: (chunk, exc)})
+                pending.append((index, chunk, executor.submit(func, chunk)))
+                if len(pending) >= max_workers:
+                    yield self._next_chunk_result(pending)
+            while pending:
+                yield self._next_chunk_result(pending)
+
+    @staticmethod
+    def _next_chunk_result(pending: "Deque[Tuple[int, Sequence[T], Future[R]]]") -> R:
+        """
+        Wait for the oldest pending chunk and return its result. If it failed,
+        wait for all others and raise :class:`~pyairtable.exceptions.BatchError`.
+        """
+        index, chunk, future = pending[0]
+        if future.exception() is None:
+            pending.popleft()
+            return future.result()
+        Api._drain_chunks(pending)
+
+    @staticmethod
+    def _drain_chunks(
+        pending: "Deque[Tuple[int, Sequence[T], Future[R]]]",
+        failed: Optional[Dict[int, Tuple[Sequence[Any], BaseException]]] = None,
+    ) -> NoReturn:
+        """
+        Wait for every pending chunk, then raise :class:`~pyairtable.exceptions.BatchError`
+        with their results and any other failures given in ``failed``.
+        """
+        succeeded = {}
+        failed = dict(failed or {})
+        while pending:
+            index, chunk, future = pending.popleft()
+            if (exc := future.exception()) is not None:
+                failed[index] = (chunk, exc)
+            else:
+                succeeded[index] = future.result()
+        raise BatchError(succeeded, failed)
+
     @enterprise_only
     def enterprise(self, enterprise_account_id: str) -> Enterprise:
         """
@@ -38,6 +38,7 @@ class Base:
     # Cached metadata to reduce API calls
     _collaborators: Optional[BaseCollaborators] = None
     _schema: Optional[BaseSchema] = None
+    _schema_data: Optional[Dict[str, Any]] = None
     _shares: Optional[List[BaseShares.Info]] = None
 
     class _urls(UrlBuilder):
@@ -194,11 +195,14 @@ class Base:
         response = self.api.post(url, json=payload)
         return self.table(response["id"], validate=True, force=True)
 
-    @cache_unless_forced
-    def schema(self) -> BaseSchema:
+    def schema(self, *, force: bool = False) -> BaseSchema:
         """
         Retrieve the schema of all tables in the base and caches it.
 
+        The schema is saved in the :class:`~pyairtable.Api`'s
+        :class:`~pyairtable.api.cache.SchemaCache` (if it has one), so other
+        :class:`Base` instances with the same ID can reuse it.
+
         Usage:
             >>> base.schema().tables
             [TableSchema(...), TableSchema(...), ...]
@@ -206,11 +210,31 @@ class Base:
             TableSchema(id="tblXXXXXXXXXXXXXX", ...)
             >>> base.schema().table("My Table")
             TableSchema(id="...", name="My Table", ...)
+
+        Args:
+            force: |kwarg_force_metadata|
         """
+        if not (schema_cache := self.api.schema_cache):
+            if force or self._schema is None:
+                self._schema = BaseSchema.from_api(
+                    self._fetch_schema(), self.api, context=self
+                )
+            return self._schema
+
+        data = None if force else schema_cache.get(self.id)
+        if data is None:
+            data = self._fetch_schema()
+            schema_cache.set(self.id, data)
+        if self._schema is None or self._schema_data is not data:
+            self._schema = BaseSchema.from_api(data, self.api, context=self)
+            self._schema_data = data
+        return self._schema
+
+    def _fetch_schema(self) -> Dict[str, Any]:
         url = self.urls.tables
         params = {"include": ["visibleFieldIds"]}
-        data = self.api.get(url, params=params)
-        return BaseSchema.from_api(data, self.api, context=self)
+        data: Dict[str, Any] = self.api.get(url, params=params)
+        return data
 
     def webhooks(self) -> List[Webhook]:
         """
@@ -0,0 +1,837 @@
+"""
+Caching for base schemas and for application-level responses.
+
+Base schemas are retrieved far more often than they change. Each call to
+:meth:`Api.base <pyairtable.Api.base>` returns a new :class:`~pyairtable.Base`, so caching
+a schema on the :class:`~pyairtable.Base` object alone does little for code which looks up
+the same base on every request. Instead, every :class:`~pyairtable.Api` has a
+:class:`SchemaCache` (see ``Api(schema_cache=...)``) which is shared by all of
+its bases, and which can optionally persist schemas to disk across restarts.
+
+Applications which cache their own responses (such as a dashboard caching pages of
+records) can use a :class:`CacheBackend`: either :class:`MemoryCache`, which is
+private to one process, or :class:`SQLiteCache`, which is shared by every process
+on a host, so that invalidating an entry in one web worker invalidates it in all of them.
+A :class:`CacheRefresher` can sit in front of either, so that expired values are
+reloaded in the background while the previous value continues to be served.
+
+A :class:`NegativeCache` remembers which tables and endpoints an access token is not
+allowed to use (see ``Api(negative_cache=...)``), so that requests for them fail
+immediately instead of using up the rate limit.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlparse
+
+import requests
+
+from pyairtable.exceptions import CachedFailureError
+
+
+class SchemaCache:
+    """
+    Stores the raw schema returned by `Get base schema <https://airtable.com/developers/web/api/get-base-schema>`__
+    for each base ID.
+
+    Schemas are removed from the cache when they expire, when :meth:`invalidate`
+    is called, and when pyAirtable makes a change that it knows will affect the
+    schema, such as :meth:`Table.create_field <pyairtable.Table.create_field>`.
+    :meth:`Webhook.payloads <pyairtable.models.Webhook.payloads>` also invalidates
+    the cache when it sees a payload that reports a table or field being changed.
+
+    >>> api = Api(access_token, schema_cache=SchemaCache(ttl=600, path="/var/cache/hse"))
+
+    Args:
+        ttl: The number of seconds to keep each schema. If ``None``, schemas
+            are kept until they are invalidated.
+        path: If provided, a directory where schemas will be saved as JSON files,
+            so that they can be reused by other processes or after a restart.
+            Schemas only include tables and fields the access token can see,
+            so tokens with different permissions should not share a directory.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        if self.path:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} ttl={self.ttl!r} path={self.path!r}>"
+
+    def get(self, base_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached schema for the given base, or ``None`` if it is
+        not cached or has expired.
+        """
+        with self._lock:
+            if not (entry := self._entries.get(base_id)):
+                if not (entry := self._read(base_id)):
+                    return None
+                self._entries[base_id] = entry
+            fetched_at, data = entry
+            if self.ttl is not None and time.time() - fetched_at >= self.ttl:
+                del self._entries[base_id]
+                return None
+            return data
+
+    def set(self, base_id: str, data: Dict[str, Any]) -> None:
+        """
+        Save the schema for the given base.
+        """
+        entry = (time.time(), data)
+        with self._lock:
+            self._entries[base_id] = entry
+            self._write(base_id, entry)
+
+    def invalidate(self, base_id: Optional[str] = None) -> None:
+        """
+        Remove the schema for the given base from the cache.
+        If ``base_id`` is not provided, remove all schemas from the cache.
+        """
+        with self._lock:
+            base_ids = [base_id] if base_id else list(self._entries)
+            if self.path and not base_id:
+                base_ids += [p.stem for p in self.path.glob("app*.json")]
+            for base_id in base_ids:
+                self._entries.pop(base_id, None)
+                if self.path:
+                    self._filename(base_id).unlink(missing_ok=True)
+
+    def _filename(self, base_id: str) -> Path:
+        assert self.path
+        return self.path / f"{base_id}.json"
+
+    def _read(self, base_id: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        if not self.path:
+            return None
+        try:
+            with self._filename(base_id).open() as fp:
+                saved = json.load(fp)
+            return (float(saved["fetched_at"]), saved["schema"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write(self, base_id: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        if not self.path:
+            return
+        fetched_at, data = entry
+        # write to a temporary file first, so readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=f".{base_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fp:
+                json.dump({"fetched_at": fetched_at, "schema": data}, fp)
+            os.replace(tmp, self._filename(base_id))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+@dataclass
+class CacheStats:
+    """
+    Counts of what has happened to a :class:`CacheBackend` within the current process.
+    """
+
+    #: Number of lookups which found a value.
+    hits: int = 0
+
+    #: Number of lookups which found nothing (including expired values).
+    misses: int = 0
+
+    #: Number of values removed to make room for new ones.
+    evictions: int = 0
+
+    #: Number of values removed because they had expired
+    #: (and were past their :attr:`~CacheBackend.grace` period).
+    expirations: int = 0
+
+    #: Number of values removed by :meth:`CacheBackend.delete`,
+    #: :meth:`~CacheBackend.invalidate` or :meth:`~CacheBackend.clear`.
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of lookups which found a value.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class CacheBackend(ABC):
+    """
+    A key/value store for JSON-serializable values which expire after a number of seconds.
+
+    Each value can be saved with any number of tags, such as the table and records
+    it was built from. Calling :meth:`invalidate` with a tag removes exactly the values
+    which carry it, using an index from each tag to its keys, so the cost depends
+    only on how many values are removed (not on how many are cached).
+
+    >>> cache.set("tasks-page-1", page, tags=["table:Tasks", "record:rec1", "record:rec2"])
+    >>> cache.invalidate("record:rec2")
+    1
+
+    Args:
+        max_entries: The number of values to keep before the oldest ones are evicted.
+        ttl: The default number of seconds to keep each value.
+        grace: The number of seconds to retain each value after it expires.
+            :meth:`get` never returns expired values, but :meth:`get_entry` does,
+            so that (for example) :class:`CacheRefresher` can serve them while
+            a new value is being loaded.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 300, grace: float = 0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.grace = grace
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} max_entries={self.max_entries!r} ttl={self.ttl!r}>"
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        The number of values in the cache (including any that have expired but
+        have not yet been removed).
+        """
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the value for ``key``, or ``None`` if it is not cached or has expired.
+        """
+        entry = self.get_entry(key)
+        with self._stats_lock:
+            if entry is None or time.time() >= entry[1]:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+        return entry[0]
+
+    @abstractmethod
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Return the value for ``key`` and the time at which it expires (or expired),
+        or ``None`` if it is not cached or expired more than :attr:`grace` seconds ago.
+        This is not counted as a hit or miss in :attr:`stats`.
+        """
+
+    @abstractmethod
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """
+        Save a value for ``key``, which will expire after ``ttl`` seconds
+        (or the cache's default TTL). Any previous value and tags for ``key`` are replaced.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Remove the value for ``key``, if there is one.
+        """
+
+    @abstractmethod
+    def invalidate(self, *tags: str) -> int:
+        """
+        Remove every value saved with any of the given tags,
+        and return the number of values removed.
+        """
+
+    @abstractmethod
+    def clear(self) -> int:
+        """
+        Remove every value, and return the number of values removed.
+        """
+
+
+class MemoryCache(CacheBackend):
+    """
+    Keeps values in memory, evicting the least recently used value once
+    there are more than ``max_entries``. Values are not shared with other processes.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 300, grace: float = 0):
+        super().__init__(max_entries, ttl, grace)
+        self._entries: "OrderedDict[str, Tuple[float, Any, FrozenSet[str]]]"
+        self._entries = OrderedDict()
+        self._tagged: Dict[str, Set[str]] = {}  # tag => keys
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+            expires_at, value, _ = entry
+            if time.time() >= expires_at + self.grace:
+                self._remove(key)
+                self.stats.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return (value, expires_at)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires_at, value, frozenset(tags))
+            for tag in self._entries[key][2]:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self.stats.invalidations += self._remove(key)
+
+    def invalidate(self, *tags: str) -> int:
+        with self._lock:
+            keys = set().union(*(self._tagged.get(tag, ()) for tag in tags))
+            for key in keys:
+                self._remove(key)
+            self.stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._tagged.clear()
+            self.stats.invalidations += count
+            return count
+
+    def _remove(self, key: str) -> int:
+        if (entry := self._entries.pop(key, None)) is None:
+            return 0
+        for tag in entry[2]:
+            keys = self._tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged[tag]
+        return 1
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Keeps values in an SQLite database, which can be shared by every process
+    on the same host (for example, each worker of a gunicorn server).
+    Values are stored as JSON, so anything saved must be JSON-serializable.
+
+    Because every process reads from the same database, a value which is changed
+    or invalidated by one process is immediately changed or invalidated for all of them.
+    The database uses SQLite's WAL mode, so reads are not blocked by writes.
+    Once there are more than ``max_entries`` values, the oldest are evicted first.
+
+    >>> cache = SQLiteCache("/var/cache/hse/responses.sqlite3", max_entries=5000)
+
+    Args:
+        path: The database file, which will be created if it does not exist.
+        max_entries: The number of values to keep before the oldest ones are evicted.
+        ttl: The default number of seconds to keep each value.
+        grace: The number of seconds to retain each value after it expires.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: int = 10000,
+        ttl: float = 300,
+        grace: float = 0,
+    ):
+        super().__init__(max_entries, ttl, grace)
+        self.path = str(path)
+        self._local = threading.local()
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tags (
+                tag TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (tag, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS tags_key ON tags (key);
+            CREATE TRIGGER IF NOT EXISTS entries_untag AFTER DELETE ON entries
+            BEGIN
+                DELETE FROM tags WHERE key = old.key;
+            END;
+            """)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} path={self.path!r} max_entries={self.max_entries!r}>"
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        The current thread's connection to the database.
+        """
+        if not (conn := getattr(self._local, "conn", None)):
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """
+        Close the current thread's connection to the database.
+        """
+        if conn := getattr(self._local, "conn", None):
+            conn.close()
+            del self._local.conn
+
+    def __len__(self) -> int:
+        return int(
+            self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        )
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        row = self.connection.execute(
+            "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        if time.time() >= row[1] + self.grace:
+            cursor = self.connection.execute(
+                "DELETE FROM entries WHERE key = ? AND expires_at = ?", (key, row[1])
+            )
+            with self._stats_lock:
+                self.stats.expirations += cursor.rowcount
+            return None
+        return (json.loads(row[0]), row[1])
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        conn = self.connection
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # deleting first removes the old tags and gives the key a new rowid,
+            # so rowid order is the order in which values were written
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT INTO entries VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO tags VALUES (?, ?)",
+                [(tag, key) for tag in tags],
+            )
+            cursor = conn.execute(
+                "DELETE FROM entries WHERE rowid IN ("
+                " SELECT rowid FROM entries ORDER BY rowid DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_entries,),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        with self._stats_lock:
+            self.stats.evictions += cursor.rowcount
+
+    def delete(self, key: str) -> None:
+        self._delete("DELETE FROM entries WHERE key = ?", key)
+
+    def invalidate(self, *tags: str) -> int:
+        if not tags:
+            return 0
+        return self._delete(
+            "DELETE FROM entries WHERE key IN"
+            f" (SELECT key FROM tags WHERE tag IN ({', '.join('?' for _ in tags)}))",
+            *tags,
+        )
+
+    def clear(self) -> int:
+        return self._delete("DELETE FROM entries")
+
+    def _delete(self, sql: str, *args: Any) -> int:
+        count = int(self.connection.execute(sql, args).rowcount)
+        with self._stats_lock:
+            self.stats.invalidations += count
+        return count
+
+
+@dataclass
+class RefresherStats:
+    """
+    Counts of what has happened to a :class:`CacheRefresher` within the current process.
+    """
+
+    #: Number of requests answered with a value which had not expired.
+    fresh: int = 0
+
+    #: Number of requests answered with an expired value while it was being refreshed.
+    stale: int = 0
+
+    #: Number of requests which had to wait for a value to be loaded.
+    misses: int = 0
+
+    #: Number of requests which waited for a load that another request had already started.
+    coalesced: int = 0
+
+    #: Number of values loaded in the background.
+    refreshes: int = 0
+
+    #: Number of loads (in the foreground or background) which raised an exception.
+    failures: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class CacheRefresher:
+    """
+    Serves values from a :class:`CacheBackend`, loading them at most once at a time
+    and refreshing them in the background so that requests rarely wait for a load.
+
+    * A value which has not expired is returned immediately.
+    * A value which expired less than ``grace`` seconds ago is also returned immediately,
+      and a single background refresh of it is started.
+    * Otherwise the value is loaded while the caller waits. Concurrent requests
+      for the same key wait for the same load instead of starting their own.
+
+    Every ``interval`` seconds, the ``hot_keys`` most frequently requested keys are
+    refreshed if they are about to expire (or have been invalidated), so that
+    popular values are almost never stale. Request counts are halved on each
+    check, so keys which stop being requested soon stop being refreshed.
+
+    Loads are only deduplicated within the current process. When several processes
+    share a :class:`SQLiteCache`, each may refresh the same value once.
+
+    >>> refresher = CacheRefresher(SQLiteCache("responses.sqlite3"), grace=60)
+    >>> refresher.get("tasks-page-1", lambda: load_page("Tasks", 1), ttl=120)
+
+    Args:
+        cache: Where values are stored. Its :attr:`~CacheBackend.grace` will be
+            increased to ``grace`` if necessary.
+        grace: The number of seconds after a value expires during which it can
+            still be returned while it is refreshed.
+        hot_keys: The number of most frequently requested keys to keep warm.
+            Use ``0`` to only refresh values when they are requested.
+        interval: The number of seconds between checks for values to keep warm.
+        max_workers: The number of background refreshes which can run at once.
+    """
+
+    #: The number of recently requested keys whose loaders are remembered.
+    max_tracked_keys = 1000
+
+    def __init__(
+        self,
+        cache: CacheBackend,
+        *,
+        grace: float = 60,
+        hot_keys: int = 20,
+        interval: float = 10,
+        max_workers: int = 2,
+    ):
+        self.cache = cache
+        self.cache.grace = max(cache.grace, grace)
+        self.grace = grace
+        self.hot_keys = hot_keys
+        self.interval = interval
+        self.max_workers = max_workers
+        self.stats = RefresherStats()
+        self._counts: Counter[str] = Counter()
+        self._loaders: "OrderedDict[str, _Loader]" = OrderedDict()
+        self._inflight: Dict[str, "Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} cache={self.cache!r} grace={self.grace!r}>"
+
+    def get(
+        self,
+        key: str,
+        load: Callable[[], Any],
+        *,
+        ttl: Optional[float] = None,
+        tags: Optional[Callable[[Any], Iterable[str]]] = None,
+    ) -> Any:
+        """
+        Return the cached value for ``key``, calling ``load()`` to produce it if needed.
+
+        Args:
+            key: The cache key.
+            load: A function which returns the value (which must not be ``None``).
+            ttl: The number of seconds to cache the value (or the cache's default TTL).
+            tags: A function which returns the tags for a newly loaded value.
+        """
+        self._start()
+        loader = _Loader(load, ttl, tags)
+        with self._lock:
+            self._counts[key] += 1
+            self._loaders[key] = loader
+            self._loaders.move_to_end(key)
+            while len(self._loaders) > self.max_tracked_keys:
+                forgotten, _ = self._loaders.popitem(last=False)
+                self._counts.pop(forgotten, None)
+
+        if entry := self.cache.get_entry(key):
+            value, expires_at = entry
+            if time.time() < expires_at:
+                self._count("fresh")
+                return value
+            if time.time() < expires_at + self.grace:
+                self._count("stale")
+                self._refresh(key, loader)
+                return value
+
+        self._count("misses")
+        future, started = self._claim(key)
+        if started:
+            self._load(key, loader, future)
+        else:
+            self._count("coalesced")
+        return future.result()
+
+    def close(self) -> None:
+        """
+        Stop refreshing values in the background. After this, stale values
+        are refreshed while the caller waits.
+        """
+        self._stopped.set()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def _start(self) -> None:
+        # Threads don't survive a fork, so each web worker starts its own.
+        if self._pid == os.getpid() or self._stopped.is_set():
+            return
+        with self._lock:
+            if self._pid == os.getpid():  # pragma: no cover
+                return
+            self._inflight.clear()
+            self._executor = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="CacheRefresher"
+            )
+            if self.hot_keys:
+                threading.Thread(
+                    target=self._keep_warm, name="CacheRefresher", daemon=True
+                ).start()
+            self._pid = os.getpid()
+
+    def _claim(self, key: str) -> Tuple["Future[Any]", bool]:
+        """
+        Return the in-flight load for ``key``, and whether the caller started it.
+        """
+        with self._lock:
+            if future := self._inflight.get(key):
+                return (future, False)
+            future = self._inflight[key] = Future()
+            return (future, True)
+
+    def _refresh(self, key: str, loader: "_Loader") -> None:
+        future, started = self._claim(key)
+        if not started:
+            return
+        if self._executor:
+            try:
+                self._executor.submit(self._load, key, loader, future, background=True)
+                return
+            except RuntimeError:  # the executor has been shut down
+                pass
+        # After close(), refresh in the foreground, so that the future is resolved
+        # and later requests for this key do not wait for it forever.
+        self._load(key, loader, future)
+
+    def _load(
+        self,
+        key: str,
+        loader: "_Loader",
+        future: "Future[Any]",
+        background: bool = False,
+    ) -> None:
+        try:
+            value = loader.load()
+            tags = loader.tags(value) if loader.tags else ()
+            self.cache.set(key, value, ttl=loader.ttl, tags=tags)
+        except BaseException as exc:
+            self._count("failures")
+            future.set_exception(exc)
+        else:
+            if background:
+                self._count("refreshes")
+            future.set_result(value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _keep_warm(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._refresh_hot_keys()
+
+    def _refresh_hot_keys(self) -> None:
+        with self._lock:
+            hot = [key for (key, _) in self._counts.most_common(self.hot_keys)]
+            for key in list(self._counts):
+                if not (count := self._counts[key] // 2):
+                    del self._counts[key]
+                else:
+                    self._counts[key] = count
+            loaders = {key: self._loaders[key] for key in hot}
+        for key, loader in loaders.items():
+            entry = self.cache.get_entry(key)
+            # refresh anything which would expire before the next check
+            if entry is None or entry[1] - time.time() < self.interval:
+                self._refresh(key, loader)
+
+
+class _Loader(NamedTuple):
+    load: Callable[[], Any]
+    ttl: Optional[float]
+    tags: Optional[Callable[[Any], Iterable[str]]]
+
+
+class NegativeCache:
+    """
+    Remembers requests which Airtable refused with a status code that is unlikely
+    to change soon (by default, 403 and 404), so that later requests for the same
+    table or endpoint with the same access token fail immediately with
+    :class:`~pyairtable.exceptions.CachedFailureError` instead of being sent.
+
+    Failures are remembered per access token, per table (or, for endpoints outside
+    of a table, per endpoint), and separately for reads and writes, since a token may
+    be allowed to read a table but not to change it. Failures to find a particular
+    record are not remembered, since they say nothing about the rest of the table.
+
+    >>> api = Api(access_token, negative_cache=NegativeCache(ttl=600))
+    >>> api.negative_cache.reset(base_id)  # after granting the token access
+
+    Args:
+        ttl: The number of seconds to remember each failure.
+        status_codes: The HTTP status codes to remember.
+    """
+
+    def __init__(self, ttl: float = 300, status_codes: Iterable[int] = (403, 404)):
+        self.ttl = ttl
+        self.status_codes = frozenset(status_codes)
+        #: Number of requests which failed without being sent.
+        self.hits = 0
+        self._failures: Dict[Tuple[str, bool, str], Tuple[float, requests.HTTPError]]
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} ttl={self.ttl!r} failures={len(self._failures)}>"
+
+    def check(self, api_key: str, url: str, read: bool) -> None:
+        """
+        Raise :class:`~pyairtable.exceptions.CachedFailureError` if a request for the
+        same scope as ``url`` recently failed.
+        """
+        if not (scope := _failure_scope(url)):
+            return
+        key = (api_key, read, scope)
+        with self._lock:
+            if not (entry := self._failures.get(key)):
+                return
+            failed_at, exc = entry
+            if time.time() - failed_at >= self.ttl:
+                del self._failures[key]
+                return
+            self.hits += 1
+        raise CachedFailureError(*exc.args, response=exc.response)
+
+    def record(self, api_key: str, url: str, read: bool, exc: Exception) -> None:
+        """
+        Remember ``exc`` if it is an HTTP error with one of :attr:`status_codes`.
+        """
+        if not isinstance(exc, requests.HTTPError) or exc.response is None:
+            return
+        if exc.response.status_code not in self.status_codes:
+            return
+        if scope := _failure_scope(url):
+            with self._lock:
+                self._failures[(api_key, read, scope)] = (time.time(), exc)
+
+    def reset(self, base_id: Optional[str] = None) -> None:
+        """
+        Forget failures for the given base, or all failures if ``base_id`` is not provided.
+        """
+        with self._lock:
+            for key in list(self._failures):
+                if not base_id or base_id in key[2].split("/"):
+                    del self._failures[key]
+
+
+def _failure_scope(url: str) -> Optional[str]:
+    """
+    The part of a URL's path which a 403 or 404 applies to: the table for record
+    URLs, or the whole path for anything else. Returns ``None`` for URLs which
+    refer to a single record (or something within one).
+
+    >>> _failure_scope("https://api.airtable.com/v0/appX/Table/listRecords")
+    'appX/Table'
+    >>> _failure_scope("https://api.airtable.com/v0/meta/bases/appX/tables")
+    'meta/bases/appX/tables'
+    >>> _failure_scope("https://api.airtable.com/v0/appX/Table/recY") is None
+    True
+    """
+    parts = urlparse(url).path.strip("/").split("/")[1:]  # skip the API version
+    if not parts or parts[0] in ("meta", "bases", "workspaces", "oauth"):
+        return "/".join(parts) or None
+    if len(parts) > 2 and parts[2] != "listRecords":
+        return None
+    return "/".join(parts[:2])
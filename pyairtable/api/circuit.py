@@ -0,0 +1,239 @@
+"""
+Circuit breakers which stop sending requests to the Airtable API while it is failing.
+
+When Airtable is degraded, every request waits for a timeout before failing, and
+a web application can run out of workers while they wait. A :class:`CircuitBreaker`
+watches the outcome of recent requests and, once too many of them have failed
+(or been too slow), *opens*: requests fail immediately with
+:class:`~pyairtable.exceptions.CircuitOpenError`, which callers can handle by
+serving cached data. After ``reset_timeout`` seconds, the circuit is *half-open*
+and lets a few probe requests through; if they succeed, it closes again.
+
+Reading records, writing records, and everything else (metadata, webhooks, etc.)
+are tracked separately, since Airtable can be slow to write while still serving reads.
+
+>>> api = Api(access_token, circuit_breaker=True)
+>>> try:
+...     records = table.all()
+... except CircuitOpenError:
+...     records = cached_records
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict
+from urllib.parse import urlparse
+
+from pyairtable.exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+RECORDS_READ = "records.read"
+RECORDS_WRITE = "records.write"
+META = "meta"
+
+
+def endpoint_class(method: str, url: str) -> str:
+    """
+    Classify a request as :data:`RECORDS_READ`, :data:`RECORDS_WRITE` or :data:`META`.
+
+    >>> endpoint_class("GET", "https://api.airtable.com/v0/appX/Table")
+    'records.read'
+    >>> endpoint_class("POST", "https://api.airtable.com/v0/appX/Table/listRecords")
+    'records.read'
+    >>> endpoint_class("PATCH", "https://api.airtable.com/v0/appX/Table/recY")
+    'records.write'
+    >>> endpoint_class("GET", "https://api.airtable.com/v0/meta/bases")
+    'meta'
+    """
+    parts = urlparse(url).path.strip("/").split("/")[1:]  # skip the API version
+    if len(parts) < 2 or parts[0] in ("meta", "bases", "workspaces", "oauth"):
+        return META
+    if method.upper() == "GET" or parts[-1] == "listRecords":
+        return RECORDS_READ
+    return RECORDS_WRITE
+
+
+@dataclass
+class CircuitStats:
+    """
+    Counters which describe how one circuit of a :class:`CircuitBreaker` has behaved.
+    """
+
+    #: The circuit's current state: ``"closed"``, ``"open"`` or ``"half_open"``.
+    state: str = CLOSED
+
+    #: Number of requests which were allowed through.
+    requests: int = 0
+
+    #: Number of requests which failed, or took longer than ``slow_call_duration``.
+    failures: int = 0
+
+    #: Number of requests which failed immediately because the circuit was open.
+    rejected: int = 0
+
+    #: Number of times the circuit has opened.
+    trips: int = 0
+
+
+class _Circuit:
+    def __init__(self, window: int) -> None:
+        self.stats = CircuitStats()
+        self.outcomes: Deque[bool] = deque(maxlen=window)  # True for each failure
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+
+
+class CircuitBreaker:
+    """
+    Tracks recent failures for each class of endpoint (see :func:`endpoint_class`)
+    and fails requests fast while a class is failing.
+
+    Args:
+        failure_threshold: The fraction of recent requests which must fail before
+            the circuit opens.
+        window: The number of recent requests to consider.
+        min_requests: The circuit will not open until at least this many
+            requests have been recorded.
+        slow_call_duration: Requests which take longer than this many seconds
+            count as failures, even if they eventually succeed.
+        reset_timeout: The number of seconds an open circuit waits before letting
+            probe requests through.
+        probes: The number of probe requests which must succeed to close the circuit.
+            Only this many are allowed in flight while the circuit is half-open.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_requests: int = 5,
+        slow_call_duration: float = 10.0,
+        reset_timeout: float = 30.0,
+        probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.min_requests = min_requests
+        self.slow_call_duration = slow_call_duration
+        self.reset_timeout = reset_timeout
+        self.probes = probes
+        self.clock = clock
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        states = {endpoint: self.state(endpoint) for endpoint in self._circuits}
+        return f"<{self.__class__.__name__} {states!r}>"
+
+    def state(self, endpoint: str) -> str:
+        """
+        Return the state of the circuit for the given class of endpoint.
+        An open circuit whose ``reset_timeout`` has passed is reported as half-open.
+        """
+        with self._lock:
+            return self._state(self._circuit(endpoint))
+
+    def stats(self, endpoint: str) -> CircuitStats:
+        """
+        Return the counters for the given class of endpoint.
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.stats.state = self._state(circuit)
+            return circuit.stats
+
+    def before_request(self, endpoint: str) -> float:
+        """
+        Raise :class:`~pyairtable.exceptions.CircuitOpenError` if requests to the
+        given class of endpoint should not be sent. Otherwise, return the current time.
+        Every request allowed through must be reported to :meth:`after_request`,
+        along with the time it was actually sent (which may be later, if the
+        caller has to wait for a rate limit before sending it), or to
+        :meth:`cancel_request` if it is never sent.
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            state = self._state(circuit)
+            if state == HALF_OPEN and circuit.probes < self.probes:
+                circuit.probes += 1
+            elif state != CLOSED:
+                circuit.stats.rejected += 1
+                retry_in = circuit.opened_at + self.reset_timeout - self.clock()
+                raise CircuitOpenError(endpoint, max(0.0, retry_in))
+            circuit.stats.requests += 1
+            return self.clock()
+
+    def after_request(self, endpoint: str, started: float, failed: bool) -> None:
+        """
+        Record the outcome of a request allowed by :meth:`before_request`.
+        """
+        now = self.clock()
+        failed = failed or (now - started) > self.slow_call_duration
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.stats.failures += failed
+            state = self._state(circuit)
+            if state != CLOSED and started < circuit.opened_at + self.reset_timeout:
+                return  # a request which started before the circuit opened
+            if state == HALF_OPEN:
+                circuit.probes -= 1
+                circuit.probe_successes += not failed
+                if failed:
+                    self._trip(circuit, now)
+                elif circuit.probe_successes >= self.probes:
+                    circuit.stats.state = CLOSED
+                return
+            circuit.outcomes.append(failed)
+            failures = sum(circuit.outcomes)
+            if len(circuit.outcomes) >= self.min_requests and (
+                failures >= self.failure_threshold * len(circuit.outcomes)
+            ):
+                self._trip(circuit, now)
+
+    def cancel_request(self, endpoint: str, allowed_at: float) -> None:
+        """
+        Record that a request allowed by :meth:`before_request` at ``allowed_at``
+        was never sent, so that it does not hold on to a half-open circuit's probe.
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.stats.requests -= 1
+            state = self._state(circuit)
+            if (
+                state == HALF_OPEN
+                and allowed_at >= circuit.opened_at + self.reset_timeout
+            ):
+                circuit.probes -= 1
+
+    def reset(self) -> None:
+        """
+        Close every circuit and forget all recorded outcomes.
+        """
+        with self._lock:
+            self._circuits.clear()
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        if (circuit := self._circuits.get(endpoint)) is None:
+            circuit = self._circuits[endpoint] = _Circuit(self.window)
+        return circuit
+
+    def _state(self, circuit: _Circuit) -> str:
+        if circuit.stats.state == OPEN:
+            if self.clock() - circuit.opened_at >= self.reset_timeout:
+                circuit.stats.state = HALF_OPEN
+                circuit.probes = circuit.probe_successes = 0
+        return circuit.stats.state
+
+    def _trip(self, circuit: _Circuit, now: float) -> None:
+        circuit.stats.state = OPEN
+        circuit.stats.trips += 1
+        circuit.opened_at = now
+        circuit.outcomes.clear()
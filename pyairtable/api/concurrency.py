@@ -0,0 +1,171 @@
+"""
+Adaptive limits on the number of requests in flight at once.
+
+Choosing a fixed number of threads for bulk operations means either leaving part of
+Airtable's request budget unused, or sending so many requests at once that they are
+throttled. An :class:`AdaptiveConcurrency` limiter finds the right number as it goes,
+using the same additive-increase/multiplicative-decrease rule as TCP congestion control:
+the limit grows by one slot for each round of healthy responses, and is halved
+whenever a request is throttled (429 or 503) or times out.
+
+>>> api = Api(access_token, concurrency=True)
+>>> table.batch_create(records)  # batches are sent concurrently, within the limit
+>>> api.concurrency.limit
+6.4
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+#: Status codes which mean the API is receiving more requests than it can handle.
+CONGESTION_STATUS_CODES = (429, 503)
+
+
+def is_congested(response: Any) -> bool:
+    """
+    Whether a ``requests.Response`` was throttled, either in its final status
+    or in any attempt which was retried before it was returned.
+    """
+    if response.status_code in CONGESTION_STATUS_CODES:
+        return True
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    return any(
+        attempt.status in CONGESTION_STATUS_CODES
+        for attempt in getattr(retries, "history", ())
+    )
+
+
+@dataclass
+class ConcurrencyStats:
+    """
+    Counters which describe how an :class:`AdaptiveConcurrency` limiter has behaved.
+    """
+
+    #: Number of requests which passed through the limiter.
+    requests: int = 0
+
+    #: Number of requests which had to wait for a free slot before being sent.
+    waited: int = 0
+
+    #: Number of requests which were throttled or timed out.
+    congested: int = 0
+
+    #: Number of times the limit was cut in response to congestion.
+    decreases: int = 0
+
+
+class AdaptiveConcurrency:
+    """
+    A thread-safe limit on the number of requests in flight, which adapts
+    to how the API responds.
+
+    * Each request during which every slot was in use (and which comes back within
+      ``latency_tolerance`` times the usual latency) adds ``1 / limit`` to the
+      limit, so the limit grows by about one slot per round trip.
+    * A throttled or timed out request multiplies the limit by ``backoff``.
+      Requests which were already in flight when the limit was cut do not
+      cut it again, so one burst of 429s only halves the limit once.
+
+    Args:
+        initial: The number of requests allowed in flight to begin with.
+        minimum: The lowest the limit can fall.
+        maximum: The highest the limit can rise. This is also the number of threads
+            used by bulk operations which do not specify ``max_workers=``.
+        backoff: The factor applied to the limit after congestion.
+        latency_tolerance: How many times slower than the usual latency a response
+            can be before the limit stops growing.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        *,
+        minimum: int = 1,
+        maximum: int = 32,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("expected 1 <= minimum <= initial <= maximum")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.clock = clock
+        self.stats = ConcurrencyStats()
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._baseline: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self._last_saturated = float("-inf")
+        self._cond = threading.Condition()
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} limit={self.limit:.1f}"
+            f" in_flight={self.in_flight}>"
+        )
+
+    @property
+    def limit(self) -> float:
+        """
+        The current number of requests allowed in flight (rounded down when enforced).
+        """
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """
+        The number of requests currently holding a slot.
+        """
+        return self._in_flight
+
+    def acquire(self) -> float:
+        """
+        Block until a slot is free, then take it. Returns the time the slot was taken,
+        which must be passed back to :meth:`release`.
+        """
+        with self._cond:
+            self.stats.requests += 1
+            if self._in_flight >= int(self._limit):
+                self.stats.waited += 1
+                while self._in_flight >= int(self._limit):
+                    self._cond.wait()
+            self._in_flight += 1
+            now = self.clock()
+            if self._in_flight >= int(self._limit):
+                self._last_saturated = now
+            return now
+
+    def release(self, started: float, congested: bool = False) -> None:
+        """
+        Free a slot taken by :meth:`acquire`, and adjust the limit according
+        to how long the request took and whether it was throttled.
+        """
+        now = self.clock()
+        with self._cond:
+            # only grow the limit if it was actually reached while this request was out
+            saturated = self._last_saturated >= started
+            self._in_flight -= 1
+            if congested:
+                self.stats.congested += 1
+                if started >= self._last_decrease:
+                    self._limit = max(self.minimum, self._limit * self.backoff)
+                    self._last_decrease = now
+                    self.stats.decreases += 1
+            else:
+                latency = now - started
+                if self._baseline is None or latency < self._baseline:
+                    self._baseline = latency
+                else:
+                    # let the baseline drift up slowly, in case the API got slower
+                    self._baseline += (latency - self._baseline) * 0.01
+                healthy = latency <= self._baseline * self.latency_tolerance
+                if saturated and healthy:
+                    self._limit = min(self.maximum, self._limit + 1 / self._limit)
+            self._cond.notify_all()
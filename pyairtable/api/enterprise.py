@@ -234,6 +234,7 @@ class Enterprise:
         event_type: Optional[Union[str, Iterable[str]]] = None,
         model_id: Optional[Union[str, Iterable[str]]] = None,
         category: Optional[Union[str, Iterable[str]]] = None,
+        prefetch: int = 0,
     ) -> Iterator[AuditLogResponse]:
         """
         Retrieve and yield results from the `Audit Log <https://airtable.com/developers/web/api/audit-logs-integration-guide>`__,
@@ -303,6 +304,7 @@ class Enterprise:
                 the provided model ID or IDs (maximum 100).
             category: Retrieve audit log events belonging to the provided
                 audit log event category or categories.
+            prefetch: |kwarg_prefetch|
 
         Returns:
             An object representing a single page of audit log results.
@@ -333,6 +335,7 @@ class Enterprise:
             url=self.urls.audit_log,
             params=params,
             offset_field=offset_field,
+            prefetch=prefetch,
         )
         for count, response in enumerate(iter_requests, start=1):
             parsed = AuditLogResponse.model_validate(response)
@@ -0,0 +1,366 @@
+"""
+Client-side throttling for requests to the Airtable API.
+
+Airtable enforces a `rate limit <https://airtable.com/developers/web/api/rate-limits>`__
+of 5 requests per second per base, and 50 requests per second across all bases
+for a single access token. Requests over that budget receive a 429 response, and
+the base is throttled for 30 seconds. A :class:`RateLimiter` spaces out requests
+*before* they are sent, so that callers (including many threads sharing one
+:class:`~pyairtable.Api`) stay under the budget instead of relying on retries.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+#: Airtable's per-base limit, in requests per second.
+DEFAULT_BASE_QPS = 5.0
+
+#: Airtable's per-token limit across all bases, in requests per second.
+DEFAULT_TOKEN_QPS = 50.0
+
+#: Matches a base ID within the path of an Airtable API URL.
+BASE_ID_RE = re.compile(r"/(app[a-zA-Z0-9]{14})(?=/|\?|$)")
+
+
+def base_id_from_url(url: str) -> Optional[str]:
+    """
+    Extract the base ID (if any) from an Airtable API URL.
+
+    >>> base_id_from_url("https://api.airtable.com/v0/appLkNDICXNqxSDhG/Apartments")
+    'appLkNDICXNqxSDhG'
+    >>> base_id_from_url("https://api.airtable.com/v0/meta/whoami") is None
+    True
+    """
+    if match := BASE_ID_RE.search(url):
+        return match[1]
+    return None
+
+
+def token_key(api_key: str) -> str:
+    """
+    Build a stable identifier for an access token that does not contain the token itself.
+    """
+    return hashlib.sha256(api_key.encode("utf8")).hexdigest()[:16]
+
+
+def _refill(
+    tokens: float,
+    updated: float,
+    now: float,
+    rate: float,
+    burst: float,
+) -> Tuple[float, float]:
+    """
+    Take one token from a bucket which last held ``tokens`` at time ``updated``,
+    and return the number of tokens left along with how long the caller must wait.
+    The result can be negative, which represents reservations for future slots.
+    """
+    tokens = min(burst, tokens + max(0.0, now - updated) * rate) - 1
+    return (tokens, 0.0 if tokens >= 0 else -tokens / rate)
+
+
+@dataclass
+class RateLimitStats:
+    """
+    Counters which describe how much time a :class:`RateLimiter` has spent throttling.
+    """
+
+    #: Number of requests which passed through the limiter.
+    requests: int = 0
+
+    #: Number of requests which had to wait for a token before being sent.
+    tokens_waited: int = 0
+
+    #: Total number of seconds callers spent blocked on the limiter.
+    time_blocked: float = 0.0
+
+    @property
+    def saturation(self) -> float:
+        """
+        The fraction of requests which had to wait. Values close to ``1.0``
+        mean callers are consistently saturating the request budget.
+        """
+        return self.tokens_waited / self.requests if self.requests else 0.0
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket which refills at ``rate`` tokens per second,
+    holding at most ``burst`` tokens.
+
+    Callers reserve tokens rather than polling for them: each call to :meth:`reserve`
+    claims the next available slot (even if it is in the future) and returns how long
+    the caller must wait before using it. This keeps waiting callers in FIFO order
+    and avoids holding the lock while sleeping.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive; got {rate!r}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1; got {burst!r}")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._updated = clock()
+
+    def reserve(self) -> float:
+        """
+        Claim a token from the bucket and return the number of seconds
+        the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens, delay = _refill(
+                self._tokens, self._updated, now, self.rate, self.burst
+            )
+            self._updated = now
+            return delay
+
+
+class RateLimiter:
+    """
+    Throttles requests so that each access token stays within Airtable's per-base
+    and per-token request budgets. A single instance can be shared by any number of
+    :class:`~pyairtable.Api` instances and threads.
+
+    Usage:
+        >>> from pyairtable import Api
+        >>> from pyairtable.api.ratelimit import RateLimiter
+        >>> limiter = RateLimiter(base_qps=4)
+        >>> api = Api('auth_token', rate_limit=limiter)
+        >>> api.table('base_id', 'table_name').all()
+        >>> limiter.stats
+        RateLimitStats(requests=12, tokens_waited=11, time_blocked=2.61)
+
+    Args:
+        base_qps: Maximum requests per second to a single base.
+        token_qps: Maximum requests per second across all bases for one access token.
+        burst: Maximum number of requests that can be sent back-to-back
+            before throttling begins. The default of ``1`` spaces requests out
+            evenly, which ensures no one-second window ever exceeds the limit.
+    """
+
+    def __init__(
+        self,
+        base_qps: float = DEFAULT_BASE_QPS,
+        token_qps: float = DEFAULT_TOKEN_QPS,
+        *,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.base_qps = base_qps
+        self.token_qps = token_qps
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, RateLimitStats] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}"
+            f" base_qps={self.base_qps!r} token_qps={self.token_qps!r}>"
+        )
+
+    def acquire(self, api_key: str, base_id: Optional[str] = None) -> float:
+        """
+        Block until a request for the given access token (and base, if provided)
+        fits within the request budget.
+
+        Args:
+            api_key: The access token that will be used to send the request.
+            base_id: The base that the request targets, if any.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        if (delay := self.reserve(api_key, base_id)) > 0:
+            self._sleep(delay)
+        return delay
+
+    def reserve(self, api_key: str, base_id: Optional[str] = None) -> float:
+        """
+        Reserve a slot for a request without blocking, and return the number of
+        seconds the caller must wait before sending it. This is useful for callers
+        which cannot block, such as coroutines running in an event loop.
+
+        Args:
+            api_key: The access token that will be used to send the request.
+            base_id: The base that the request targets, if any.
+        """
+        key = token_key(api_key)
+        delay = self._reserve(key, self.token_qps)
+        if base_id:
+            key = f"{key}:{base_id}"
+            delay = max(delay, self._reserve(key, self.base_qps))
+        self._record(key, delay)
+        return delay
+
+    def _reserve(self, key: str, rate: float) -> float:
+        """
+        Reserve one token from the bucket identified by ``key`` and return the
+        number of seconds until it can be used. Subclasses can override this
+        to keep bucket state somewhere other than process memory.
+        """
+        with self._lock:
+            if not (bucket := self._buckets.get(key)):
+                bucket = self._buckets[key] = TokenBucket(
+                    rate, self.burst, clock=self._clock
+                )
+        return bucket.reserve()
+
+    def _record(self, key: str, delay: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(key, RateLimitStats())
+            stats.requests += 1
+            stats.tokens_waited += delay > 0
+            stats.time_blocked += delay
+
+    @property
+    def stats(self) -> RateLimitStats:
+        """
+        Aggregate counters for every request that has passed through this limiter.
+        """
+        total = RateLimitStats()
+        with self._lock:
+            for stats in self._stats.values():
+                total.requests += stats.requests
+                total.tokens_waited += stats.tokens_waited
+                total.time_blocked += stats.time_blocked
+        return total
+
+    def stats_for(self, api_key: str, base_id: Optional[str] = None) -> RateLimitStats:
+        """
+        Counters for requests sent with the given access token to the given base.
+        If ``base_id`` is omitted, returns counters for requests that did not target a base.
+        """
+        key = token_key(api_key) + (f":{base_id}" if base_id else "")
+        with self._lock:
+            stats = self._stats.get(key, RateLimitStats())
+            return RateLimitStats(**vars(stats))
+
+    def reset_stats(self) -> None:
+        """
+        Reset all counters to zero.
+        """
+        with self._lock:
+            self._stats.clear()
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    A :class:`RateLimiter` which keeps its token buckets in files, so that several
+    processes on the same host (such as gunicorn workers) share one request budget.
+    Each bucket is a small file in ``directory``, and every reservation holds an
+    exclusive ``flock`` on that file while it reads and updates the bucket.
+
+    Usage:
+        >>> from pyairtable import Api
+        >>> from pyairtable.api.ratelimit import FileRateLimiter
+        >>> api = Api('auth_token', rate_limit=FileRateLimiter('/tmp/pyairtable'))
+
+    Counters in :attr:`~RateLimiter.stats` only describe requests made by
+    the current process.
+
+    This backend requires a POSIX platform.
+
+    Args:
+        directory: Where to keep bucket files. Will be created if it does not exist.
+            All processes sharing a budget must use the same directory.
+        base_qps: Maximum requests per second to a single base.
+        token_qps: Maximum requests per second across all bases for one access token.
+        burst: Maximum number of requests that can be sent back-to-back
+            before throttling begins.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        base_qps: float = DEFAULT_BASE_QPS,
+        token_qps: float = DEFAULT_TOKEN_QPS,
+        *,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if fcntl is None:  # pragma: no cover
+            raise RuntimeError(f"{self.__class__.__name__} requires fcntl (POSIX)")
+        super().__init__(
+            base_qps,
+            token_qps,
+            burst=burst,
+            clock=clock,
+            sleep=sleep,
+        )
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"{super().__repr__()[:-1]} directory={str(self.directory)!r}>"
+
+    def _reserve(self, key: str, rate: float) -> float:
+        path = self.directory / (key.replace(":", "-") + ".bucket")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = self._clock()
+            try:
+                tokens, updated = map(float, os.read(fd, 64).split())
+            except ValueError:
+                # new (or corrupted) bucket file; start with a full bucket
+                tokens, updated = self.burst, now
+            tokens, delay = _refill(tokens, updated, now, rate, self.burst)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{tokens!r} {now!r}".encode())
+            return delay
+        finally:
+            os.close(fd)  # also releases the lock
+
+
+_default_rate_limiter: Optional[RateLimiter] = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def default_rate_limiter() -> RateLimiter:
+    """
+    Return the process-wide :class:`RateLimiter` which is shared by every
+    :class:`~pyairtable.Api` created with ``rate_limit=True``.
+    """
+    global _default_rate_limiter
+    with _default_rate_limiter_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = RateLimiter()
+        return _default_rate_limiter
+
+
+__all__ = [
+    "FileRateLimiter",
+    "RateLimiter",
+    "RateLimitStats",
+    "TokenBucket",
+    "base_id_from_url",
+    "default_rate_limiter",
+]
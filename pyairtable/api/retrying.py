@@ -1,12 +1,148 @@
-from typing import Any, Collection, Optional, Tuple, Union
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, List, Optional, Tuple, Type, Union
 
-from requests import Session
+from requests import PreparedRequest, Request, Response, Session
 from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import MaxRetryError, ResponseError
 from urllib3.util.retry import Retry
 
 DEFAULT_RETRIABLE_STATUS_CODES = (429,)
-DEFAULT_BACKOFF_FACTOR = 0.1  # retry after 0.1, 0.2, 0.4, 0.8, 1.6 seconds
+DEFAULT_BACKOFF_FACTOR = 0.1  # first retry after 0.1-0.3 seconds, then 1-3x longer
 DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_BUDGET = 0.1  # retries may add at most 10% to the number of requests
+DEFAULT_RETRY_RESERVE = 10
+DEFAULT_BACKOFF_MAX = 120  # matches urllib3, which has no Retry.backoff_max before 2.0
+
+DEFAULT_POOL_CONNECTIONS = 10  # the number of hosts to keep connections open to
+DEFAULT_POOL_MAXSIZE = 10  # the number of connections to keep open to each host
+
+#: How long Airtable says to wait after responding with a 429,
+#: for use with ``retry_strategy(rate_limit_penalty=...)``.
+AIRTABLE_RATE_LIMIT_PENALTY = 30.0
+
+
+@dataclass
+class StatusRetryStats:
+    """
+    Counters for retries caused by one status code (or one type of connection error).
+    """
+
+    #: Number of retries.
+    retries: int = 0
+
+    #: Total number of seconds spent waiting before those retries.
+    backoff: float = 0.0
+
+
+@dataclass
+class RetryStats:
+    """
+    Counters which describe how often an :class:`~pyairtable.Api` has retried requests.
+    """
+
+    #: Number of requests sent, not counting retries.
+    requests: int = 0
+
+    #: Number of retries.
+    retries: int = 0
+
+    #: Number of retries which were not attempted because the
+    #: :class:`RetryBudget` was exhausted.
+    denied: int = 0
+
+    #: Retries and backoff time for each status code (such as ``"429"``)
+    #: or connection error (such as ``"ReadTimeoutError"``).
+    by_status: Dict[str, StatusRetryStats] = field(default_factory=dict)
+
+    @property
+    def backoff(self) -> float:
+        """
+        Total number of seconds spent waiting before retries.
+        """
+        return sum(stats.backoff for stats in self.by_status.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "denied": self.denied,
+            "backoff": round(self.backoff, 3),
+            "by_status": {
+                key: {"retries": stats.retries, "backoff": round(stats.backoff, 3)}
+                for key, stats in self.by_status.items()
+            },
+        }
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the requests sent, so that when many requests
+    fail at once, retrying them cannot multiply the load on the API.
+
+    Each request adds ``ratio`` to a balance (which never exceeds ``reserve``)
+    and each retry takes one from it. Retries are refused while the balance is
+    below one, so over time there are at most ``ratio`` retries per request,
+    plus up to ``reserve`` retries in a burst.
+
+    Args:
+        ratio: The fraction of requests which can be retried.
+            If ``None``, retries are never refused (but are still counted).
+        reserve: The number of retries available before any requests have been sent.
+    """
+
+    def __init__(
+        self,
+        ratio: Optional[float] = DEFAULT_RETRY_BUDGET,
+        reserve: int = DEFAULT_RETRY_RESERVE,
+    ):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.stats = RetryStats()
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} ratio={self.ratio!r} reserve={self.reserve!r}>"
+        )
+
+    def deposit(self) -> None:
+        """
+        Record that a request is about to be sent.
+        """
+        with self._lock:
+            self.stats.requests += 1
+            if self.ratio is not None:
+                self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Record that a request is about to be retried, and return ``False``
+        if it should not be retried because the budget is exhausted.
+        """
+        with self._lock:
+            if self.ratio is not None:
+                if self._balance < 1:
+                    self.stats.denied += 1
+                    return False
+                self._balance -= 1
+            self.stats.retries += 1
+            return True
+
+    def record_backoff(self, reason: str, seconds: float) -> None:
+        """
+        Record how long a request waited before being retried.
+        """
+        with self._lock:
+            stats = self.stats.by_status.setdefault(reason, StatusRetryStats())
+            stats.retries += 1
+            stats.backoff += seconds
 
 
 def retry_strategy(
@@ -15,8 +151,10 @@ def retry_strategy(
     backoff_factor: Union[int, float] = DEFAULT_BACKOFF_FACTOR,
     total: int = DEFAULT_MAX_RETRIES,
     allowed_methods: Optional[Collection[str]] = None,
+    retry_budget: Optional[float] = DEFAULT_RETRY_BUDGET,
+    rate_limit_penalty: float = 0,
     **kwargs: Any,
-) -> Retry:
+) -> "AdaptiveRetry":
     """
     Create a `Retry <https://urllib3.readthedocs.io/en/stable/reference/urllib3.util.html#urllib3.util.Retry>`_
     instance with adjustable default values. :class:`~pyairtable.Api` accepts this via the
@@ -33,6 +171,13 @@ def retry_strategy(
         >>> retry = retry_strategy(status_forcelist=(429, 500, 502, 503, 504))
         >>> api = Api('auth_token', retry_strategy=retry)
 
+    Airtable asks clients to wait 30 seconds after being rate limited. If your
+    requests can afford to wait that long, you can honor that penalty instead of
+    retrying sooner:
+
+        >>> from pyairtable.api.retrying import AIRTABLE_RATE_LIMIT_PENALTY
+        >>> retry = retry_strategy(rate_limit_penalty=AIRTABLE_RATE_LIMIT_PENALTY)
+
     You can also disable retries entirely:
 
         >>> from pyairtable import Api
@@ -40,39 +185,361 @@ def retry_strategy(
 
     .. versionadded:: 1.4.0
 
+    .. versionchanged:: 3.3.0
+
+        Returns an :class:`AdaptiveRetry`, which adds random jitter to each backoff
+        and limits each :class:`~pyairtable.Api` to a budget of retries.
+
     Args:
         status_forcelist: Status codes which should be retried.
         allowed_methods: HTTP methods which can be retried.
             If ``None``, then all HTTP methods will be retried.
         backoff_factor:
-            A backoff factor to apply between attempts after the second try.
-            Sleep time between each request will be calculated as
-            ``backoff_factor * (2 ** (retry_count - 1))``
+            The shortest time to wait before retrying. Each subsequent wait is
+            chosen at random between the previous wait and three times the previous
+            wait (see :meth:`AdaptiveRetry.get_backoff_time`).
         total:
             Maximum number of retries. Note that ``0`` means no retries,
             whereas ``1`` will execute a total of two requests (original + 1 retry).
+        retry_budget:
+            The fraction of each :class:`~pyairtable.Api` instance's requests which can
+            be retried (see :class:`RetryBudget`). If ``None``, retries are not limited.
+        rate_limit_penalty:
+            The number of seconds to wait after a 429 response which does not
+            include a ``Retry-After`` header.
         **kwargs: Accepts any valid parameter to `Retry`_.
     """
-    return Retry(
+    return AdaptiveRetry(
         total=total,
         backoff_factor=backoff_factor,
         status_forcelist=status_forcelist,
         allowed_methods=allowed_methods,
+        retry_budget=retry_budget,
+        rate_limit_penalty=rate_limit_penalty,
         **kwargs,
     )
 
 
+class AdaptiveRetry(Retry):
+    """
+    A ``urllib3.util.Retry`` which spreads out retries from many callers, and which can
+    limit how many retries each :class:`~pyairtable.Api` sends.
+
+    * Backoff uses "decorrelated jitter": each wait is chosen at random between
+      the previous wait and three times the previous wait (up to ``backoff_max``),
+      so callers which fail at the same moment do not all retry at the same moment.
+      Waits never get shorter, so a request cannot use up its retries in a burst.
+    * A ``Retry-After`` header is honored, with jitter added on top of it.
+      A 429 without one waits for ``rate_limit_penalty`` seconds (if provided).
+    * Each :class:`~pyairtable.Api` is given its own :class:`RetryBudget`,
+      which refuses retries once they exceed ``retry_budget`` of its requests
+      and records how much time was spent waiting for each status code.
+
+    Use :func:`retry_strategy` to create an instance with pyAirtable's defaults.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        retry_budget: Optional[float] = DEFAULT_RETRY_BUDGET,
+        retry_reserve: int = DEFAULT_RETRY_RESERVE,
+        rate_limit_penalty: float = 0,
+        budget: Optional[RetryBudget] = None,
+        previous_backoff: float = 0,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.retry_budget = retry_budget
+        self.retry_reserve = retry_reserve
+        self.rate_limit_penalty = rate_limit_penalty
+        self.budget = budget
+        self.previous_backoff = previous_backoff
+        self._backoff: Optional[float] = None
+
+    def new(self, **kw: Any) -> "AdaptiveRetry":
+        kw.setdefault("retry_budget", self.retry_budget)
+        kw.setdefault("retry_reserve", self.retry_reserve)
+        kw.setdefault("rate_limit_penalty", self.rate_limit_penalty)
+        kw.setdefault("budget", self.budget)
+        kw.setdefault("previous_backoff", self._backoff or self.previous_backoff)
+        return super().new(**kw)
+
+    def with_budget(self) -> "AdaptiveRetry":
+        """
+        Return a copy of this strategy with a new :class:`RetryBudget`.
+        Each :class:`~pyairtable.Api` calls this once, so that instances
+        which share a strategy do not share a budget.
+        """
+        return self.new(budget=RetryBudget(self.retry_budget, self.retry_reserve))
+
+    def increment(self, *args: Any, **kwargs: Any) -> "AdaptiveRetry":
+        retry: AdaptiveRetry = super().increment(*args, **kwargs)
+        if retry.budget and not retry.budget.withdraw():
+            url = kwargs.get("url", args[1] if len(args) > 1 else None)
+            reason = ResponseError("retry budget exhausted")
+            raise MaxRetryError(kwargs.get("_pool"), url, reason)  # type: ignore
+        return retry
+
+    def get_backoff_time(self) -> float:
+        """
+        Choose how long to wait before the next retry: a random time between
+        the previous wait (or ``backoff_factor``, if longer) and three times the
+        previous wait, up to ``backoff_max``.
+        The result is chosen once per retry, so repeated calls return the same value.
+        """
+        if self._backoff is None:
+            base = self.backoff_factor
+            previous = max(base, self.previous_backoff)
+            backoff_max = getattr(self, "backoff_max", DEFAULT_BACKOFF_MAX)
+            self._backoff = min(backoff_max, random.uniform(previous, previous * 3))
+        return self._backoff
+
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None and response.status == 429:
+            return self.rate_limit_penalty or None
+        return retry_after
+
+    def wait_time(self, response: Any = None) -> float:
+        """
+        Return how long to wait before retrying after ``response`` (or after an error),
+        and record it in the :class:`RetryBudget`'s statistics.
+        """
+        seconds = self.get_backoff_time()
+        if self.respect_retry_after_header and response is not None:
+            seconds += self.get_retry_after(response) or 0
+        if self.budget and self.history:
+            last = self.history[-1]
+            reason = str(last.status or type(last.error).__name__)
+            self.budget.record_backoff(reason, seconds)
+        return seconds
+
+    def sleep(self, response: Any = None) -> None:
+        if seconds := self.wait_time(response):
+            time.sleep(seconds)
+
+
+@dataclass
+class PoolStats:
+    """
+    Counters which describe how well an :class:`~pyairtable.Api` reuses connections.
+    """
+
+    #: Number of HTTP requests sent (including retries).
+    requests: int = 0
+
+    #: Number of connections opened (each of which needed a new TCP and TLS handshake).
+    opened: int = 0
+
+    #: Number of connections closed after use because the pool was already full.
+    #: If this keeps increasing, ``pool_maxsize`` is smaller than the number of
+    #: threads making requests.
+    discarded: int = 0
+
+    @property
+    def reused(self) -> int:
+        """
+        Number of requests sent on a connection which was already open.
+        """
+        return max(0, self.requests - self.opened)
+
+    @property
+    def reuse_rate(self) -> float:
+        """
+        The fraction of requests sent on a connection which was already open.
+        """
+        return self.reused / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "opened": self.opened,
+            "reused": self.reused,
+            "discarded": self.discarded,
+            "reuse_rate": round(self.reuse_rate, 3),
+        }
+
+
+def keepalive_socket_options(
+    idle: float = 60,
+    interval: float = 10,
+    count: int = 5,
+) -> List[Tuple[int, int, int]]:
+    """
+    Socket options which enable TCP keep-alive probes on each connection, so that
+    idle pooled connections are not silently dropped by proxies or load balancers.
+    Options which the current platform does not support are omitted.
+
+    Args:
+        idle: Seconds a connection must be idle before the first probe is sent.
+        interval: Seconds between probes.
+        count: Number of unanswered probes before the connection is considered dead.
+    """
+    options = [*HTTPConnection.default_socket_options]
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    for name, value in (
+        ("TCP_KEEPIDLE", idle),
+        ("TCP_KEEPALIVE", idle),  # macOS calls TCP_KEEPIDLE this
+        ("TCP_KEEPINTVL", interval),
+        ("TCP_KEEPCNT", count),
+    ):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), int(value)))
+    return options
+
+
+def _counting_pool(
+    pool_cls: Type[HTTPConnectionPool], stats: PoolStats, lock: threading.Lock
+) -> Type[HTTPConnectionPool]:
+    """
+    Create a subclass of ``pool_cls`` which records its activity in ``stats``.
+    """
+
+    class CountingPool(pool_cls):  # type: ignore[valid-type,misc]
+        def urlopen(self, *args: Any, **kwargs: Any) -> Any:
+            with lock:
+                stats.requests += 1
+            return super().urlopen(*args, **kwargs)
+
+        def _new_conn(self) -> Any:
+            with lock:
+                stats.opened += 1
+            return super()._new_conn()
+
+        def _put_conn(self, conn: Any) -> None:
+            if conn and self.pool is not None and self.pool.full():
+                with lock:
+                    stats.discarded += 1
+            super()._put_conn(conn)
+
+    CountingPool.__name__ = f"Counting{pool_cls.__name__}"
+    return CountingPool
+
+
+class _PoolingAdapter(HTTPAdapter):
+    """
+    An ``HTTPAdapter`` which can set socket options on each connection
+    and counts how often connections are opened and reused.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        socket_options: Optional[List[Tuple[int, int, int]]] = None,
+        **kwargs: Any,
+    ):
+        self.socket_options = socket_options
+        self.pool_stats = PoolStats()
+        self._stats_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args: Any, **pool_kwargs: Any) -> None:
+        if self.socket_options:
+            pool_kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(
+                HTTPConnectionPool, self.pool_stats, self._stats_lock
+            ),
+            "https": _counting_pool(
+                HTTPSConnectionPool, self.pool_stats, self._stats_lock
+            ),
+        }
+
+
+def with_budget(retry: Retry) -> Retry:
+    """
+    Give an :class:`AdaptiveRetry` its own :class:`RetryBudget`.
+    Any other ``Retry`` is returned unchanged.
+    """
+    return retry.with_budget() if isinstance(retry, AdaptiveRetry) else retry
+
+
 class _RetryingSession(Session):
-    def __init__(self, retry_strategy: Retry):
+    def __init__(
+        self,
+        retry_strategy: Optional[Retry],
+        *,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        socket_options: Optional[List[Tuple[int, int, int]]] = None,
+    ):
         super().__init__()
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        self.retry_strategy = with_budget(retry_strategy) if retry_strategy else None
+        adapter = _PoolingAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=self.retry_strategy or 0,
+            socket_options=socket_options,
+        )
+        self.pool_stats = adapter.pool_stats
 
         self.mount("https://", adapter)
         self.mount("http://", adapter)
 
+    @property
+    def retry_budget(self) -> Optional[RetryBudget]:
+        return getattr(self.retry_strategy, "budget", None)
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        if self.retry_budget:
+            self.retry_budget.deposit()
+        return super().send(request, **kwargs)
+
+
+class _ThreadSession(Session):
+    """
+    A session used by a single thread to send requests on behalf of a shared session.
+
+    It has its own cookie jar, but shares the parent's connection pools and retry
+    budget, and picks up the parent's headers, ``verify``, ``cert`` and other
+    settings as each request is prepared (so changes to the parent apply to every thread).
+    """
+
+    _inherited = (
+        "headers",
+        "auth",
+        "proxies",
+        "hooks",
+        "params",
+        "stream",
+        "verify",
+        "cert",
+        "trust_env",
+        "max_redirects",
+        "adapters",
+    )
+
+    def __init__(self, parent: Session):
+        super().__init__()
+        self.parent = parent
+        self._inherit()
+
+    def _inherit(self) -> None:
+        for attr in self._inherited:
+            setattr(self, attr, getattr(self.parent, attr))
+
+    def prepare_request(self, request: Request) -> PreparedRequest:
+        self._inherit()
+        return super().prepare_request(request)
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        if budget := getattr(self.parent, "retry_budget", None):
+            budget.deposit()
+        return super().send(request, **kwargs)
+
 
 __all__ = [
+    "AIRTABLE_RATE_LIMIT_PENALTY",
+    "AdaptiveRetry",
+    "PoolStats",
     "Retry",
+    "RetryBudget",
+    "RetryStats",
+    "StatusRetryStats",
+    "keepalive_socket_options",
     "retry_strategy",
 ]
@@ -1,18 +1,24 @@
 import base64
+import heapq
 import mimetypes
 import os
+import string
+import time
 import urllib.parse
 import warnings
-from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, cmp_to_key, partial
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
     Iterable,
     Iterator,
     List,
     Optional,
+    Sequence,
     Union,
     overload,
 )
@@ -23,6 +29,7 @@ from pyairtable.api.types import (
     RecordDeletedDict,
     RecordDict,
     RecordId,
+    RecordPageDict,
     UpdateRecordDict,
     UploadAttachmentResultDict,
     UpsertResultDict,
@@ -30,7 +37,8 @@ from pyairtable.api.types import (
     assert_typed_dict,
     assert_typed_dicts,
 )
-from pyairtable.formulas import Formula, to_formula_str
+from pyairtable.exceptions import SegmentedScanError
+from pyairtable.formulas import AND, FIND, MID, RECORD_ID, Formula, to_formula_str
 from pyairtable.models.schema import FieldSchema, TableSchema, parse_field_schema
 from pyairtable.utils import Url, UrlBuilder, is_table_id
 
@@ -251,7 +259,9 @@ class Table:
         record = self.api.get(self.urls.record(record_id), options=options)
         return assert_typed_dict(RecordDict, record)
 
-    def iterate(self, **options: Any) -> Iterator[List[RecordDict]]:
+    def iterate(
+        self, *, prefetch: int = 0, **options: Any
+    ) -> Iterator[List[RecordDict]]:
         """
         Iterate through each page of results from `List records <https://airtable.com/developers/web/api/list-records>`_.
         To get all records at once, use :meth:`all`.
@@ -278,19 +288,68 @@ class Table:
             user_locale: |kwarg_user_locale|
             time_zone: |kwarg_time_zone|
             use_field_ids: |kwarg_use_field_ids|
+            prefetch: |kwarg_prefetch|
         """
-        if isinstance(formula := options.get("formula"), Formula):
-            options["formula"] = to_formula_str(formula)
-        if self.api.use_field_ids:
-            options.setdefault("use_field_ids", self.api.use_field_ids)
         for page in self.api.iterate_requests(
             method="get",
             url=self.urls.records,
             fallback=("post", self.urls.records_post),
-            options=options,
+            options=self._list_options(options),
+            prefetch=prefetch,
         ):
             yield assert_typed_dicts(RecordDict, page.get("records", []))
 
+    def page(self, offset: Optional[str] = None, **options: Any) -> RecordPageDict:
+        """
+        Retrieve a single page of records, along with the ``offset`` that Airtable
+        returns when there are more records. Passing that offset back (with the
+        same options) retrieves the next page, so an application can save offsets
+        and serve any page it has seen before with a single request.
+
+        >>> first = table.page(page_size=50, sort=["Name"])
+        >>> second = table.page(first["offset"], page_size=50, sort=["Name"])
+
+        Airtable only honors an offset for a limited time; after that, requests
+        using it will fail with ``LIST_RECORDS_ITERATOR_NOT_AVAILABLE``.
+
+        Args:
+            offset: The offset returned with the previous page, or ``None``
+                to retrieve the first page.
+
+        Keyword Args:
+            view: |kwarg_view|
+            page_size: |kwarg_page_size|
+            max_records: |kwarg_max_records|
+            fields: |kwarg_fields|
+            sort: |kwarg_sort|
+            formula: |kwarg_formula|
+            cell_format: |kwarg_cell_format|
+            user_locale: |kwarg_user_locale|
+            time_zone: |kwarg_time_zone|
+            use_field_ids: |kwarg_use_field_ids|
+        """
+        if offset:
+            options["offset"] = offset
+        response = self.api.request(
+            method="get",
+            url=self.urls.records,
+            fallback=("post", self.urls.records_post),
+            options=self._list_options(options),
+        )
+        page: RecordPageDict = {
+            "records": assert_typed_dicts(RecordDict, response.get("records", []))
+        }
+        if next_offset := response.get("offset"):
+            page["offset"] = next_offset
+        return page
+
+    def _list_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        if isinstance(formula := options.get("formula"), Formula):
+            options["formula"] = to_formula_str(formula)
+        if self.api.use_field_ids:
+            options.setdefault("use_field_ids", self.api.use_field_ids)
+        return options
+
     def all(self, **options: Any) -> List[RecordDict]:
         """
         Retrieve all matching records in a single list.
@@ -315,6 +374,93 @@ class Table:
         """
         return [record for page in self.iterate(**options) for record in page]
 
+    def scan_parallel(
+        self,
+        segments: int = 4,
+        *,
+        max_workers: Optional[int] = None,
+        order: bool = False,
+        verify: bool = False,
+        **options: Any,
+    ) -> List[RecordDict]:
+        """
+        Retrieve all matching records by splitting the table into disjoint segments
+        and paginating through each segment concurrently.
+
+        Airtable's pagination offsets are opaque, so :meth:`all` must request one page
+        after another. This method instead assigns each record to one of ``segments``
+        buckets based on a character of its record ID, using a formula like
+        ``FIND(MID(RECORD_ID(), 4, 1), 'ABC...')``, and scans all buckets at once.
+        Any ``formula`` passed in will be combined with each bucket's formula.
+        One extra segment catches any record whose ID falls outside the expected
+        alphabet, so this will make at least ``segments + 1`` requests.
+
+        >>> records = table.scan_parallel(8, view="Open Incidents")
+        >>> len(records)
+        102437
+
+        Requests still go through :meth:`Api.request <pyairtable.Api.request>`,
+        so any rate limit or concurrency limit configured on the
+        :class:`~pyairtable.Api` applies.
+
+        Args:
+            segments: The number of segments to split the table into (between 1 and 62).
+            max_workers: The number of segments to scan at once. Defaults to ``segments``.
+            order: If ``True``, records from all segments will be merged according to
+                the ``sort`` option. Airtable only exposes the order of a view by returning
+                records in that order, so this requires an explicit ``sort``.
+                The merge compares cell values on the client, ignoring case in text,
+                which only approximates Airtable's sort order: single selects are
+                sorted by option order, text by locale-aware collation, and lookup,
+                linked record and other non-scalar fields by values the API does not
+                return. Records whose values compare differently on the client may
+                come back out of order.
+            verify: If ``True``, also count the matching records with :meth:`count`
+                (concurrently with the scan) and check that the segments returned
+                exactly that many distinct records, with none returned twice.
+                Raises :class:`~pyairtable.exceptions.SegmentedScanError` if not.
+                Records created or deleted during the scan will also cause this to fail.
+
+        Keyword Args:
+            view: |kwarg_view|
+            page_size: |kwarg_page_size|
+            fields: |kwarg_fields|
+            sort: |kwarg_sort|
+            formula: |kwarg_formula|
+            cell_format: |kwarg_cell_format|
+            user_locale: |kwarg_user_locale|
+            time_zone: |kwarg_time_zone|
+            use_field_ids: |kwarg_use_field_ids|
+        """
+        if "max_records" in options:
+            raise ValueError("scan_parallel() does not support max_records")
+        if order and not options.get("sort"):
+            raise ValueError("scan_parallel(order=True) requires sort=")
+
+        base_formula = options.pop("formula", None)
+        if isinstance(base_formula, str):
+            base_formula = Formula(base_formula)
+
+        buckets = _record_id_buckets(segments)
+        formulas = [
+            AND(base_formula, bucket) if base_formula else bucket for bucket in buckets
+        ]
+
+        def _scan(formula: Formula) -> List[RecordDict]:
+            return self.all(formula=formula, **options)
+
+        with ThreadPoolExecutor(max_workers=(max_workers or len(formulas))) as pool:
+            if verify:
+                total = pool.submit(self.count, base_formula, options.get("view"))
+            results = list(pool.map(_scan, formulas))
+
+        if verify:
+            _verify_segments(results, total.result())
+        if order:
+            key = _sort_key(options["sort"])
+            return list(heapq.merge(*results, key=key))
+        return [record for segment in results for record in segment]
+
     def first(self, **options: Any) -> Optional[RecordDict]:
         """
         Retrieve the first matching record.
@@ -339,6 +485,49 @@ class Table:
                 return record
         return None
 
+    def count(
+        self,
+        formula: Union[None, str, Formula] = None,
+        view: Optional[str] = None,
+        *,
+        ttl: Optional[float] = None,
+    ) -> int:
+        """
+        Count the records in the table (or in a view, or matching a formula).
+
+        Airtable has no endpoint for counting records, so this pages through
+        the table as :meth:`all` would, but requests no fields and 100 records
+        per page. Each page only contains record IDs and is discarded once counted.
+
+        >>> table.count()
+        50213
+        >>> table.count(view="Open Incidents", ttl=60)
+        118
+
+        Args:
+            formula: |kwarg_formula|
+            view: |kwarg_view|
+            ttl: If provided, reuse a count which was computed (by any
+                :class:`Table` sharing this table's :class:`~pyairtable.Api`)
+                less than this many seconds ago.
+        """
+        if isinstance(formula, Formula):
+            formula = to_formula_str(formula)
+        key = (self.urls.records, formula, view)
+        if ttl and (cached := self.api._record_counts.get(key)):
+            counted_at, count = cached
+            if time.monotonic() - counted_at < ttl:
+                return count
+
+        options: Dict[str, Any] = {"fields": [], "page_size": 100}
+        if formula:
+            options["formula"] = formula
+        if view:
+            options["view"] = view
+        count = sum(len(page) for page in self.iterate(**options))
+        self.api._record_counts[key] = (time.monotonic(), count)
+        return count
+
     def create(
         self,
         fields: WritableFields,
@@ -374,6 +563,7 @@ class Table:
         records: Iterable[WritableFields],
         typecast: bool = False,
         use_field_ids: Optional[bool] = None,
+        max_workers: Optional[int] = None,
     ) -> List[RecordDict]:
         """
         Create a number of new records in batches.
@@ -396,27 +586,71 @@ class Table:
             records: Iterable of dicts representing records to be created.
             typecast: |kwarg_typecast|
             use_field_ids: |kwarg_use_field_ids|
+            max_workers: |kwarg_max_workers|
         """
-        inserted_records = []
         if use_field_ids is None:
             use_field_ids = self.api.use_field_ids
 
         # If we got an iterator, exhaust it and collect it into a list.
         records = list(records)
 
-        for chunk in self.api.chunked(records):
-            new_records = [{"fields": fields} for fields in chunk]
-            response = self.api.post(
-                url=self.urls.records,
-                json={
-                    "records": new_records,
-                    "typecast": typecast,
-                    "returnFieldsByFieldId": use_field_ids,
-                },
-            )
-            inserted_records += assert_typed_dicts(RecordDict, response["records"])
+        create = partial(
+            self._create_chunk, typecast=typecast, use_field_ids=use_field_ids
+        )
+        return [
+            record
+            for chunk_records in self.api._map_chunks(create, records, max_workers)
+            for record in chunk_records
+        ]
+
+    def iter_batch_create(
+        self,
+        records: Iterable[WritableFields],
+        typecast: bool = False,
+        use_field_ids: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[List[RecordDict]]:
+        """
+        Create a number of new records in batches, consuming ``records`` lazily
+        and yielding each batch of created records as soon as it is committed.
+
+        Unlike :meth:`batch_create`, this will not read the whole input into memory,
+        so it is suitable for very large imports from a file or generator:
+
+        >>> rows = csv.DictReader(open("contacts.csv"))
+        >>> for created in table.iter_batch_create(rows, typecast=True):
+        ...     print(f"created {len(created)} records")
 
-        return inserted_records
+        Args:
+            records: Iterable of dicts representing records to be created.
+            typecast: |kwarg_typecast|
+            use_field_ids: |kwarg_use_field_ids|
+            max_workers: |kwarg_max_workers_stream|
+        """
+        if use_field_ids is None:
+            use_field_ids = self.api.use_field_ids
+        create = partial(
+            self._create_chunk, typecast=typecast, use_field_ids=use_field_ids
+        )
+        chunks = self.api.chunked(records)
+        yield from self.api._stream_chunks(create, chunks, max_workers)
+
+    def _create_chunk(
+        self,
+        chunk: Sequence[WritableFields],
+        *,
+        typecast: bool,
+        use_field_ids: bool,
+    ) -> List[RecordDict]:
+        response = self.api.post(
+            url=self.urls.records,
+            json={
+                "records": [{"fields": fields} for fields in chunk],
+                "typecast": typecast,
+                "returnFieldsByFieldId": use_field_ids,
+            },
+        )
+        return assert_typed_dicts(RecordDict, response["records"])
 
     def update(
         self,
@@ -461,6 +695,7 @@ class Table:
         replace: bool = False,
         typecast: bool = False,
         use_field_ids: Optional[bool] = None,
+        max_workers: Optional[int] = None,
     ) -> List[RecordDict]:
         """
         Update several records in batches.
@@ -470,11 +705,11 @@ class Table:
             replace: |kwarg_replace|
             typecast: |kwarg_typecast|
             use_field_ids: |kwarg_use_field_ids|
+            max_workers: |kwarg_max_workers|
 
         Returns:
             The list of updated records.
         """
-        updated_records = []
         method = "put" if replace else "patch"
         if use_field_ids is None:
             use_field_ids = self.api.use_field_ids
@@ -482,20 +717,67 @@ class Table:
         # If we got an iterator, exhaust it and collect it into a list.
         records = list(records)
 
-        for chunk in self.api.chunked(records):
-            chunk_records = [{"id": x["id"], "fields": x["fields"]} for x in chunk]
-            response = self.api.request(
-                method=method,
-                url=self.urls.records,
-                json={
-                    "records": chunk_records,
-                    "typecast": typecast,
-                    "returnFieldsByFieldId": use_field_ids,
-                },
-            )
-            updated_records += assert_typed_dicts(RecordDict, response["records"])
+        update = partial(
+            self._update_chunk,
+            method=method,
+            typecast=typecast,
+            use_field_ids=use_field_ids,
+        )
+        return [
+            record
+            for chunk_records in self.api._map_chunks(update, records, max_workers)
+            for record in chunk_records
+        ]
+
+    def iter_batch_update(
+        self,
+        records: Iterable[UpdateRecordDict],
+        replace: bool = False,
+        typecast: bool = False,
+        use_field_ids: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[List[RecordDict]]:
+        """
+        Update several records in batches, consuming ``records`` lazily
+        and yielding each batch of updated records as soon as it is committed.
+        See :meth:`iter_batch_create` for details.
+
+        Args:
+            records: Records to update.
+            replace: |kwarg_replace|
+            typecast: |kwarg_typecast|
+            use_field_ids: |kwarg_use_field_ids|
+            max_workers: |kwarg_max_workers_stream|
+        """
+        if use_field_ids is None:
+            use_field_ids = self.api.use_field_ids
+        update = partial(
+            self._update_chunk,
+            method=("put" if replace else "patch"),
+            typecast=typecast,
+            use_field_ids=use_field_ids,
+        )
+        chunks = self.api.chunked(records)
+        yield from self.api._stream_chunks(update, chunks, max_workers)
 
-        return updated_records
+    def _update_chunk(
+        self,
+        chunk: Sequence[UpdateRecordDict],
+        *,
+        method: str,
+        typecast: bool,
+        use_field_ids: bool,
+    ) -> List[RecordDict]:
+        response = self.api.request(
+            method=method,
+            url=self.urls.records,
+            json={
+                "records": [{"id": x["id"], "fields": x["fields"]} for x in chunk],
+                "typecast": typecast,
+                "returnFieldsByFieldId": use_field_ids,
+            },
+        )
+        return assert_typed_dicts(RecordDict, response["records"])
 
     def batch_upsert(
         self,
@@ -504,6 +786,7 @@ class Table:
         replace: bool = False,
         typecast: bool = False,
         use_field_ids: Optional[bool] = None,
+        max_workers: Optional[int] = None,
     ) -> UpsertResultDict:
         """
         Update or create records in batches, either using ``id`` (if given) or using a set of
@@ -519,6 +802,12 @@ class Table:
             replace: |kwarg_replace|
             typecast: |kwarg_typecast|
             use_field_ids: |kwarg_use_field_ids|
+            max_workers: |kwarg_max_workers|
+                Airtable does not coordinate concurrent upserts, so if two records
+                in different batches share the same values for ``key_fields``,
+                sending them concurrently may create duplicate records.
+                For that reason, upserts are sent one batch at a time unless
+                ``max_workers`` is given, even if the Api has ``concurrency=``.
 
         Returns:
             Lists of created/updated record IDs, along with the list of all records affected.
@@ -533,12 +822,7 @@ class Table:
         # but we might not reach that error until we've done several batch operations.
         # To spare implementers from having to recover from a partially applied upsert,
         # and to simplify our API, we will raise an exception before any network calls.
-        for record in records:
-            if "id" in record:
-                continue
-            missing = set(key_fields) - set(record.get("fields", []))
-            if missing:
-                raise ValueError(f"missing {missing!r} in {record['fields'].keys()!r}")
+        _check_upsert_key_fields(records, key_fields)
 
         method = "put" if replace else "patch"
         result: UpsertResultDict = {
@@ -547,29 +831,98 @@ class Table:
             "records": [],
         }
 
-        for chunk in self.api.chunked(records):
-            formatted_records = [
-                {k: v for (k, v) in record.items() if k in ("id", "fields")}
-                for record in chunk
-            ]
-            response = self.api.request(
-                method=method,
-                url=self.urls.records,
-                json={
-                    "records": formatted_records,
-                    "typecast": typecast,
-                    "returnFieldsByFieldId": use_field_ids,
-                    "performUpsert": {"fieldsToMergeOn": key_fields},
-                },
-            )
+        upsert = partial(
+            self._upsert_chunk,
+            key_fields=key_fields,
+            method=method,
+            typecast=typecast,
+            use_field_ids=use_field_ids,
+        )
+        # only send upserts concurrently if the caller explicitly asked to
+        for response in self.api._map_chunks(upsert, records, max_workers or 1):
             result["updatedRecords"].extend(response["updatedRecords"])
             result["createdRecords"].extend(response["createdRecords"])
-            result["records"].extend(
-                assert_typed_dicts(RecordDict, response["records"])
-            )
+            result["records"].extend(response["records"])
 
         return result
 
+    def iter_batch_upsert(
+        self,
+        records: Iterable[Dict[str, Any]],
+        key_fields: List[FieldName],
+        replace: bool = False,
+        typecast: bool = False,
+        use_field_ids: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[UpsertResultDict]:
+        """
+        Update or create records in batches, consuming ``records`` lazily and
+        yielding the result of each batch as soon as it is committed.
+        See :meth:`batch_upsert` and :meth:`iter_batch_create` for details.
+
+        Since the input is not read in advance, each batch is checked for missing
+        ``key_fields`` just before it is sent. If one is invalid, ``ValueError``
+        will be raised, but batches which were already yielded will have been committed.
+        If other batches were still in flight, they are allowed to finish, and
+        :class:`~pyairtable.exceptions.BatchError` is raised instead, with those
+        batches in ``succeeded`` and the ``ValueError`` in ``failed``.
+
+        Args:
+            records: Records to update.
+            key_fields: List of field names that Airtable should use to match
+                records in the input with existing records on the server.
+            replace: |kwarg_replace|
+            typecast: |kwarg_typecast|
+            use_field_ids: |kwarg_use_field_ids|
+            max_workers: |kwarg_max_workers_stream|
+                As with :meth:`batch_upsert`, batches are sent one at a time
+                unless ``max_workers`` is given.
+        """
+        if use_field_ids is None:
+            use_field_ids = self.api.use_field_ids
+        upsert = partial(
+            self._upsert_chunk,
+            key_fields=key_fields,
+            method=("put" if replace else "patch"),
+            typecast=typecast,
+            use_field_ids=use_field_ids,
+        )
+        yield from self.api._stream_chunks(
+            upsert,
+            self.api.chunked(records),
+            max_workers or 1,
+            check=partial(_check_upsert_key_fields, key_fields=key_fields),
+        )
+
+    def _upsert_chunk(
+        self,
+        chunk: Sequence[Dict[str, Any]],
+        *,
+        key_fields: List[FieldName],
+        method: str,
+        typecast: bool,
+        use_field_ids: bool,
+    ) -> UpsertResultDict:
+        formatted_records = [
+            {k: v for (k, v) in record.items() if k in ("id", "fields")}
+            for record in chunk
+        ]
+        response = self.api.request(
+            method=method,
+            url=self.urls.records,
+            json={
+                "records": formatted_records,
+                "typecast": typecast,
+                "returnFieldsByFieldId": use_field_ids,
+                "performUpsert": {"fieldsToMergeOn": key_fields},
+            },
+        )
+        return {
+            "createdRecords": response["createdRecords"],
+            "updatedRecords": response["updatedRecords"],
+            "records": assert_typed_dicts(RecordDict, response["records"]),
+        }
+
     def delete(self, record_id: RecordId) -> RecordDeletedDict:
         """
         Delete the given record.
@@ -588,7 +941,11 @@ class Table:
             self.api.delete(self.urls.record(record_id)),
         )
 
-    def batch_delete(self, record_ids: Iterable[RecordId]) -> List[RecordDeletedDict]:
+    def batch_delete(
+        self,
+        record_ids: Iterable[RecordId],
+        max_workers: Optional[int] = None,
+    ) -> List[RecordDeletedDict]:
         """
         Delete the given records, operating in batches.
 
@@ -600,20 +957,23 @@ class Table:
 
         Args:
             record_ids: Record IDs to delete
+            max_workers: |kwarg_max_workers|
 
         Returns:
             Confirmation that the records were deleted.
         """
-        deleted_records = []
-
         # If we got an iterator, exhaust it and collect it into a list.
         record_ids = list(record_ids)
 
-        for chunk in self.api.chunked(record_ids):
+        def _delete(chunk: Sequence[RecordId]) -> List[RecordDeletedDict]:
             result = self.api.delete(self.urls.records, params={"records[]": chunk})
-            deleted_records += assert_typed_dicts(RecordDeletedDict, result["records"])
+            return assert_typed_dicts(RecordDeletedDict, result["records"])
 
-        return deleted_records
+        return [
+            record
+            for chunk_records in self.api._map_chunks(_delete, record_ids, max_workers)
+            for record in chunk_records
+        ]
 
     def comments(self, record_id: RecordId) -> List["pyairtable.models.Comment"]:
         """
@@ -747,6 +1107,8 @@ class Table:
         )
         if self._schema:
             self._schema.fields.append(field_schema)
+        if self.api.schema_cache:
+            self.api.schema_cache.invalidate(self.base.id)
         return field_schema
 
     def upload_attachment(
@@ -815,3 +1177,92 @@ class Table:
         }
         response = self.api.post(url, json=payload)
         return assert_typed_dict(UploadAttachmentResultDict, response)
+
+
+#: Characters which can appear in an Airtable record ID after the ``rec`` prefix.
+RECORD_ID_ALPHABET = string.digits + string.ascii_uppercase + string.ascii_lowercase
+
+
+def _record_id_buckets(segments: int) -> List[Formula]:
+    """
+    Build formulas which split records into disjoint segments according to the
+    fourth character of their record IDs. The last formula matches any record
+    not matched by the others, so that the segments are always exhaustive.
+    """
+    if not 1 <= segments <= len(RECORD_ID_ALPHABET):
+        raise ValueError(f"segments must be between 1 and {len(RECORD_ID_ALPHABET)}")
+    char = MID(RECORD_ID(), 4, 1)
+    size, extra = divmod(len(RECORD_ID_ALPHABET), segments)
+    buckets: List[Formula] = []
+    start = 0
+    for index in range(segments):
+        end = start + size + (1 if index < extra else 0)
+        buckets.append(FIND(char, RECORD_ID_ALPHABET[start:end]).gt(0))
+        start = end
+    buckets.append(FIND(char, RECORD_ID_ALPHABET).eq(0))
+    return buckets
+
+
+def _verify_segments(results: List[List[RecordDict]], total: int) -> None:
+    """
+    Raise :class:`~pyairtable.exceptions.SegmentedScanError` if any record
+    was returned by more than one segment of a scan, or if the segments did not
+    return ``total`` records between them.
+    """
+    counts = [len(segment) for segment in results]
+    unique = {record["id"] for segment in results for record in segment}
+    if sum(counts) != len(unique):
+        raise SegmentedScanError(
+            f"segment counts {counts} add up to {sum(counts)},"
+            f" but {len(unique)} distinct records were returned"
+        )
+    if len(unique) != total:
+        raise SegmentedScanError(
+            f"segments returned {len(unique)} records, but {total} records match"
+        )
+
+
+def _sort_key(sort: List[str]) -> Callable[[RecordDict], Any]:
+    """
+    Build a key function which orders records the same way as Airtable's ``sort`` param.
+    Blank values come first, text is compared without regard to case, and values
+    of different types are compared as strings.
+    """
+    fields = [(name.lstrip("-"), name.startswith("-")) for name in sort]
+
+    def _compare(a: RecordDict, b: RecordDict) -> int:
+        for name, descending in fields:
+            result = _compare_values(a["fields"].get(name), b["fields"].get(name))
+            if result:
+                return -result if descending else result
+        return 0
+
+    return cmp_to_key(_compare)
+
+
+def _compare_values(a: Any, b: Any) -> int:
+    if a is None or b is None:
+        return (a is not None) - (b is not None)
+    # Airtable sorts text without regard to case
+    if isinstance(a, str) and isinstance(b, str):
+        a, b = a.casefold(), b.casefold()
+    try:
+        return int(a > b) - int(a < b)
+    except TypeError:
+        a, b = str(a).casefold(), str(b).casefold()
+        return int(a > b) - int(a < b)
+
+
+def _check_upsert_key_fields(
+    records: Iterable[Dict[str, Any]],
+    key_fields: List[FieldName],
+) -> None:
+    """
+    Raise ``ValueError`` if any record without an ID is missing one of ``key_fields``.
+    """
+    for record in records:
+        if "id" in record:
+            continue
+        missing = set(key_fields) - set(record.get("fields", []))
+        if missing:
+            raise ValueError(f"missing {missing!r} in {record['fields'].keys()!r}")
@@ -334,6 +334,24 @@ class RecordDeletedDict(TypedDict):
     deleted: bool
 
 
+class RecordPageDict(TypedDict, total=False):
+    """
+    A ``dict`` representing one page of records returned by the Airtable API.
+    If there are more records, ``offset`` can be used to retrieve the next page.
+    See `List records <https://airtable.com/developers/web/api/list-records>`__.
+
+    Usage:
+        >>> table.page(page_size=2)
+        {
+            'records': [{'id': 'recAdw9EjV90xbW', ...}, {'id': 'recAdw9EjV90xbX', ...}],
+            'offset': 'itrdDnkJ4Q8bJDzsR/recAdw9EjV90xbX'
+        }
+    """
+
+    records: Required[List[RecordDict]]
+    offset: str
+
+
 class UpsertResultDict(TypedDict):
     """
     A ``dict`` representing the payload returned by the Airtable API after an upsert.
@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 from pyairtable.api import Api, Table
+from pyairtable.api.ratelimit import FileRateLimiter, RateLimiter
+from pyairtable.api.retrying import DEFAULT_POOL_CONNECTIONS
 from pyairtable.api.types import (RecordDict, WritableFields, UpdateRecordDict, RecordDeletedDict)
 from pyairtable.formulas import Formula
 
@@ -53,12 +55,17 @@ class AirtableClient:
         self,
         token: Optional[str] = None,
         base_id: Optional[str] = None,
-    *,
-    timeout: Optional[tuple[int, int]] = None,
-    enable_retries: bool = True,
-    endpoint_url: str = "https://api.airtable.com",
-    verify_ssl: Optional[bool] = None,
-    ca_bundle: Optional[str] = None,
+        *,
+        timeout: Optional[tuple[int, int]] = None,
+        enable_retries: bool = True,
+        endpoint_url: str = "https://api.airtable.com",
+        verify_ssl: Optional[bool] = None,
+        ca_bundle: Optional[str] = None,
+        rate_limit: Optional[Union[bool, RateLimiter]] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        tcp_keepalive: Union[bool, float] = False,
     ) -> None:
         """
         Initialize the Airtable client.
@@ -78,6 +85,18 @@ class AirtableClient:
                 and ``None`` defers to environment configuration.
             ca_bundle: Optional path to a custom CA bundle file. If provided (or set via
                 ``AIRTABLE_CA_BUNDLE``), requests will trust the certificates in that file.
+            rate_limit: Throttle requests before they are sent; see the ``rate_limit``
+                argument to :class:`~pyairtable.Api`. If not provided and
+                ``AIRTABLE_RATE_LIMIT_DIR`` is set, a
+                :class:`~pyairtable.api.ratelimit.FileRateLimiter` using that directory
+                will share one request budget between every process on the host.
+            pool_connections: The number of hosts to keep connections open to.
+            pool_maxsize: The number of connections to keep open to Airtable.
+                Raise this if more than 10 threads share one client, to avoid
+                "Connection pool is full" warnings and repeated TLS handshakes.
+            pool_block: Wait for a pooled connection instead of opening extra ones.
+            tcp_keepalive: Enable TCP keep-alive probes on idle connections; see the
+                ``tcp_keepalive`` argument to :class:`~pyairtable.Api`.
         
         Raises:
             ValueError: If token or base_id is not provided and not in environment.
@@ -112,12 +131,22 @@ class AirtableClient:
         assert self.token is not None
         assert self.base_id is not None
 
+        # Share a request budget with other processes if configured to do so
+        rate_limit_dir = os.getenv("AIRTABLE_RATE_LIMIT_DIR")
+        if rate_limit is None and rate_limit_dir:
+            rate_limit = FileRateLimiter(rate_limit_dir)
+
         # Initialize the underlying API client
         self._api = Api(
             api_key=self.token,
             timeout=timeout,
             retry_strategy=enable_retries,
             endpoint_url=endpoint_url,
+            rate_limit=rate_limit,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            tcp_keepalive=tcp_keepalive,
         )
 
         # Configure SSL verification behaviour
@@ -1,3 +1,8 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+import requests
+
+
 class PyAirtableError(Exception):
     """
     Base class for all exceptions raised by PyAirtable.
@@ -38,3 +43,76 @@ class UnsavedRecordError(PyAirtableError, ValueError):
     """
     Attempted to perform an unsupported operation on an unsaved record.
     """
+
+
+class SegmentedScanError(PyAirtableError, RuntimeError):
+    """
+    The segments of :meth:`Table.scan_parallel <pyairtable.Table.scan_parallel>`
+    returned overlapping records, or did not return every matching record,
+    so the results cannot be trusted.
+    """
+
+
+class BatchError(PyAirtableError):
+    """
+    One or more chunks of a batch operation failed while other chunks were
+    sent concurrently. Chunks listed in ``succeeded`` have already been committed
+    by Airtable; chunks listed in ``failed`` were not.
+    """
+
+    #: Maps the index of each successful chunk to its processed API response.
+    succeeded: Dict[int, Any]
+
+    #: Maps the index of each failed chunk to a tuple of its input items and the exception.
+    failed: Dict[int, Tuple[Sequence[Any], BaseException]]
+
+    def __init__(
+        self,
+        succeeded: Dict[int, Any],
+        failed: Dict[int, Tuple[Sequence[Any], BaseException]],
+    ):
+        self.succeeded = succeeded
+        self.failed = failed
+        total = len(succeeded) + len(failed)
+        super().__init__(
+            f"{len(failed)} of {total} chunks failed;"
+            f" first error in chunk {min(failed)}: {failed[min(failed)][1]!r}"
+        )
+
+    @property
+    def committed(self) -> List[Any]:
+        """
+        All records returned by chunks which succeeded, in input order.
+        """
+        committed: List[Any] = []
+        for index in sorted(self.succeeded):
+            result = self.succeeded[index]
+            committed.extend(result["records"] if isinstance(result, dict) else result)
+        return committed
+
+
+class CachedFailureError(PyAirtableError, requests.HTTPError):
+    """
+    A request was not sent, because a request for the same table or endpoint
+    recently failed with a status code that is unlikely to change (such as 403 or 404).
+    See :class:`~pyairtable.api.cache.NegativeCache`.
+
+    This is a subclass of :class:`requests.HTTPError` with the same message and
+    ``response`` as the original failure, so existing error handling still applies.
+    """
+
+
+class CircuitOpenError(PyAirtableError, requests.ConnectionError):
+    """
+    A request was not sent, because recent requests to the same class of endpoint
+    have been failing. See :class:`~pyairtable.api.circuit.CircuitBreaker`.
+    """
+
+    def __init__(self, endpoint: str, retry_in: float):
+        #: The class of endpoint whose circuit is open, such as ``"records.read"``.
+        self.endpoint = endpoint
+        #: The number of seconds until the circuit lets a probe request through.
+        self.retry_in = retry_in
+        super().__init__(
+            f"circuit for {endpoint!r} requests is open; retry in {retry_in:.1f}s"
+        )
@@ -0,0 +1,628 @@
+"""
+Materialize tables from a :class:`~pyairtable.Base` into a local SQLite database,
+so that they can be filtered, sorted, paginated and aggregated without calling Airtable.
+
+>>> mirror = Mirror(base, "hse.sqlite3", max_age=60)
+>>> incidents = mirror.table("Incidents", indexes=["Status", "Date"])
+>>> incidents.query(where={"Status": "Open"}, sort=["-Date"], limit=20)
+[{'id': 'rec...', 'createdTime': '...', 'fields': {...}}, ...]
+>>> incidents.count(where={"Status": "Open"})
+42
+>>> incidents.aggregate("Hours Lost", "sum", group_by="Site")
+{'North': 12.5, 'South': 3.0}
+
+Each table is brought up to date (see :mod:`pyairtable.sync`) whenever it is queried
+and its last refresh is older than ``max_age`` seconds. The database uses SQLite's
+`WAL mode <https://www.sqlite.org/wal.html>`__, so several processes can read from
+(and take turns refreshing) the same file.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from pyairtable.api.base import Base
+from pyairtable.api.table import Table
+from pyairtable.api.types import RecordDict, RecordId
+from pyairtable.models.schema import TableSchema
+from pyairtable.sync import (
+    SyncResult,
+    _fetch_by_id,
+    _list_record_ids,
+    _with_formula,
+    modified_since,
+)
+from pyairtable.utils import datetime_from_iso_str, datetime_to_iso_str
+
+#: SQLite column types for Airtable field types whose values are always numeric.
+#: Columns for all other field types are declared without a type, so that values
+#: keep whatever type they were given (text, numbers, or JSON-encoded lists).
+COLUMN_TYPES = {
+    "autoNumber": "INTEGER",
+    "checkbox": "INTEGER",
+    "count": "INTEGER",
+    "rating": "INTEGER",
+    "currency": "REAL",
+    "duration": "REAL",
+    "number": "REAL",
+    "percent": "REAL",
+}
+
+#: Operators which can be used in the ``filters=`` argument of query methods.
+OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "LIKE", "IN")
+
+#: Aggregate functions which can be used with :meth:`MirroredTable.aggregate`.
+AGGREGATES = ("count", "sum", "avg", "min", "max")
+
+#: Describes one condition: ``(field_name, operator, value)``
+Condition = Tuple[str, str, Any]
+
+#: How far to move each table's watermark back in time, to allow for
+#: differences between the local clock and Airtable's.
+CLOCK_SKEW = timedelta(minutes=1)
+
+
+class Mirror:
+    """
+    A local SQLite copy of one or more tables in a base.
+
+    Args:
+        base: The base to mirror.
+        path: The SQLite database file. Use ``":memory:"`` for a private, temporary mirror.
+        max_age: The number of seconds a table's data can be used for before
+            it is refreshed. If ``None``, tables are only refreshed by calling
+            :meth:`MirroredTable.refresh` explicitly.
+        deletion_interval: The number of seconds between checks for deleted records.
+            See :class:`~pyairtable.sync.TableSnapshot`.
+    """
+
+    def __init__(
+        self,
+        base: Base,
+        path: Union[str, Path],
+        *,
+        max_age: Optional[float] = 60,
+        deletion_interval: Optional[float] = 300,
+    ):
+        self.base = base
+        self.path = str(path)
+        self.max_age = max_age
+        self.deletion_interval = deletion_interval
+        self._tables: Dict[str, "MirroredTable"] = {}
+        self._local = threading.local()
+        self._shared: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        with self._write() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _pyairtable_mirror ("
+                " table_id TEXT PRIMARY KEY,"
+                " watermark TEXT,"
+                " synced_at REAL,"
+                " deletions_checked_at REAL)"
+            )
+
+    def __repr__(self) -> str:
+        return f"<Mirror base={self.base.id!r} path={self.path!r}>"
+
+    def table(
+        self,
+        id_or_name: str,
+        *,
+        indexes: Iterable[str] = (),
+        **options: Any,
+    ) -> "MirroredTable":
+        """
+        Get (or start mirroring) the table with the given ID or name.
+
+        Args:
+            id_or_name: The table's ID or name.
+            indexes: Names of fields which should be indexed for faster querying.
+            options: Options passed to :meth:`Table.all <pyairtable.Table.all>`
+                when retrieving records, such as ``view`` or ``formula``.
+        """
+        schema = self.base.schema().table(id_or_name)
+        with self._lock:
+            if not (mirrored := self._tables.get(schema.id)):
+                mirrored = MirroredTable(self, self.base.table(schema.id), **options)
+                self._tables[schema.id] = self._tables[schema.name] = mirrored
+        mirrored.create_indexes(indexes)
+        return mirrored
+
+    def close(self) -> None:
+        """
+        Close the current thread's connection to the database.
+        """
+        if conn := getattr(self._local, "conn", None):
+            conn.close()
+            del self._local.conn
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        The current thread's connection to the database.
+        """
+        if self.path == ":memory:":
+            # an in-memory database only exists within a single connection
+            if not self._shared:
+                self._shared = self._connect(check_same_thread=False)
+            return self._shared
+        if not (conn := getattr(self._local, "conn", None)):
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _connect(self, **kwargs: Any) -> sqlite3.Connection:
+        conn: sqlite3.Connection = sqlite3.connect(
+            self.path, timeout=60, isolation_level=None, **kwargs
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Hold the database's write lock (across all processes) for the duration of a block.
+        """
+        with self._lock:
+            conn = self.connection
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+
+class MirroredTable:
+    """
+    A table which has been copied into a :class:`Mirror`.
+    Records are stored in an SQLite table named after the Airtable table's ID,
+    with one column per field (named after the field's ID).
+    """
+
+    def __init__(self, mirror: Mirror, table: Table, **options: Any):
+        if "sort" in options or "max_records" in options:
+            raise ValueError("MirroredTable does not support sort or max_records")
+        self.mirror = mirror
+        self.table = table
+        self.options = options
+        self._columns: Dict[str, str] = {}  # field name => column name
+        self._sql_name = _quote(f"records_{table.name}")
+        self._ensure_columns(self.schema)
+
+    def __repr__(self) -> str:
+        return f"<MirroredTable {self.table.name!r} path={self.mirror.path!r}>"
+
+    @property
+    def schema(self) -> TableSchema:
+        return self.table.base.schema().table(self.table.name)
+
+    @property
+    def synced_at(self) -> Optional[datetime]:
+        """
+        The time at which this table was last refreshed, or ``None`` if it has never been.
+        """
+        if not (row := self._state()) or row[1] is None:
+            return None
+        return datetime.fromtimestamp(row[1], timezone.utc)
+
+    def refresh(
+        self, *, max_age: Optional[float] = 0, full: bool = False
+    ) -> SyncResult:
+        """
+        Bring the mirrored table up to date with Airtable.
+
+        Records are retrieved from Airtable before the database's write lock is taken,
+        so other threads and processes can keep writing while a refresh is in progress.
+        If another refresh which started after this one finishes first,
+        its results are kept and this refresh's are discarded.
+
+        Args:
+            max_age: Skip the refresh if the table was refreshed less than this many
+                seconds ago (possibly by another thread or process).
+            full: If ``True``, discard the current watermark and read every record.
+        """
+        watermark, synced_at, deletions_checked_at = self._state() or (None,) * 3
+        now = time.time()
+        if max_age and synced_at and now - synced_at < max_age:
+            return SyncResult()
+
+        new_watermark = datetime.now(timezone.utc) - CLOCK_SKEW
+        result = SyncResult(full=(full or not watermark))
+        existing = self._record_ids(self.mirror.connection)
+        deletion_interval = self.mirror.deletion_interval
+
+        if result.full:
+            records = self.table.all(**self.options)
+            latest = {record["id"] for record in records}
+            result.deleted = sorted(existing - latest)
+            deletions_checked_at = now
+        else:
+            since = datetime_from_iso_str(watermark)
+            options = _with_formula(self.options, modified_since(since))
+            records = self.table.all(**options)
+            if deletion_interval is not None and (
+                now - (deletions_checked_at or 0) >= deletion_interval
+            ):
+                latest = _list_record_ids(self.table, self.options)
+                result.deleted = sorted(existing - latest)
+                fetched = {record["id"] for record in records}
+                missing = latest - existing - fetched
+                records += _fetch_by_id(self.table, self.options, missing)
+                deletions_checked_at = now
+
+        with self.mirror._write() as conn:
+            current = self._state()
+            if (
+                current
+                and current[0]
+                and (datetime_from_iso_str(current[0]) > new_watermark)
+            ):
+                return SyncResult()  # a more recent refresh has already been stored
+            existing = self._record_ids(conn)
+            result.deleted = [rid for rid in result.deleted if rid in existing]
+            for record in records:
+                record_id = record["id"]
+                (result.updated if record_id in existing else result.created).append(
+                    record_id
+                )
+            self._store(conn, records)
+            self.discard(result.deleted)
+            conn.execute(
+                "INSERT OR REPLACE INTO _pyairtable_mirror VALUES (?, ?, ?, ?)",
+                (
+                    self.table.name,
+                    datetime_to_iso_str(new_watermark),
+                    now,
+                    deletions_checked_at,
+                ),
+            )
+            return result
+
+    def _record_ids(self, conn: sqlite3.Connection) -> Set[str]:
+        return {row[0] for row in conn.execute(f"SELECT id FROM {self._sql_name}")}
+
+    def create_indexes(self, field_names: Iterable[str]) -> None:
+        """
+        Create indexes on the given fields (if they do not already exist).
+        """
+        with self.mirror._write() as conn:
+            for field_name in field_names:
+                column = self._column(field_name)
+                index = _quote(f"idx_{self.table.name}_{column.strip(chr(34))}")
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index} ON {self._sql_name} ({column})"
+                )
+
+    def store(self, records: Iterable[RecordDict]) -> None:
+        """
+        Write records into the mirror without waiting for the next refresh,
+        such as the records returned by :meth:`Table.create <pyairtable.Table.create>`
+        or :meth:`Table.update <pyairtable.Table.update>`.
+        """
+        with self.mirror._write() as conn:
+            self._store(conn, list(records))
+
+    def discard(self, record_ids: Iterable[RecordId]) -> None:
+        """
+        Remove records from the mirror without waiting for the next refresh,
+        such as after calling :meth:`Table.delete <pyairtable.Table.delete>`.
+        """
+        with self.mirror._write() as conn:
+            conn.executemany(
+                f"DELETE FROM {self._sql_name} WHERE id = ?",
+                [(record_id,) for record_id in record_ids],
+            )
+
+    def get(self, record_id: RecordId) -> Optional[RecordDict]:
+        """
+        Retrieve one record from the mirror, or ``None`` if it does not exist.
+        """
+        self._refresh_if_stale()
+        row = self.mirror.connection.execute(
+            f"SELECT record FROM {self._sql_name} WHERE id = ?", (record_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(
+        self,
+        where: Optional[Mapping[str, Any]] = None,
+        *,
+        filters: Sequence[Condition] = (),
+        sort: Sequence[str] = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[RecordDict]:
+        """
+        Retrieve records from the mirror.
+
+        >>> table.query({"Status": ["Open", "Blocked"]}, filters=[("Hours", ">", 2)])
+        [{'id': 'rec...', 'createdTime': '...', 'fields': {...}}, ...]
+
+        Args:
+            where: Maps field names to values they must be equal to. A value of
+                ``None`` matches blank cells, and a list matches any of its values.
+            filters: Additional conditions, given as ``(field_name, operator, value)``.
+                Supported operators are ``=``, ``!=``, ``<``, ``<=``, ``>``, ``>=``,
+                ``LIKE`` and ``IN``.
+            sort: Field names to sort by. Prefix a name with ``-`` for descending order.
+            limit: The maximum number of records to return.
+            offset: The number of records to skip.
+        """
+        rows = self._select(where, filters, sort, limit, offset)
+        return [json.loads(row[0]) for row in rows]
+
+    def iterate(
+        self,
+        where: Optional[Mapping[str, Any]] = None,
+        *,
+        filters: Sequence[Condition] = (),
+        sort: Sequence[str] = (),
+        limit: Optional[int] = None,
+        page_size: int = 100,
+    ) -> Iterator[List[RecordDict]]:
+        """
+        Retrieve records from the mirror in lists of up to ``page_size``, so that
+        a large table does not need to be loaded into memory all at once.
+        See :meth:`query` for details on the other arguments.
+
+        >>> for page in table.iterate(page_size=500):
+        ...     send(page)
+        """
+        rows = self._select(where, filters, sort, limit, 0)
+        while page := rows.fetchmany(page_size):
+            yield [json.loads(row[0]) for row in page]
+
+    def _select(
+        self,
+        where: Optional[Mapping[str, Any]],
+        filters: Sequence[Condition],
+        sort: Sequence[str],
+        limit: Optional[int],
+        offset: int,
+    ) -> sqlite3.Cursor:
+        self._refresh_if_stale()
+        sql, args = self._where(where, filters)
+        order = ", ".join(
+            f"{self._column(name.lstrip('-'))} {'DESC' if name.startswith('-') else 'ASC'}"
+            for name in sort
+        )
+        sql = f"SELECT record FROM {self._sql_name}{sql}"
+        sql += f" ORDER BY {order}, rowid" if order else " ORDER BY rowid"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            args += [-1 if limit is None else limit, offset]
+        return self.mirror.connection.execute(sql, args)
+
+    def count(
+        self,
+        where: Optional[Mapping[str, Any]] = None,
+        *,
+        filters: Sequence[Condition] = (),
+    ) -> int:
+        """
+        Count the records in the mirror which match the given conditions.
+        See :meth:`query` for details on each argument.
+        """
+        return int(self.aggregate(None, "count", where, filters=filters))
+
+    def aggregate(
+        self,
+        field_name: Optional[str],
+        function: str,
+        where: Optional[Mapping[str, Any]] = None,
+        *,
+        filters: Sequence[Condition] = (),
+        group_by: Optional[str] = None,
+    ) -> Any:
+        """
+        Calculate an aggregate value over a field's values.
+
+        >>> table.aggregate("Hours Lost", "sum", {"Status": "Closed"})
+        127.5
+        >>> table.aggregate("Hours Lost", "avg", group_by="Site")
+        {'North': 3.1, 'South': 1.5}
+
+        Args:
+            field_name: The field to aggregate. May be ``None`` when counting records.
+            function: One of ``count``, ``sum``, ``avg``, ``min`` or ``max``.
+            group_by: If provided, return a dict which maps each distinct value
+                of this field to the aggregate value for records with that value.
+                Values of fields which contain lists are returned as tuples.
+
+        See :meth:`query` for details on the other arguments.
+        """
+        if function not in AGGREGATES:
+            raise ValueError(f"function must be one of {AGGREGATES!r}")
+        self._refresh_if_stale()
+        target = self._column(field_name) if field_name else "*"
+        expr = f"{function.upper()}({target})"
+        sql, args = self._where(where, filters)
+        if not group_by:
+            row = self.mirror.connection.execute(
+                f"SELECT {expr} FROM {self._sql_name}{sql}", args
+            ).fetchone()
+            return row[0]
+        group = self._column(group_by)
+        rows = self.mirror.connection.execute(
+            f"SELECT {group}, {expr} FROM {self._sql_name}{sql} GROUP BY {group}", args
+        )
+        return {_decode(key): value for (key, value) in rows}
+
+    def _refresh_if_stale(self) -> None:
+        if (max_age := self.mirror.max_age) is None:
+            return
+        if (row := self._state()) and row[1] and time.time() - row[1] < max_age:
+            return
+        self.refresh(max_age=max_age)
+
+    def _state(self) -> Optional[Tuple[Any, ...]]:
+        row: Optional[Tuple[Any, ...]] = self.mirror.connection.execute(
+            "SELECT watermark, synced_at, deletions_checked_at"
+            " FROM _pyairtable_mirror WHERE table_id = ?",
+            (self.table.name,),
+        ).fetchone()
+        return row
+
+    def _ensure_columns(self, schema: TableSchema) -> None:
+        """
+        Create the table (and add columns for any new fields) based on the schema.
+        """
+        with self.mirror._write() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._sql_name} ("
+                " id TEXT PRIMARY KEY,"
+                " created_time TEXT,"
+                " record TEXT NOT NULL)"
+            )
+            existing = {
+                row[1] for row in conn.execute(f"PRAGMA table_info({self._sql_name})")
+            }
+            for field in schema.fields:
+                if field.id not in existing:
+                    column_type = COLUMN_TYPES.get(field.type, "")
+                    conn.execute(
+                        f"ALTER TABLE {self._sql_name}"
+                        f" ADD COLUMN {_quote(field.id)} {column_type}"
+                    )
+                self._columns[field.name] = self._columns[field.id] = _quote(field.id)
+
+    def _column(self, field_name: str) -> str:
+        if field_name not in self._columns:
+            self._ensure_columns(
+                self.table.base.schema(force=True).table(self.table.name)
+            )
+        try:
+            return self._columns[field_name]
+        except KeyError:
+            raise KeyError(f"{self.table.name!r} has no field {field_name!r}") from None
+
+    def _store(self, conn: sqlite3.Connection, records: List[RecordDict]) -> None:
+        if any(name not in self._columns for r in records for name in r["fields"]):
+            self._ensure_columns(
+                self.table.base.schema(force=True).table(self.table.name)
+            )
+        columns = sorted(set(self._columns.values()))
+        lookup: Dict[str, List[str]] = {column: [] for column in columns}
+        for name, column in self._columns.items():
+            lookup[column].append(name)
+        # update rows in place, so records keep their position in unsorted queries
+        sql = (
+            f"INSERT INTO {self._sql_name}"
+            f" (id, created_time, record, {', '.join(columns)})"
+            f" VALUES (?, ?, ?, {', '.join('?' for _ in columns)})"
+            " ON CONFLICT (id) DO UPDATE SET"
+            f" {', '.join(f'{c} = excluded.{c}' for c in ['record', *columns])}"
+        )
+        conn.executemany(
+            sql,
+            [
+                (
+                    record["id"],
+                    record["createdTime"],
+                    json.dumps(record),
+                    *(
+                        _encode(_first(record["fields"], lookup[column]))
+                        for column in columns
+                    ),
+                )
+                for record in records
+            ],
+        )
+
+    def _where(
+        self,
+        where: Optional[Mapping[str, Any]],
+        filters: Sequence[Condition],
+    ) -> Tuple[str, List[Any]]:
+        conditions = [
+            (name, "IN" if isinstance(value, (list, tuple, set)) else "=", value)
+            for (name, value) in (where or {}).items()
+        ]
+        conditions.extend(filters)
+        clauses = []
+        args: List[Any] = []
+        for name, operator, value in conditions:
+            operator = operator.upper()
+            if operator not in OPERATORS:
+                raise ValueError(f"operator must be one of {OPERATORS!r}")
+            column = self._column(name)
+            if value is None and operator in ("=", "!="):
+                clauses.append(f"{column} IS {'NOT ' if operator == '!=' else ''}NULL")
+            elif operator == "IN":
+                values = [_encode(v) for v in value]
+                clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                args.extend(values)
+            else:
+                clauses.append(f"{column} {operator} ?")
+                args.append(_encode(value))
+        if not clauses:
+            return ("", args)
+        return (" WHERE " + " AND ".join(clauses), args)
+
+
+def _quote(identifier: str) -> str:
+    if not re.fullmatch(r"\w+", identifier):
+        raise ValueError(f"invalid identifier: {identifier!r}")
+    return f'"{identifier}"'
+
+
+def _first(fields: Mapping[str, Any], names: Iterable[str]) -> Any:
+    for name in names:
+        if name in fields:
+            return fields[name]
+    return None
+
+
+def _encode(value: Any) -> Any:
+    """
+    Convert a field value into something that can be stored in SQLite.
+    """
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """
+    Convert a value stored by :func:`_encode` back into a field value which can be
+    used as a dict key. Lists become tuples, and any value which still cannot be
+    used as a key (such as a collaborator) is left as JSON.
+    """
+    if isinstance(value, str) and value[:1] in ("[", "{"):
+        try:
+            decoded = json.loads(value)
+        except ValueError:
+            return value
+        if isinstance(decoded, list):
+            decoded = tuple(decoded)
+        try:
+            hash(decoded)
+        except TypeError:
+            return value
+        return decoded
+    return value
@@ -88,7 +88,7 @@ class Webhook(CanDeleteModel, url="bases/{base.id}/webhooks/{self.id}"):
         self.expiration_time = response.get("expirationTime")
 
     def payloads(
-        self, cursor: int = 1, *, limit: Optional[int] = None
+        self, cursor: int = 1, *, limit: Optional[int] = None, prefetch: int = 0
     ) -> Iterator["WebhookPayload"]:
         """
         Iterate through all payloads on or after the given cursor.
@@ -104,6 +104,7 @@ class Webhook(CanDeleteModel, url="bases/{base.id}/webhooks/{self.id}"):
             cursor: The cursor of the first webhook payload to retrieve.
             limit: The number of payloads to yield before stopping.
                 If not provided, will retrieve all remaining payloads.
+            prefetch: |kwarg_prefetch|
 
         Usage:
             >>> webhook = Base.webhook("ach00000000000001")
@@ -144,11 +145,14 @@ class Webhook(CanDeleteModel, url="bases/{base.id}/webhooks/{self.id}"):
             url=url,
             options=options,
             offset_field="cursor",
+            prefetch=prefetch,
         ):
             payloads = page["payloads"]
             for index, payload in enumerate(payloads):
                 payload = WebhookPayload.from_api(payload, self._api, context=self)
                 payload.cursor = cursor + index
+                if payload.changes_schema and self._api.schema_cache:
+                    self._api.schema_cache.invalidate(self._url_context["base"].id)
                 yield payload
                 count += 1
                 if limit is not None and count >= limit:
@@ -305,6 +309,23 @@ class WebhookPayload(AirtableModel):
     #: This field is specific to pyAirtable, and is not part of Airtable's webhook payload specification.
     cursor: Optional[int] = None
 
+    @property
+    def changes_schema(self) -> bool:
+        """
+        Whether this payload reports tables or fields being created, changed or destroyed.
+        """
+        return bool(
+            self.created_tables_by_id
+            or self.destroyed_table_ids
+            or any(
+                table.changed_metadata
+                or table.changed_fields_by_id
+                or table.created_fields_by_id
+                or table.destroyed_field_ids
+                for table in self.changed_tables_by_id.values()
+            )
+        )
+
     class ActionMetadata(AirtableModel):
         source: str
         source_metadata: Dict[Any, Any] = FD()
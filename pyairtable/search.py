@@ -0,0 +1,231 @@
+"""
+Full-text search over a table's records, either by Airtable (using a formula)
+or locally (using an in-memory inverted index).
+
+>>> formula = search_formula("slip hazard", searchable_fields(table.schema()))
+>>> table.all(formula=formula)
+[{'id': 'rec...', 'createdTime': '...', 'fields': {...}}, ...]
+
+>>> index = SearchIndex(snapshot.all())
+>>> index.search("sli haz")  # every word is matched as a prefix
+[{'id': 'rec...', 'createdTime': '...', 'fields': {...}}, ...]
+"""
+
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Protocol, Set
+
+from pyairtable.api.types import FieldName, RecordDict, RecordId
+from pyairtable.formulas import AND, LOWER, OR, SEARCH, Field, Formula
+from pyairtable.models.schema import TableSchema
+from pyairtable.sync import SyncResult
+
+#: Field types whose values can be meaningfully searched as text.
+SEARCHABLE_FIELD_TYPES = (
+    "email",
+    "multilineText",
+    "multipleSelects",
+    "phoneNumber",
+    "richText",
+    "singleLineText",
+    "singleSelect",
+    "url",
+)
+
+#: Matches each word in a search query or a field value.
+WORD_RE = re.compile(r"\w+")
+
+
+def searchable_fields(schema: TableSchema) -> List[FieldName]:
+    """
+    Return the names of all fields in the table whose type is
+    in :data:`SEARCHABLE_FIELD_TYPES`.
+    """
+    return [
+        field.name for field in schema.fields if field.type in SEARCHABLE_FIELD_TYPES
+    ]
+
+
+def search_formula(query: str, fields: Iterable[FieldName]) -> Formula:
+    """
+    Build a formula which matches records where every word in ``query``
+    appears (ignoring case) in at least one of the given fields.
+
+    >>> search_formula("Slip", ["Name", "Notes"])
+    AND(OR(SEARCH('slip', LOWER({Name})), SEARCH('slip', LOWER({Notes}))))
+
+    Raises:
+        ValueError: If ``query`` is blank or ``fields`` is empty.
+    """
+    words = query.lower().split()
+    columns = [Field(name) for name in fields]
+    if not words or not columns:
+        raise ValueError("search_formula() requires a query and at least one field")
+    return AND(
+        *(OR(*(SEARCH(word, LOWER(column)) for column in columns)) for word in words)
+    )
+
+
+class RecordSource(Protocol):
+    """
+    Anything which can look up a record by ID, such as
+    :class:`~pyairtable.sync.TableSnapshot` or :class:`~pyairtable.mirror.MirroredTable`.
+    """
+
+    def get(self, record_id: RecordId) -> Optional[RecordDict]: ...
+
+
+class SearchIndex:
+    """
+    An in-memory inverted index which maps each word in a set of records
+    to the IDs of the records containing it.
+
+    Records can be added, replaced and removed at any time, so the index can be
+    kept up to date as records change (see :meth:`apply`) instead of being rebuilt.
+    Searches are answered without any API calls, and treat each word in the query
+    as a prefix, which makes the index suitable for search-as-you-type.
+
+    Args:
+        records: Records to add to the index.
+        fields: If provided, only these fields will be indexed.
+            Otherwise, every field with a text or numeric value will be indexed.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[RecordDict] = (),
+        *,
+        fields: Optional[Iterable[FieldName]] = None,
+    ):
+        self.fields = set(fields) if fields is not None else None
+        self._records: Dict[RecordId, RecordDict] = {}
+        self._postings: Dict[str, Set[RecordId]] = {}
+        self._record_words: Dict[RecordId, Set[str]] = {}
+        self._words: List[str] = []  # sorted, for prefix lookups
+        self._lock = threading.RLock()
+        self.update(records)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} records={len(self)} words={len(self._words)}>"
+        )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._records
+
+    def add(self, record: RecordDict) -> None:
+        """
+        Add a record to the index, replacing any previous version of it.
+        """
+        with self._lock:
+            record_id = record["id"]
+            words = set(self._words_in(record))
+            previous = self._record_words.get(record_id, set())
+            for word in previous - words:
+                self._unlink(word, record_id)
+            for word in words - previous:
+                if word not in self._postings:
+                    self._postings[word] = set()
+                    insort(self._words, word)
+                self._postings[word].add(record_id)
+            self._record_words[record_id] = words
+            self._records[record_id] = record
+
+    def update(self, records: Iterable[RecordDict]) -> None:
+        """
+        Add several records to the index. See :meth:`add`.
+        """
+        with self._lock:
+            for record in records:
+                self.add(record)
+
+    def remove(self, record_id: RecordId) -> None:
+        """
+        Remove a record from the index, if it is present.
+        """
+        with self._lock:
+            for word in self._record_words.pop(record_id, ()):
+                self._unlink(word, record_id)
+            self._records.pop(record_id, None)
+
+    def apply(self, result: SyncResult, source: RecordSource) -> None:
+        """
+        Update the index with the changes from one refresh of a
+        :class:`~pyairtable.sync.TableSnapshot` or :class:`~pyairtable.mirror.MirroredTable`.
+
+        >>> result = snapshot.refresh()
+        >>> index.apply(result, snapshot)
+        """
+        with self._lock:
+            for record_id in result.deleted:
+                self.remove(record_id)
+            for record_id in [*result.created, *result.updated]:
+                if record := source.get(record_id):
+                    self.add(record)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[RecordDict]:
+        """
+        Return records which contain a word starting with each word in ``query``,
+        in the order they were first added to the index.
+        If ``query`` contains no words, all records are returned.
+
+        Args:
+            query: The words to search for (case-insensitive).
+            limit: The maximum number of records to return.
+        """
+        with self._lock:
+            matches: Optional[Set[RecordId]] = None
+            for word in sorted(set(_words(query)), key=len, reverse=True):
+                found: Set[RecordId] = set()
+                for indexed in self._prefixed(word):
+                    found |= self._postings[indexed]
+                matches = found if matches is None else (matches & found)
+                if not matches:
+                    return []
+            results = []
+            for record_id, record in self._records.items():
+                if matches is None or record_id in matches:
+                    results.append(record)
+                    if limit is not None and len(results) >= limit:
+                        break
+            return results
+
+    def _prefixed(self, prefix: str) -> Iterator[str]:
+        index = bisect_left(self._words, prefix)
+        while index < len(self._words) and self._words[index].startswith(prefix):
+            yield self._words[index]
+            index += 1
+
+    def _unlink(self, word: str, record_id: RecordId) -> None:
+        postings = self._postings[word]
+        postings.discard(record_id)
+        if not postings:
+            del self._postings[word]
+            del self._words[bisect_left(self._words, word)]
+
+    def _words_in(self, record: RecordDict) -> Iterator[str]:
+        for name, value in record["fields"].items():
+            if self.fields is None or name in self.fields:
+                yield from _words(value)
+
+
+def _words(value: Any) -> Iterator[str]:
+    """
+    Find all the words in a field value (including lists and dicts, such as
+    multiple select values, collaborators or attachments).
+    """
+    if isinstance(value, bool):
+        return
+    if isinstance(value, (str, int, float)):
+        yield from WORD_RE.findall(str(value).lower())
+    elif isinstance(value, dict):
+        for item in value.values():
+            if isinstance(item, str):
+                yield from _words(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _words(item)
@@ -0,0 +1,256 @@
+"""
+Keep a local copy of a table's records up to date without re-reading the whole table.
+
+>>> snapshot = TableSnapshot(api.table("appYourBase", "Incidents"))
+>>> snapshot.refresh()  # the first refresh reads every record
+SyncResult(created=[...], updated=[], deleted=[], full=True)
+>>> snapshot.refresh()  # later refreshes only read records modified since the last one
+SyncResult(created=[], updated=['recSomethingNew'], deleted=[], full=False)
+>>> snapshot.all()
+[{'id': ..., 'createdTime': ..., 'fields': {...}}, ...]
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from pyairtable.api.table import Table
+from pyairtable.api.types import RecordDict, RecordId
+from pyairtable.formulas import (
+    AND,
+    CREATED_TIME,
+    IS_AFTER,
+    LAST_MODIFIED_TIME,
+    OR,
+    RECORD_ID,
+    Formula,
+)
+
+#: The number of record IDs to look up in a single ``RECORD_ID()`` formula.
+RECORD_ID_BATCH_SIZE = 100
+
+
+@dataclass
+class SyncResult:
+    """
+    Describes the changes that were applied to a :class:`TableSnapshot` by one refresh.
+    """
+
+    #: IDs of records which were not previously in the snapshot.
+    created: List[RecordId] = field(default_factory=list)
+
+    #: IDs of records in the snapshot which were replaced with a newer version.
+    updated: List[RecordId] = field(default_factory=list)
+
+    #: IDs of records which were removed from the snapshot.
+    deleted: List[RecordId] = field(default_factory=list)
+
+    #: Whether the refresh read the entire table (rather than only recent changes).
+    full: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.updated or self.deleted)
+
+
+class TableSnapshot:
+    """
+    An in-memory copy of the records in a table, which can be cheaply refreshed.
+
+    The first call to :meth:`refresh` reads every record. After that, each refresh
+    only requests records where ``LAST_MODIFIED_TIME()`` or ``CREATED_TIME()`` is after
+    the time of the previous refresh (the "watermark"), and merges them into the snapshot.
+
+    Airtable does not report deleted records, so every ``deletion_interval`` the
+    snapshot will also list the IDs of all matching records (with ``fields=[]``, so
+    each page is very small), drop any it no longer sees, and fetch any new ones
+    which were not caught by the watermark (such as records which entered a view).
+
+    Args:
+        table: The table to read records from.
+        deletion_interval: How often to check for deleted records (by default, every
+            five minutes). Refreshes in between only request modified records.
+            If ``0``, every refresh will check. If ``None``, deleted records
+            will only be detected by calling ``refresh(full=True)``.
+        clock_skew: How far to move the watermark back in time, to allow for
+            differences between the local clock and Airtable's.
+        options: Any options accepted by :meth:`Table.all <pyairtable.Table.all>`,
+            such as ``view``, ``formula`` or ``fields``. ``sort`` and ``max_records``
+            are not supported.
+    """
+
+    #: The table this snapshot reads from.
+    table: Table
+
+    #: The time (in UTC) at which the most recent refresh began, less ``clock_skew``.
+    watermark: Optional[datetime]
+
+    def __init__(
+        self,
+        table: Table,
+        *,
+        deletion_interval: Optional[Union[int, float, timedelta]] = timedelta(
+            minutes=5
+        ),
+        clock_skew: Union[int, float, timedelta] = timedelta(minutes=1),
+        **options: Any,
+    ):
+        if "sort" in options or "max_records" in options:
+            raise ValueError("TableSnapshot does not support sort or max_records")
+        if isinstance(deletion_interval, (int, float)):
+            deletion_interval = timedelta(seconds=deletion_interval)
+        if isinstance(clock_skew, (int, float)):
+            clock_skew = timedelta(seconds=clock_skew)
+        self.table = table
+        self.deletion_interval = deletion_interval
+        self.clock_skew = clock_skew
+        self.options = options
+        self.watermark = None
+        self._records: Dict[RecordId, RecordDict] = {}
+        self._last_deletion_check = 0.0
+        self._lock = threading.RLock()
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} table={self.table.name!r}"
+            f" records={len(self._records)} watermark={self.watermark!r}>"
+        )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._records
+
+    def get(self, record_id: RecordId) -> Optional[RecordDict]:
+        """
+        Retrieve a record from the snapshot (without making any API calls),
+        or return ``None`` if it is not in the snapshot.
+        """
+        return self._records.get(record_id)
+
+    def all(self) -> List[RecordDict]:
+        """
+        Retrieve all records in the snapshot (without making any API calls).
+        Records are returned in the order they were first retrieved,
+        followed by any records added since.
+        """
+        with self._lock:
+            return list(self._records.values())
+
+    def refresh(self, *, full: bool = False) -> SyncResult:
+        """
+        Bring the snapshot up to date with the table.
+
+        Args:
+            full: If ``True``, discard the current watermark and read every record.
+        """
+        with self._lock:
+            started = datetime.now(timezone.utc)
+            if full or self.watermark is None:
+                result = self._refresh_full()
+            else:
+                result = self._refresh_since(self.watermark)
+            self.watermark = started - self.clock_skew
+            return result
+
+    def _refresh_full(self) -> SyncResult:
+        records = self.table.all(**self.options)
+        result = SyncResult(full=True)
+        latest = {record["id"]: record for record in records}
+        result.deleted = [rid for rid in self._records if rid not in latest]
+        for record in latest.values():
+            self._merge(record, result)
+        self._records = {rid: self._records[rid] for rid in latest}
+        self._last_deletion_check = time.monotonic()
+        return result
+
+    def _refresh_since(self, watermark: datetime) -> SyncResult:
+        result = SyncResult()
+        changed = modified_since(watermark)
+        for record in self.table.all(**_with_formula(self.options, changed)):
+            self._merge(record, result)
+
+        if self._deletion_check_due():
+            record_ids = _list_record_ids(self.table, self.options)
+            result.deleted = [rid for rid in self._records if rid not in record_ids]
+            for record_id in result.deleted:
+                del self._records[record_id]
+            missing = [rid for rid in record_ids if rid not in self._records]
+            for record in _fetch_by_id(self.table, self.options, missing):
+                self._merge(record, result)
+            self._last_deletion_check = time.monotonic()
+
+        return result
+
+    def _merge(self, record: RecordDict, result: SyncResult) -> None:
+        record_id = record["id"]
+        if record_id not in self._records:
+            result.created.append(record_id)
+        elif self._records[record_id] != record:
+            result.updated.append(record_id)
+        self._records[record_id] = record
+
+    def _deletion_check_due(self) -> bool:
+        if self.deletion_interval is None:
+            return False
+        elapsed = time.monotonic() - self._last_deletion_check
+        return elapsed >= self.deletion_interval.total_seconds()
+
+
+def modified_since(when: datetime) -> Formula:
+    """
+    Build a formula which matches records that were created or modified after
+    the given time.
+
+    >>> modified_since(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    OR(IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('2024-01-01T00:00:00.000Z')), ...)
+    """
+    return OR(
+        IS_AFTER(LAST_MODIFIED_TIME(), when),
+        IS_AFTER(CREATED_TIME(), when),
+    )
+
+
+def _with_formula(options: Dict[str, Any], formula: Formula) -> Dict[str, Any]:
+    """
+    Combine the given formula with any ``formula`` already in ``options``.
+    """
+    if not (existing := options.get("formula")):
+        return {**options, "formula": formula}
+    if isinstance(existing, str):
+        existing = Formula(existing)
+    return {**options, "formula": AND(existing, formula)}
+
+
+def _list_record_ids(table: Table, options: Dict[str, Any]) -> Set[RecordId]:
+    """
+    Retrieve the IDs of all records matching ``view`` and ``formula`` in ``options``,
+    without retrieving any of their fields.
+    """
+    options = {
+        key: value for (key, value) in options.items() if key in ("view", "formula")
+    }
+    return {
+        record["id"]
+        for page in table.iterate(**options, fields=[], page_size=100)
+        for record in page
+    }
+
+
+def _fetch_by_id(
+    table: Table,
+    options: Dict[str, Any],
+    record_ids: Iterable[RecordId],
+) -> List[RecordDict]:
+    """
+    Retrieve the records with the given IDs, in batches of ``RECORD_ID_BATCH_SIZE``.
+    """
+    record_ids = sorted(record_ids)
+    records = []
+    for start in range(0, len(record_ids), RECORD_ID_BATCH_SIZE):
+        batch = record_ids[start : start + RECORD_ID_BATCH_SIZE]
+        formula = OR(*(RECORD_ID().eq(record_id) for record_id in batch))
+        records.extend(table.all(**_with_formula(options, formula)))
+    return records
@@ -1,4 +1,5 @@
 import inspect
+import itertools
 import logging
 import re
 import textwrap
@@ -126,16 +127,24 @@ def attachment(url: str, filename: str = "") -> CreateAttachmentByUrl:
     return {"url": url} if not filename else {"url": url, "filename": filename}
 
 
-def chunked(iterable: Sequence[T], chunk_size: int) -> Iterator[Sequence[T]]:
+def chunked(iterable: Iterable[T], chunk_size: int) -> Iterator[Sequence[T]]:
     """
     Break a sequence into chunks.
 
+    If given an iterator or generator rather than a sequence, items will be consumed
+    lazily, so that no more than ``chunk_size`` of them are held in memory at once.
+
     Args:
-        iterable: Any sequence.
+        iterable: Any sequence or iterable.
         chunk_size: Maximum items to yield per chunk.
     """
-    for i in range(0, len(iterable), chunk_size):
-        yield iterable[i : i + chunk_size]
+    if isinstance(iterable, Sequence):
+        for i in range(0, len(iterable), chunk_size):
+            yield iterable[i : i + chunk_size]
+        return
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
 
 
 def is_airtable_id(value: Any, prefix: str = "") -> bool:
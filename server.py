@@ -4,13 +4,16 @@ Working Airtable Dashboard - Updated with Modern UI Structure
 Based on the successful working dashboard design
 """
 
+import itertools
+import json
 import os
 import sys
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from flask import Flask, jsonify, request, render_template_string
+from flask import Flask, Response, jsonify, request, render_template_string, stream_with_context
 from pyairtable import Api
+from pyairtable.mirror import Mirror
 
 # Setup SSL bypass for corporate networks
 os.environ['AIRTABLE_VERIFY_SSL'] = '0'
@@ -30,7 +33,7 @@ if not api_token:
     base = None
 else:
     try:
-        api = Api(api_token)
+        api = Api(api_token, circuit_breaker=True)
         base = api.base(base_id)
         print(f"✅ Connected to Airtable base: {base_id}")
         AIRTABLE_CONNECTED = True
@@ -40,6 +43,13 @@ else:
         api = None
         base = None
 
+# Local SQLite copy of each table, so record listings don't call Airtable every time.
+# AIRTABLE_MIRROR_MAX_AGE is how many seconds old the mirrored data may be.
+AIRTABLE_MIRROR_PATH = os.getenv('AIRTABLE_MIRROR_PATH', 'airtable_mirror.sqlite3')
+AIRTABLE_MIRROR_MAX_AGE = float(os.getenv('AIRTABLE_MIRROR_MAX_AGE', '60'))
+mirror = Mirror(base, AIRTABLE_MIRROR_PATH, max_age=AIRTABLE_MIRROR_MAX_AGE) if base else None
+MIRROR_PAGE_SIZE = 100  # records read from the mirror at a time, like one Airtable page
+
 
 # HTML Template for the home page
 HOME_TEMPLATE = """
@@ -841,9 +851,44 @@ def list_tables():
         return jsonify({"error": str(e)}), 500
 
 
+def _stream_records(table_name: str, pages, max_records: Optional[int], ndjson: bool):
+    """
+    Write each page of records to the response as soon as it arrives, so memory use
+    is bounded by one page and the browser starts receiving data after the first
+    Airtable round trip. The JSON object has the same keys as before, but "count"
+    comes after "records" since it isn't known until the last page has been sent.
+    With ndjson=True, each record is written as its own line of JSON instead.
+    """
+    count = 0
+    if not ndjson:
+        yield '{"table": %s, "records": [' % json.dumps(table_name)
+    try:
+        for page in pages:
+            lines = [json.dumps(record) for record in page]
+            if not lines:
+                continue
+            if ndjson:
+                yield "".join(line + "\n" for line in lines)
+            else:
+                yield ("," if count else "") + ",".join(lines)
+            count += len(lines)
+    except Exception as e:
+        # The status code has already been sent, so report the error in the body
+        print(f"Error streaming records from {table_name}: {e}")
+        yield json.dumps({"error": str(e)}) + "\n" if ndjson else '], "error": %s}' % json.dumps(str(e))
+        return
+    if not ndjson:
+        note = "Fetched all available records" if max_records is None else f"Limited to {max_records} records"
+        yield '], "count": %d, "note": %s}' % (count, json.dumps(note))
+
+
 @app.route('/api/tables/<table_name>/records', methods=['GET'])
 def get_records(table_name: str):
-    """Get all records from a table with support for large datasets."""
+    """
+    Get all records from a table with support for large datasets.
+    
+    Records are streamed page by page; pass ?format=ndjson for one record per line.
+    """
     if not AIRTABLE_CONNECTED:
         return jsonify({"error": "Airtable not configured"}), 503
     
@@ -861,20 +906,32 @@ def get_records(table_name: str):
         # Parse fields if provided
         fields_list = fields.split(',') if fields else None
         
-        # Fetch records (with automatic pagination for large datasets)
-        records = client.get_records(
-            table_name,
-            filters=filters,
-            fields=fields_list,
-            max_records=max_records
-        )
+        if mirror and not filters:
+            # Serve from the local mirror (refreshed if older than AIRTABLE_MIRROR_MAX_AGE),
+            # reading it in pages so that large tables aren't loaded into memory at once
+            pages = mirror.table(table_name).iterate(limit=max_records, page_size=MIRROR_PAGE_SIZE)
+            if fields_list:
+                pages = (
+                    [
+                        {**r, "fields": {k: v for k, v in r["fields"].items() if k in fields_list}}
+                        for r in page
+                    ]
+                    for page in pages
+                )
+        else:
+            # Fetch records one page at a time (with automatic pagination for large datasets).
+            options = {"formula": filters, "fields": fields_list, "max_records": max_records}
+            pages = base.table(table_name).iterate(**{k: v for k, v in options.items() if v})
+
+        # The first page is read now, so that errors such as an unknown table
+        # still produce an error response rather than a truncated stream.
+        pages = itertools.chain([next(pages, [])], pages)
         
-        return jsonify({
-            "table": table_name,
-            "count": len(records),
-            "records": records,
-            "note": "Fetched all available records" if max_records is None else f"Limited to {max_records} records"
-        })
+        ndjson = request.args.get('format') == 'ndjson'
+        return Response(
+            stream_with_context(_stream_records(table_name, pages, max_records, ndjson)),
+            mimetype='application/x-ndjson' if ndjson else 'application/json',
+        )
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -3,13 +3,16 @@
 Clean Airtable Dashboard - Fixed Version
 """
 
+import itertools
+import json
 import os
 import ssl
 import urllib3
 import requests
 import re
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, Response, render_template_string, request, jsonify, stream_with_context
 from pyairtable import Api
+from pyairtable.api.cache import SchemaCache
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from unittest.mock import patch
@@ -52,7 +55,19 @@ try:
     print(f"[*] Token configured: {AIRTABLE_TOKEN is not None}")
     print(f"[*] Token starts with: {AIRTABLE_TOKEN[:10]}...")
     print("[*] SSL verification disabled for corporate proxy...")
-    api = Api(AIRTABLE_TOKEN, timeout=(30, 30))
+    # Share each base's schema across requests instead of fetching it on every POST
+    schema_cache = SchemaCache(
+        ttl=int(os.getenv("AIRTABLE_SCHEMA_TTL", "300")),
+        path=os.getenv("AIRTABLE_SCHEMA_CACHE_DIR"),
+    )
+    # Short timeouts plus a circuit breaker, so a degraded Airtable fails requests
+    # quickly instead of tying up every worker for up to a minute each
+    api = Api(
+        AIRTABLE_TOKEN,
+        timeout=(5, 20),
+        schema_cache=schema_cache,
+        circuit_breaker=True,
+    )
     print("[*] Testing connection to Airtable...")
     base = api.base(AIRTABLE_BASE_ID)
     try:
@@ -182,26 +197,50 @@ def dashboard():
             """, 500
         return f"Error loading dashboard: {error_msg}<br><br><pre>{error_details}</pre>", 500
 
+def stream_records(table_name, pages, ndjson=False):
+    """
+    Write each page of records as soon as Airtable returns it, as one JSON array
+    (or one record per line for NDJSON), so only one page is held in memory at a time.
+    """
+    if not ndjson:
+        yield '['
+    first = True
+    try:
+        for page in pages:
+            for record in page:
+                # Format records for display
+                line = json.dumps({'id': record['id'], 'fields': record.get('fields', {})})
+                if ndjson:
+                    yield line + '\n'
+                else:
+                    yield line if first else ',' + line
+                first = False
+    except Exception as e:
+        # Headers are already sent; end the stream so the client sees an incomplete response
+        print(f"[!] Error streaming records for {table_name}: {e}")
+        if ndjson:
+            yield json.dumps({'error': str(e)}) + '\n'
+        return
+    if not ndjson:
+        yield ']'
+
 @app.route('/api/tables/<table_name>/records')
 def get_table_records(table_name):
-    """Get records for a specific table"""
+    """Get records for a specific table, streamed page by page (?format=ndjson for NDJSON)"""
     try:
         if base is None:
             return jsonify({'error': 'Airtable connection not initialized'}), 500
             
         table = base.table(table_name)
-        records = table.all()
-        
-        # Format records for display
-        formatted_records = []
-        for record in records:
-            formatted_record = {
-                'id': record['id'],
-                'fields': record.get('fields', {})
-            }
-            formatted_records.append(formatted_record)
-        
-        return jsonify(formatted_records)
+        pages = table.iterate()
+        # Fetch the first page before streaming, so errors still get a proper error response
+        pages = itertools.chain([next(pages, [])], pages)
+        
+        ndjson = request.args.get('format') == 'ndjson'
+        return Response(
+            stream_with_context(stream_records(table_name, pages, ndjson)),
+            mimetype='application/x-ndjson' if ndjson else 'application/json'
+        )
     except Exception as e:
         print(f"[!] Error fetching records for {table_name}: {e}")
         return jsonify({'error': str(e)}), 500
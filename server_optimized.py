@@ -14,12 +14,17 @@ Author: Generated for efficiency-focused dashboard reorganization
 
 from flask import Flask, render_template, request, jsonify
 import os
+import requests
 from pyairtable import Api
+from pyairtable.api.cache import CacheRefresher, MemoryCache, SQLiteCache
+from pyairtable.mirror import Mirror
+from pyairtable.search import SearchIndex, search_formula, searchable_fields
 import logging
 from datetime import datetime
 from functools import lru_cache
 import json
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
+import threading
 import time
 
 # Configure enhanced logging
@@ -33,6 +38,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Sort numbers before text and blank cells last, without comparing mixed types."""
+    if value is None or value == '':
+        return (2, '')
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, str(value).lower())
+
+
 class OptimizedAirtableApp:
     """
     Enterprise-grade Flask application for Airtable dashboard management.
@@ -51,11 +66,30 @@ class OptimizedAirtableApp:
                         static_folder='app/static')
         self.api = None
         self.base = None
+        self.mirror = None
+        self.search_indexes = {}  # table name -> (SearchIndex, mirror synced_at)
         self.base_id = "app1t04ZYvX3rWAM1"
-        self.cache = {}
-        self.cache_ttl = {}
         self.default_cache_duration = 300  # 5 minutes
         
+        # Cached responses are shared by every worker on this host through SQLite,
+        # so a write handled by one worker invalidates the cache for all of them.
+        # Set DASHBOARD_CACHE_PATH to an empty string to cache in each process instead.
+        cache_path = os.getenv('DASHBOARD_CACHE_PATH', 'dashboard_cache.sqlite3')
+        cache_size = int(os.getenv('DASHBOARD_CACHE_MAX_ENTRIES', '5000'))
+        if cache_path:
+            self.cache = SQLiteCache(cache_path, max_entries=cache_size, ttl=self.default_cache_duration)
+        else:
+            self.cache = MemoryCache(max_entries=cache_size, ttl=self.default_cache_duration)
+        
+        # Expired responses are served for up to DASHBOARD_CACHE_GRACE seconds while a
+        # single background refresh runs, and the DASHBOARD_HOT_KEYS most requested
+        # responses are refreshed before they expire, so users rarely wait on Airtable.
+        self.refresher = CacheRefresher(
+            self.cache,
+            grace=float(os.getenv('DASHBOARD_CACHE_GRACE', '60')),
+            hot_keys=int(os.getenv('DASHBOARD_HOT_KEYS', '20')),
+        )
+        
         # Performance metrics
         self.metrics = {
             'requests': 0,
@@ -105,9 +139,20 @@ class OptimizedAirtableApp:
                 return False
             
             # Initialize Airtable API
-            self.api = Api(api_token)
+            self.api = Api(api_token, circuit_breaker=True)
             self.base = self.api.base(self.base_id)
             
+            # Serve record listings from a local SQLite copy of each table,
+            # refreshed once it is older than AIRTABLE_MIRROR_MAX_AGE seconds.
+            # Set AIRTABLE_MIRROR_PATH to an empty string to page through Airtable instead.
+            mirror_path = os.getenv('AIRTABLE_MIRROR_PATH', 'airtable_mirror.sqlite3')
+            if mirror_path:
+                self.mirror = Mirror(
+                    self.base,
+                    mirror_path,
+                    max_age=float(os.getenv('AIRTABLE_MIRROR_MAX_AGE', '60')),
+                )
+            
             logger.info(f"Successfully connected to Airtable base: {self.base_id}")
             return True
             
@@ -136,7 +181,10 @@ class OptimizedAirtableApp:
                 'timestamp': datetime.utcnow().isoformat(),
                 'airtable_connected': self.api is not None,
                 'metrics': self.metrics,
-                'cache_size': len(self.cache)
+                'cache_size': len(self.cache),
+                'cache': self.cache.stats.to_dict(),
+                'refresher': self.refresher.stats.to_dict(),
+                'retries': self.api.retry_stats.to_dict() if self.api and self.api.retry_stats else None
             })
         
         @self.app.route('/api/tables')
@@ -146,15 +194,9 @@ class OptimizedAirtableApp:
             
             try:
                 # Check cache first
-                cache_key = 'tables'
-                if self._is_cached(cache_key):
-                    self.metrics['cache_hits'] += 1
-                    tables = self.cache[cache_key]
-                else:
-                    self.metrics['cache_misses'] += 1
-                    # Fetch from Airtable
-                    tables = self._fetch_tables()
-                    self._set_cache(cache_key, tables)
+                tables, cached = self._get_or_load(
+                    'tables', self._fetch_tables, tags=lambda tables: ['tables']
+                )
                 
                 # Performance tracking
                 response_time = time.time() - start_time
@@ -164,7 +206,7 @@ class OptimizedAirtableApp:
                     'success': True,
                     'tables': tables,
                     'total': len(tables),
-                    'cached': cache_key in self.cache,
+                    'cached': cached,
                     'response_time': round(response_time, 3)
                 })
                 
@@ -189,20 +231,20 @@ class OptimizedAirtableApp:
                 search = request.args.get('search', '').strip()
                 sort_field = request.args.get('sort_field')
                 sort_direction = request.args.get('sort_direction', 'asc')
+                cursor = request.args.get('cursor')
                 
                 # Build cache key
                 cache_key = f"records_{table_name}_{page}_{limit}_{search}_{sort_field}_{sort_direction}"
                 
-                if self._is_cached(cache_key):
-                    self.metrics['cache_hits'] += 1
-                    result = self.cache[cache_key]
-                else:
-                    self.metrics['cache_misses'] += 1
-                    result = self._fetch_records(
-                        table_name, page, limit, search, sort_field, sort_direction
-                    )
-                    # Shorter cache for records (2 minutes)
-                    self._set_cache(cache_key, result, ttl=120)
+                # Shorter cache for records (2 minutes)
+                result, cached = self._get_or_load(
+                    cache_key,
+                    lambda: self._fetch_records(
+                        table_name, page, limit, search, sort_field, sort_direction, cursor
+                    ),
+                    ttl=120,
+                    tags=lambda result: self._records_cache_tags(table_name, result, search, sort_field),
+                )
                 
                 response_time = time.time() - start_time
                 self._update_metrics(response_time)
@@ -210,7 +252,7 @@ class OptimizedAirtableApp:
                 return jsonify({
                     'success': True,
                     'data': result,
-                    'cached': cache_key in self.cache,
+                    'cached': cached,
                     'response_time': round(response_time, 3)
                 })
                 
@@ -243,8 +285,12 @@ class OptimizedAirtableApp:
                 table = self.base.table(table_name)
                 new_record = table.create(validated_fields)
                 
-                # Clear related cache
-                self._clear_cache_pattern(f"records_{table_name}")
+                # A new record can appear on any page of this table
+                self._invalidate_cache(f"table:{table_name}")
+                if self.mirror:
+                    self.mirror.table(table_name).store([new_record])
+                    if table_name in self.search_indexes:
+                        self.search_indexes[table_name][0].add(new_record)
                 
                 response_time = time.time() - start_time
                 self._update_metrics(response_time)
@@ -286,8 +332,13 @@ class OptimizedAirtableApp:
                 table = self.base.table(table_name)
                 updated_record = table.update(record_id, validated_fields)
                 
-                # Clear related cache
-                self._clear_cache_pattern(f"records_{table_name}")
+                # Only pages which contain this record, or whose contents depend
+                # on field values (searched or sorted), can have changed
+                self._invalidate_cache(f"record:{record_id}", f"query:{table_name}")
+                if self.mirror:
+                    self.mirror.table(table_name).store([updated_record])
+                    if table_name in self.search_indexes:
+                        self.search_indexes[table_name][0].add(updated_record)
                 
                 response_time = time.time() - start_time
                 self._update_metrics(response_time)
@@ -319,8 +370,12 @@ class OptimizedAirtableApp:
                 table = self.base.table(table_name)
                 table.delete(record_id)
                 
-                # Clear related cache
-                self._clear_cache_pattern(f"records_{table_name}")
+                # Every later page of this table shifts by one record
+                self._invalidate_cache(f"table:{table_name}")
+                if self.mirror:
+                    self.mirror.table(table_name).discard([record_id])
+                    if table_name in self.search_indexes:
+                        self.search_indexes[table_name][0].remove(record_id)
                 
                 response_time = time.time() - start_time
                 self._update_metrics(response_time)
@@ -348,9 +403,7 @@ class OptimizedAirtableApp:
             if not self.app.config['DEBUG']:
                 return jsonify({'error': 'Not available in production'}), 403
             
-            cache_size = len(self.cache)
-            self.cache.clear()
-            self.cache_ttl.clear()
+            cache_size = self.cache.clear()
             
             return jsonify({
                 'success': True,
@@ -385,30 +438,52 @@ class OptimizedAirtableApp:
     
     # Helper methods for caching and optimization
     
-    def _is_cached(self, key: str) -> bool:
-        """Check if data is cached and not expired."""
-        if key not in self.cache:
-            return False
-        
-        if key in self.cache_ttl:
-            return time.time() < self.cache_ttl[key]
-        
-        return True
+    def _get_cache(self, key: str) -> Optional[Any]:
+        """Return cached data, or None if it is not cached or has expired."""
+        return self.cache.get(key)
     
-    def _set_cache(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Set cache with optional TTL."""
-        self.cache[key] = value
-        if ttl:
-            self.cache_ttl[key] = time.time() + ttl
-        else:
-            self.cache_ttl[key] = time.time() + self.default_cache_duration
+    def _get_or_load(self, key: str, load: Callable[[], Any], ttl: Optional[int] = None,
+                     tags: Optional[Callable[[Any], Iterable[str]]] = None) -> Tuple[Any, bool]:
+        """
+        Return cached data (even if recently expired, while it is refreshed in the
+        background), or else load it; along with whether it came from the cache.
+        """
+        caller = threading.get_ident()
+        loaded = []
+        
+        def tracked_load():
+            # The refresher reuses this function for background refreshes
+            if threading.get_ident() == caller:
+                loaded.append(True)
+            return load()
+        
+        data = self.refresher.get(key, tracked_load, ttl=ttl or self.default_cache_duration, tags=tags)
+        cached = not loaded
+        self.metrics['cache_hits' if cached else 'cache_misses'] += 1
+        return data, cached
     
-    def _clear_cache_pattern(self, pattern: str) -> None:
-        """Clear cache entries matching pattern."""
-        keys_to_remove = [key for key in self.cache.keys() if pattern in key]
-        for key in keys_to_remove:
-            self.cache.pop(key, None)
-            self.cache_ttl.pop(key, None)
+    def _set_cache(self, key: str, value: Any, ttl: Optional[int] = None,
+                   tags: Iterable[str] = ()) -> None:
+        """Set cache with optional TTL and tags used to invalidate it."""
+        self.cache.set(key, value, ttl=ttl or self.default_cache_duration, tags=tags)
+    
+    def _invalidate_cache(self, *tags: str) -> None:
+        """Clear cache entries with any of these tags (in every worker sharing the cache)."""
+        self.cache.invalidate(*tags)
+    
+    def _records_cache_tags(self, table_name: str, result: Dict[str, Any],
+                            search: str, sort_field: Optional[str]) -> List[str]:
+        """
+        Tag a cached page of records with its table, plus either the records on it
+        or (if searched or sorted, so any change to a field value could affect it)
+        the table's query tag.
+        """
+        tags = [f"table:{table_name}"]
+        if search or sort_field:
+            tags.append(f"query:{table_name}")
+        else:
+            tags.extend(f"record:{record['id']}" for record in result['records'])
+        return tags
     
     def _fetch_tables(self) -> List[Dict[str, Any]]:
         """Fetch tables from Airtable with metadata."""
@@ -459,51 +534,133 @@ class OptimizedAirtableApp:
     
     def _fetch_records(self, table_name: str, page: int, limit: int, 
                       search: str, sort_field: Optional[str], 
-                      sort_direction: str) -> Dict[str, Any]:
+                      sort_direction: str, cursor: Optional[str] = None) -> Dict[str, Any]:
         """Fetch records with advanced filtering and pagination."""
         if not self.base:
             raise Exception("Airtable connection not available")
         
-        table = self.base.table(table_name)
-        
-        # Build query parameters
-        kwargs = {
-            'max_records': limit,
-            'page_size': limit
-        }
-        
-        # Add sorting
+        sort = []
         if sort_field:
             direction = '-' if sort_direction == 'desc' else ''
-            kwargs['sort'] = [f"{direction}{sort_field}"]
-        
-        # For search, we'd need to implement Airtable's formula syntax
-        # This is a simplified version
-        if search:
-            # Note: Airtable search requires formula syntax
-            # This would need to be enhanced based on actual field types
-            pass
-        
-        # Fetch records
-        all_records = table.all(**kwargs)
-        
-        # Calculate pagination
-        offset = (page - 1) * limit
-        paginated_records = all_records[offset:offset + limit]
+            sort = [f"{direction}{sort_field}"]
+        
+        if self.mirror and search:
+            # Search runs against an in-memory index of the mirrored table
+            matches = self._search_index(table_name).search(search)
+            if sort_field:
+                matches.sort(
+                    key=lambda record: _sort_key(record['fields'].get(sort_field)),
+                    reverse=(sort_direction == 'desc'),
+                )
+            offset = (page - 1) * limit
+            paginated_records = matches[offset:offset + limit]
+            total = len(matches)
+            next_cursor = None
+            has_next = offset + limit < total
+        elif self.mirror:
+            # Sorting and pagination run against the local mirror
+            table = self.mirror.table(table_name)
+            offset = (page - 1) * limit
+            paginated_records = table.query(sort=sort, limit=limit, offset=offset)
+            total = table.count()
+            next_cursor = None
+            has_next = offset + limit < total
+        else:
+            # Airtable does the filtering, using SEARCH() over every text field
+            formula = None
+            if search:
+                fields = searchable_fields(self.base.table(table_name).schema())
+                formula = search_formula(search, fields) if fields else None
+            paginated_records, next_cursor = self._fetch_page(
+                table_name, page, limit, sort, search, cursor, formula
+            )
+            total = self.base.table(table_name).count(
+                formula, ttl=self.default_cache_duration
+            )
+            has_next = next_cursor is not None
         
         return {
             'records': paginated_records,
             'pagination': {
                 'page': page,
                 'limit': limit,
-                'total': len(all_records),
-                'pages': (len(all_records) + limit - 1) // limit,
-                'has_next': offset + limit < len(all_records),
-                'has_prev': page > 1
+                'total': total,
+                'pages': (total + limit - 1) // limit,
+                'has_next': has_next,
+                'has_prev': page > 1,
+                'next_cursor': next_cursor
             },
             'table_name': table_name
         }
     
+    def _fetch_page(self, table_name: str, page: int, limit: int, sort: List[str],
+                    search: str, cursor: Optional[str] = None,
+                    formula: Optional[Any] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Fetch one page of records directly from Airtable.
+        
+        Airtable pages are addressed by opaque offset tokens rather than numbers, so the
+        token for each page we have seen is cached per query. Requesting page N+1 (or
+        passing the ``next_cursor`` from page N) then costs exactly one request; only a
+        jump to a page we have never reached needs to walk forward from the nearest one.
+        """
+        table = self.base.table(table_name)
+        options = {'page_size': limit, 'sort': sort}
+        if formula is not None:
+            options['formula'] = formula
+        # Invalidated along with the cached pages when records are added or deleted,
+        # or (for searched or sorted queries) when any record is updated
+        cursors_tags = [f"table:{table_name}"] + ([f"query:{table_name}"] if search or sort else [])
+        cursors_key = f"records_{table_name}_cursors_{limit}_{search}_{sort}"
+        # Page numbers become strings when the cache stores the cursors as JSON
+        cached_cursors = self._get_cache(cursors_key)
+        cursors = {int(n): c for n, c in cached_cursors.items()} if cached_cursors else {1: None}
+        if cursor:
+            cursors[page] = cursor
+        
+        try:
+            current = max(n for n in cursors if n <= page)
+            result = table.page(cursors[current], **options)
+            while current < page and 'offset' in result:
+                current += 1
+                cursors[current] = result['offset']
+                result = table.page(result['offset'], **options)
+        except requests.HTTPError as e:
+            # Airtable only honors offsets for a few minutes; start again from page 1
+            if 'LIST_RECORDS_ITERATOR_NOT_AVAILABLE' not in str(e) or cursors == {1: None}:
+                raise
+            self.cache.delete(cursors_key)
+            return self._fetch_page(table_name, page, limit, sort, search, formula=formula)
+        
+        if current < page:
+            # The requested page is past the end of the table
+            return [], None
+        
+        next_cursor = result.get('offset')
+        if next_cursor:
+            cursors[page + 1] = next_cursor
+        self._set_cache(cursors_key, cursors, ttl=240, tags=cursors_tags)
+        return result['records'], next_cursor
+    
+    def _search_index(self, table_name: str) -> SearchIndex:
+        """
+        Return an up-to-date search index for a mirrored table.
+        
+        The index is built once from the mirror, then updated with only the records
+        that changed on each refresh. If another worker refreshed the mirror since
+        we last looked, we can't know what changed, so the index is rebuilt.
+        """
+        mirrored = self.mirror.table(table_name)
+        index, indexed_at = self.search_indexes.get(table_name, (None, None))
+        before = mirrored.synced_at
+        result = mirrored.refresh(max_age=self.mirror.max_age)
+        if index is None or before != indexed_at:
+            index = SearchIndex(mirrored.query())
+        else:
+            index.apply(result, mirrored)
+        self.search_indexes[table_name] = (index, mirrored.synced_at)
+        return index
+    
     def _validate_fields(self, fields: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and sanitize field data."""
         validated = {}
@@ -1,11 +1,16 @@
 import importlib
 import json
 import re
-from collections import OrderedDict
+import threading
+import time
+from collections import OrderedDict, deque
+from http import HTTPStatus
 from pathlib import Path
 from posixpath import join as urljoin
 from typing import Any, Callable
 from urllib.parse import quote, urlencode
+from urllib.parse import urljoin as urljoin_absolute
+from wsgiref.simple_server import WSGIRequestHandler, make_server
 
 import pytest
 from mock import Mock
@@ -226,3 +231,149 @@ def mock_workspace_metadata(workspace, sample_json, requests_mock):
 @pytest.fixture
 def enterprise(api):
     return Enterprise(api, "entUBq2RGdihxl3vU")
+
+
+# Adapted from https://github.com/kevin1024/pytest-httpbin
+class Server:
+    """
+    HTTP server running a WSGI application in its own thread.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, application=None, **kwargs):
+        self.app = application
+        self._server = make_server(host, port, self.app, **kwargs)
+        self.host = self._server.server_address[0]
+        self.port = self._server.server_address[1]
+        self.protocol = "http"
+
+        self._thread = threading.Thread(
+            name=self.__class__,
+            target=self._server.serve_forever,
+        )
+
+    def set_app(self, app):
+        self.app = app
+        self._server.set_app(app)
+
+    def __del__(self):
+        if hasattr(self, "_server"):
+            self.stop()
+
+    def start(self):
+        self._thread.start()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.stop()
+        suppress_exc = self._server.__exit__(*args, **kwargs)
+        self._thread.join()
+        return suppress_exc
+
+    def __add__(self, other):
+        return self.url + other
+
+    def stop(self):
+        self._server.shutdown()
+
+    @property
+    def url(self):
+        return f"{self.protocol}://{self.host}:{self.port}"
+
+    def join(self, url, allow_fragments=True):
+        return urljoin_absolute(self.url, url, allow_fragments=allow_fragments)
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    """
+    Silences all log messages from the WSGI server.
+    """
+
+    def log_message(self, *args, **kwargs):
+        return
+
+
+class MockApi:
+    """
+    WSGI app that returns responses from a stack.
+    """
+
+    QPS = 5
+
+    def __init__(self, responses=None, enforce_limit=True, qps=QPS):
+        """
+        :param responses: If provided, should be a list of responses
+            for the server to respond with, in first in first out order.
+            Format should be ``list[tuple[status, serializable]]``,
+            where ``status`` is either an ``int`` or ``str``,
+            and ``serializable`` can be encoded by ``json.dumps``.
+
+        :param enforce_limit: If ``True``, the MockApi will return
+            a 429 whenever if there has been more than five requests
+            within the past second. This is an attempt to simulate
+            `Airtable's API limits <https://airtable.com/developers/web/api/rate-limits>`_.
+
+        :param qps: The number of requests per second to allow if ``enforce_limit=True``.
+        """
+        self.canned_responses = responses or []
+        self.enforce_limit = enforce_limit
+        self.qps = qps
+        self.timestamps = deque(maxlen=qps)  # default limit is 5 requests/sec
+        self.throttled = 0  # number of 429s returned due to enforce_limit
+        self.lock = threading.Lock()
+        self.requests = []  # (method, path, query string, body) for each request
+
+    def __call__(self, environ, start_response):
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = environ["wsgi.input"].read(length) if length else b""
+        self.requests.append(
+            (
+                environ["REQUEST_METHOD"],
+                environ["PATH_INFO"],
+                environ.get("QUERY_STRING", ""),
+                json.loads(body) if body else None,
+            )
+        )
+        status, response = self.next_response()
+        start_response(status, [("Content-Type", "application/json")])
+        return [response]
+
+    def next_response(self):
+        with self.lock:
+            if (
+                self.enforce_limit
+                and len(self.timestamps) == self.qps
+                and (time.time() - self.timestamps[0] < 1)
+            ):
+                self.throttled += 1
+                return ("429 Too Many Requests", b"")
+            if not self.canned_responses:
+                raise RuntimeError("MockApi.responses is empty")
+            self.timestamps.append(time.time())
+            status, jsondata = self.canned_responses.pop(0)
+        if isinstance(status, int):
+            status = f"{status} {HTTPStatus(status).phrase}"
+        response = b"" if jsondata is None else json.dumps(jsondata).encode("utf8")
+        return (status, response)
+
+
+@pytest.fixture(scope="session")
+def mock_endpoint_server():
+    """
+    Fixture that starts a simple WSGI server running in a separate thread.
+    Only created once per session; expects us to call `set_app()` on each test.
+    """
+    with Server(handler_class=QuietWSGIRequestHandler) as server:
+        yield server
+
+
+@pytest.fixture
+def mock_endpoint(mock_endpoint_server):
+    """
+    Fixture that creates a MockApi and attaches it to the running server.
+    """
+    app = MockApi()
+    mock_endpoint_server.set_app(app)
+    return app
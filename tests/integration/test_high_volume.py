@@ -2,6 +2,10 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import pytest
 
+from pyairtable import Api
+from pyairtable.api.concurrency import AdaptiveConcurrency
+from pyairtable.api.ratelimit import RateLimiter
+
 pytestmark = [pytest.mark.integration]
 
 
@@ -41,3 +45,43 @@ def test_high_volume_operations(table, thread_count, records_per_thread):
             for thread_number in range(thread_count)
         ]
         all(future.result() for future in as_completed(futures))
+
+
+def test_high_volume_operations__rate_limited(api_key, base_id, table_name):
+    """
+    Test that a rate-limited Api shared by many threads never receives a 429,
+    even when retries are disabled.
+    """
+    api = Api(api_key, retry_strategy=None, rate_limit=RateLimiter())
+    table = api.table(base_id, table_name)
+
+    def bulk_create(thread_number, record_count):
+        created = table.batch_create(
+            [
+                {"Name": f"thread={thread_number} record={n}"}
+                for n in range(record_count)
+            ]
+        )
+        table.batch_delete([record["id"] for record in created])
+
+    with ThreadPoolExecutor(max_workers=25) as executor:
+        futures = [
+            executor.submit(bulk_create, thread_number, 20)
+            for thread_number in range(25)
+        ]
+        all(future.result() for future in as_completed(futures))
+
+    assert api.rate_limiter.stats.requests == 25 * 4
+
+
+def test_high_volume_operations__adaptive(api_key, base_id, table_name):
+    """
+    Test that an adaptive concurrency limit can replace a fixed thread count:
+    batches are sent concurrently and the limit settles without manual tuning.
+    """
+    api = Api(api_key, concurrency=AdaptiveConcurrency())
+    table = api.table(base_id, table_name)
+    created = table.batch_create([{"Name": f"record={n}"} for n in range(500)])
+    table.batch_delete([record["id"] for record in created])
+    assert api.concurrency.stats.requests == 100
+    assert api.concurrency.minimum <= api.concurrency.limit <= api.concurrency.maximum
@@ -0,0 +1,385 @@
+"""
+Tests for pyairtable.api.aio, which run against the real HTTP server in conftest.py.
+"""
+
+import asyncio
+from urllib.parse import parse_qs
+
+import pytest
+import requests
+from urllib3.util.retry import Retry
+
+from pyairtable.api.cache import SchemaCache
+from pyairtable.api.ratelimit import RateLimiter
+from pyairtable.api.retrying import retry_strategy
+from pyairtable.formulas import EQ, Field
+from pyairtable.testing import fake_id, fake_record
+
+httpx = pytest.importorskip("httpx")
+aio = pytest.importorskip("pyairtable.api.aio")
+
+
+@pytest.fixture
+def async_api(constants, mock_endpoint_server):
+    def _async_api(**kwargs):
+        kwargs.setdefault("endpoint_url", mock_endpoint_server.url)
+        return aio.AsyncApi(constants["API_KEY"], **kwargs)
+
+    return _async_api
+
+
+@pytest.fixture
+def async_table(async_api, constants):
+    return async_api(retry_strategy=None).table(
+        constants["BASE_ID"], constants["TABLE_NAME"]
+    )
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_repr(async_table, constants):
+    assert repr(async_table.api) == "<pyairtable.AsyncApi>"
+    assert repr(async_table.base) == f"<AsyncBase id={constants['BASE_ID']!r}>"
+    assert constants["TABLE_NAME"] in repr(async_table)
+
+
+def test_urls(async_table):
+    """
+    Test that AsyncTable uses the same URL builders as Table.
+    """
+    assert async_table.urls.records == async_table.sync.urls.records
+    assert async_table.urls.records == async_table.api.build_url(
+        async_table.base.id, "Table%20Name"
+    )
+
+
+def test_get(async_table, mock_endpoint):
+    record = fake_record()
+    mock_endpoint.canned_responses = [(200, record)]
+
+    async def _test():
+        async with async_table.api:
+            return await async_table.get(record["id"], cell_format="string")
+
+    assert run(_test()) == record
+    method, path, query, _ = mock_endpoint.requests[0]
+    assert method == "GET"
+    assert path.endswith("/" + record["id"])
+    assert parse_qs(query) == {"cellFormat": ["string"]}
+
+
+def test_iterate(async_table, mock_endpoint):
+    pages = [[fake_record(), fake_record()], [fake_record()]]
+    mock_endpoint.canned_responses = [
+        (200, {"records": pages[0], "offset": "ofs001"}),
+        (200, {"records": pages[1]}),
+    ]
+
+    async def _test():
+        async with async_table.api:
+            return [page async for page in async_table.iterate(page_size=2)]
+
+    assert run(_test()) == pages
+    queries = [parse_qs(query) for (_, _, query, _) in mock_endpoint.requests]
+    assert queries == [
+        {"pageSize": ["2"]},
+        {"pageSize": ["2"], "offset": ["ofs001"]},
+    ]
+
+
+def test_all__post_fallback(async_table, mock_endpoint):
+    """
+    Test that long formulas are moved into a POST body, as with Table.all().
+    """
+    records = [fake_record()]
+    mock_endpoint.canned_responses = [(200, {"records": records})]
+    formula = "X" * async_table.api.sync.MAX_URL_LENGTH
+
+    async def _test():
+        async with async_table.api:
+            return await async_table.all(formula=formula)
+
+    assert run(_test()) == records
+    method, path, _, body = mock_endpoint.requests[0]
+    assert (method, path.rsplit("/", 1)[-1]) == ("POST", "listRecords")
+    assert body == {"filterByFormula": formula}
+
+
+def test_schema(async_table, mock_endpoint, sample_json):
+    mock_endpoint.canned_responses = [(200, sample_json("BaseSchema"))]
+
+    async def _test():
+        async with async_table.api:
+            await async_table.base.schema()
+            return await async_table.base.schema()
+
+    schema = run(_test())
+    assert schema.table("tbltp8DGLhqbUmjK1").name == "Apartments"
+    assert len(mock_endpoint.requests) == 1
+
+
+def test_batch_create(async_table, mock_endpoint):
+    records = [fake_record({"n": n}) for n in range(15)]
+    mock_endpoint.canned_responses = [
+        (200, {"records": records[:10]}),
+        (200, {"records": records[10:]}),
+    ]
+
+    async def _test():
+        async with async_table.api:
+            return await async_table.batch_create(
+                (r["fields"] for r in records), typecast=True
+            )
+
+    assert run(_test()) == records
+    bodies = [body for (_, _, _, body) in mock_endpoint.requests]
+    assert [len(body["records"]) for body in bodies] == [10, 5]
+    assert bodies[0]["typecast"] is True
+
+
+@pytest.mark.parametrize("replace,http_method", [(False, "PATCH"), (True, "PUT")])
+def test_batch_update(async_table, mock_endpoint, replace, http_method):
+    records = [fake_record({"n": n}) for n in range(3)]
+    mock_endpoint.canned_responses = [(200, {"records": records})]
+
+    async def _test():
+        async with async_table.api:
+            return await async_table.batch_update(records, replace=replace)
+
+    assert run(_test()) == records
+    assert mock_endpoint.requests[0][0] == http_method
+
+
+def test_batch_upsert(async_table, mock_endpoint):
+    records = [fake_record({"Name": n}) for n in range(3)]
+    mock_endpoint.canned_responses = [
+        (
+            200,
+            {
+                "createdRecords": [records[0]["id"]],
+                "updatedRecords": [r["id"] for r in records[1:]],
+                "records": records,
+            },
+        )
+    ]
+
+    async def _test():
+        async with async_table.api:
+            return await async_table.batch_upsert(
+                [{"fields": r["fields"]} for r in records],
+                key_fields=["Name"],
+            )
+
+    result = run(_test())
+    assert result["records"] == records
+    assert result["createdRecords"] == [records[0]["id"]]
+    body = mock_endpoint.requests[0][3]
+    assert body["performUpsert"] == {"fieldsToMergeOn": ["Name"]}
+
+
+def test_batch_upsert__missing_key_fields(async_table, mock_endpoint):
+    with pytest.raises(ValueError):
+        run(async_table.batch_upsert([{"fields": {"Other": 1}}], key_fields=["Name"]))
+    assert mock_endpoint.requests == []
+
+
+def test_batch_delete(async_table, mock_endpoint):
+    record_ids = [fake_id() for _ in range(12)]
+    mock_endpoint.canned_responses = [
+        (200, {"records": [{"id": r, "deleted": True} for r in record_ids[:10]]}),
+        (200, {"records": [{"id": r, "deleted": True} for r in record_ids[10:]]}),
+    ]
+
+    async def _test():
+        async with async_table.api:
+            return await async_table.batch_delete(iter(record_ids))
+
+    assert [r["id"] for r in run(_test())] == record_ids
+    queries = [parse_qs(query) for (_, _, query, _) in mock_endpoint.requests]
+    assert queries[1] == {"records[]": record_ids[10:]}
+
+
+def test_http_error(async_table, mock_endpoint):
+    """
+    Test that errors can be handled the same way as errors from Api.
+    """
+    mock_endpoint.canned_responses = [(404, {"error": "NOT_FOUND"})]
+    with pytest.raises(requests.exceptions.HTTPError) as excinfo:
+        run(async_table.get(fake_id()))
+    assert isinstance(excinfo.value, aio.HTTPError)
+    assert isinstance(excinfo.value.__cause__, httpx.HTTPStatusError)
+    assert "NOT_FOUND" in str(excinfo.value.args)
+    assert excinfo.value.response.status_code == 404
+    assert excinfo.value.request.method == "GET"
+
+
+def test_http_error__not_json(async_table, mock_endpoint):
+    mock_endpoint.canned_responses = [(500, None)]
+    with pytest.raises(aio.HTTPError) as excinfo:
+        run(async_table.get(fake_id()))
+    assert excinfo.value.response.status_code == 500
+
+
+def test_request__empty_response(async_table, mock_endpoint):
+    mock_endpoint.canned_responses = [(200, None)]
+    assert run(async_table.api.request("DELETE", async_table.urls.records)) is None
+
+
+def test_iterate_requests__not_dict(async_table, mock_endpoint):
+    """
+    Test that iterate_requests() stops if the response is not a JSON object.
+    """
+    mock_endpoint.canned_responses = [(200, [1, 2, 3])]
+
+    async def _test():
+        async with async_table.api:
+            url = async_table.urls.records
+            return [page async for page in async_table.api.iterate_requests("GET", url)]
+
+    assert run(_test()) == [[1, 2, 3]]
+
+
+def test_use_field_ids(async_api, constants, mock_endpoint):
+    record = fake_record()
+    mock_endpoint.canned_responses = [(200, record), (200, {"records": [record]})]
+    api = async_api(retry_strategy=None, use_field_ids=True)
+    table = api.table(constants["BASE_ID"], constants["TABLE_NAME"])
+
+    async def _test():
+        async with api:
+            await table.get(record["id"])
+            return await table.all(formula=EQ(Field("Name"), "Alice"))
+
+    assert run(_test()) == [record]
+    queries = [parse_qs(query) for (_, _, query, _) in mock_endpoint.requests]
+    assert queries[0] == {"returnFieldsByFieldId": ["1"]}
+    assert queries[1] == {
+        "returnFieldsByFieldId": ["1"],
+        "filterByFormula": ["{Name}='Alice'"],
+    }
+
+
+def test_schema__schema_cache(async_api, constants, mock_endpoint, sample_json):
+    """
+    Test that AsyncBase.schema() shares the SchemaCache of the sync Api.
+    """
+    mock_endpoint.canned_responses = [(200, sample_json("BaseSchema"))]
+    schema_cache = SchemaCache()
+    apis = [async_api(retry_strategy=None) for _ in range(2)]
+    for api in apis:
+        api.sync.schema_cache = schema_cache
+
+    async def _test(api):
+        async with api:
+            return await api.base(constants["BASE_ID"]).schema()
+
+    schemas = [run(_test(api)) for api in apis]
+    assert [schema.table("tbltp8DGLhqbUmjK1").name for schema in schemas] == [
+        "Apartments",
+        "Apartments",
+    ]
+    assert len(mock_endpoint.requests) == 1
+
+
+def test_retry(async_api, constants, mock_endpoint):
+    record = fake_record()
+    mock_endpoint.canned_responses = [(429, None), (429, None), (200, record)]
+    api = async_api(retry_strategy=retry_strategy(total=2, backoff_factor=0))
+    table = api.table(constants["BASE_ID"], constants["TABLE_NAME"])
+    assert run(table.get(record["id"])) == record
+    assert len(mock_endpoint.requests) == 3
+
+
+def test_retry__exceeded(async_api, constants, mock_endpoint):
+    mock_endpoint.canned_responses = [(429, None)] * 3
+    api = async_api(retry_strategy=retry_strategy(total=2, backoff_factor=0))
+    table = api.table(constants["BASE_ID"], constants["TABLE_NAME"])
+    with pytest.raises(requests.exceptions.RetryError):
+        run(table.get(fake_id()))
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """
+    Record how long AsyncApi waits before each retry, without waiting.
+    """
+    waits = []
+
+    async def _sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(aio.asyncio, "sleep", _sleep)
+    return waits
+
+
+def test_retry__backoff(async_api, constants, mock_endpoint, sleeps):
+    """
+    Test that AdaptiveRetry waits longer before each retry, and records
+    how long it waited in the retry budget.
+    """
+    record = fake_record()
+    mock_endpoint.canned_responses = [(429, None), (503, None), (200, record)]
+    retry = retry_strategy(status_forcelist=(429, 503), backoff_factor=1)
+    api = async_api(retry_strategy=retry)
+    table = api.table(constants["BASE_ID"], constants["TABLE_NAME"])
+    assert run(table.get(record["id"])) == record
+    assert len(sleeps) == 2
+    assert 1 <= sleeps[0] <= 3
+    assert sleeps[0] <= sleeps[1] <= sleeps[0] * 3
+    stats = api.retry_strategy.budget.stats
+    assert (stats.requests, stats.retries) == (1, 2)
+    assert stats.by_status["429"].backoff == sleeps[0]
+    assert stats.by_status["503"].backoff == sleeps[1]
+
+
+def test_retry__rate_limit_penalty(async_api, constants, mock_endpoint, sleeps):
+    record = fake_record()
+    mock_endpoint.canned_responses = [(429, None), (200, record)]
+    retry = retry_strategy(backoff_factor=0, rate_limit_penalty=30)
+    api = async_api(retry_strategy=retry)
+    table = api.table(constants["BASE_ID"], constants["TABLE_NAME"])
+    assert run(table.get(record["id"])) == record
+    assert sleeps == [30]
+
+
+def test_retry__urllib3_retry(async_api, constants, mock_endpoint, sleeps):
+    """
+    Test that AsyncApi also accepts a plain urllib3 Retry.
+    """
+    record = fake_record()
+    mock_endpoint.canned_responses = [(429, None), (429, None), (200, record)]
+    retry = Retry(total=2, status_forcelist=(429,), backoff_factor=1)
+    api = async_api(retry_strategy=retry)
+    table = api.table(constants["BASE_ID"], constants["TABLE_NAME"])
+    assert run(table.get(record["id"])) == record
+    assert sleeps == [0, 2]  # urllib3 does not wait before the first retry
+
+
+def test_concurrent_requests_share_rate_limit(async_api, constants, mock_endpoint):
+    """
+    Test that many coroutines in flight at once stay within the rate limit,
+    without any retries to recover from a 429.
+    """
+    mock_endpoint.canned_responses = [(200, fake_record()) for _ in range(10)]
+    api = async_api(retry_strategy=None, rate_limit=RateLimiter(base_qps=4.5))
+    table = api.table(constants["BASE_ID"], constants["TABLE_NAME"])
+
+    async def _test():
+        async with api:
+            return await asyncio.gather(*(table.get(fake_id()) for _ in range(10)))
+
+    assert len(run(_test())) == 10
+    assert mock_endpoint.throttled == 0
+    assert api.rate_limiter.stats.tokens_waited == 9
+
+
+def test_api_key(async_api):
+    api = async_api()
+    api.api_key = "changed"
+    assert api.client.headers["Authorization"] == "Bearer changed"
+    api.api_key = "changed again"
+    assert api.client.headers["Authorization"] == "Bearer changed again"
+    assert api.sync.api_key == "changed again"
+    run(api.aclose())
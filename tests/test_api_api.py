@@ -1,6 +1,10 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 import pytest
+import requests
 
 from pyairtable import Api, Base, Table
 
@@ -53,6 +57,40 @@ def test_update_api_key(api):
     assert "123" in api.session.headers["Authorization"]
 
 
+def test_thread_sessions(api, requests_mock):
+    """
+    Test that each thread sends requests through its own session, which has its
+    own cookies but shares connection pools and settings with Api.session.
+    """
+    m = requests_mock.get(api.urls.whoami, json={"id": "usrFakeTestingUser"})
+    session = api._session()
+    assert session is api._session()
+    assert session is not api.session
+    assert session.adapters is api.session.adapters
+    session.cookies.set("AWSALB", "abc")
+
+    with ThreadPoolExecutor(1) as executor:
+        other = executor.submit(api._session).result()
+    assert other is not session
+    assert not other.cookies
+
+    # settings changed on Api.session apply to every thread
+    api.api_key = "123"
+    api.session.verify = False
+    api.whoami()
+    assert m.last_request.headers["Authorization"] == "Bearer 123"
+    assert session.verify is False
+
+    # replacing Api.session replaces each thread's session
+    api.session = requests.Session()
+    assert api._session() is not session
+
+
+def test_thread_sessions__disabled():
+    api = Api("key", thread_sessions=False)
+    assert api._session() is api.session
+
+
 def test_whoami(api, requests_mock):
     """
     Test the /whoami endpoint gets passed straight through.
@@ -161,6 +199,164 @@ def test_iterate_requests__invalid_type(api: Api, requests_mock):
     assert responses == [response["json"] for response in response_list]
 
 
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_iterate_requests__prefetch(api: Api, requests_mock, prefetch):
+    url = "https://example.com"
+    response_list = [{"json": {"page": n, "offset": n + 1}} for n in range(5)]
+    response_list[-1]["json"]["offset"] = None
+    requests_mock.get(url, response_list=response_list)
+    responses = list(api.iterate_requests("GET", url, prefetch=prefetch))
+    assert responses == [response["json"] for response in response_list]
+
+
+def test_iterate_requests__prefetch_overlaps(api: Api, requests_mock):
+    """
+    Test that the next page is requested while the caller is still working
+    on the current page, but that we never get more than ``prefetch`` pages ahead.
+    """
+    url = "https://example.com"
+    requested = threading.Semaphore(0)
+
+    def _page(request, context):
+        page = int(request.qs.get("offset", ["0"])[0])
+        requested.release()
+        return {"page": page, "offset": str(page + 1)}
+
+    m = requests_mock.get(url, json=_page)
+    pages = api.iterate_requests("GET", url, prefetch=2)
+    assert next(pages) == {"page": 0, "offset": "1"}
+    # while we're "processing" page 0, pages 1 and 2 should be requested...
+    for _ in range(3):
+        assert requested.acquire(timeout=1)
+    # ...but not page 3.
+    assert not requested.acquire(timeout=0.2)
+    assert m.call_count == 3
+    pages.close()
+
+
+def test_iterate_requests__prefetch_error(api: Api, requests_mock):
+    url = "https://example.com"
+    requests_mock.get(
+        url,
+        response_list=[
+            {"json": {"page": 0, "offset": "1"}},
+            {"status_code": 404, "json": {"error": "NOT_FOUND"}},
+        ],
+    )
+    pages = api.iterate_requests("GET", url, prefetch=1)
+    assert next(pages) == {"page": 0, "offset": "1"}
+    with pytest.raises(requests.HTTPError):
+        next(pages)
+
+
+def test_iterate_requests__prefetch_stops_early(api: Api, requests_mock):
+    url = "https://example.com"
+    m = requests_mock.get(url, json={"page": 0, "offset": "more"})
+    for page in api.iterate_requests("GET", url, prefetch=2):
+        break
+    time.sleep(0.3)
+    assert m.call_count <= 3
+
+
+@pytest.fixture
+def slow_endpoint(requests_mock):
+    """
+    An endpoint which holds each request open until ``release`` is set.
+    """
+    url = "https://example.com/v0/appFake/Table"
+    release = threading.Event()
+
+    def _respond(request, context):
+        release.wait(timeout=5)
+        if request.qs.get("fail"):
+            context.status_code = 422
+            return {"error": "INVALID"}
+        return {"records": [{"id": "rec1", "fields": {}}]}
+
+    m = requests_mock.get(url, json=_respond)
+    m.url, m.release = url, release
+    return m
+
+
+def _concurrently(count, func, until):
+    """
+    Start ``count`` calls to ``func`` in separate threads, wait until ``until()``
+    is true, then return a function which collects the results (or exceptions).
+    """
+    executor = ThreadPoolExecutor(count)
+    futures = [executor.submit(func) for _ in range(count)]
+    deadline = time.monotonic() + 5
+    while not until() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return lambda: [f.exception() or f.result() for f in futures]
+
+
+def test_request__coalesced(api, slow_endpoint):
+    """
+    Test that identical read requests made at the same time are only sent once,
+    and that each caller receives its own copy of the response.
+    """
+    api.coalesce_requests = True
+    results = _concurrently(
+        5,
+        lambda: api.get(slow_endpoint.url, params={"b": 1, "a": 2}),
+        until=lambda: api.stats.coalesced == 4,
+    )
+    slow_endpoint.release.set()
+    responses = results()
+    assert slow_endpoint.call_count == 1
+    assert api.stats.sent == 1
+    assert all(r == {"records": [{"id": "rec1", "fields": {}}]} for r in responses)
+    assert len({id(r) for r in responses}) == 5
+    # once the first request has finished, the next one is sent again
+    api.get(slow_endpoint.url, params={"a": 2, "b": 1})
+    assert api.stats.sent == 2
+
+
+def test_request__coalesced_error(api, slow_endpoint):
+    api.coalesce_requests = True
+    results = _concurrently(
+        3,
+        lambda: api.get(slow_endpoint.url, params={"fail": 1}),
+        until=lambda: api.stats.coalesced == 2,
+    )
+    slow_endpoint.release.set()
+    assert all(isinstance(r, requests.HTTPError) for r in results())
+    assert slow_endpoint.call_count == 1
+
+
+def test_request__not_coalesced(api, slow_endpoint, requests_mock):
+    """
+    Test that requests which differ, writes, and requests made when
+    ``coalesce_requests=False`` are all sent separately.
+    """
+    api.coalesce_requests = True
+    requests_mock.patch(slow_endpoint.url, json={})
+    calls = [
+        lambda: api.get(slow_endpoint.url, params={"a": [1, 2]}),
+        lambda: api.get(slow_endpoint.url, params={"a": [2, 1]}),
+        lambda: api.patch(slow_endpoint.url, json={"fields": {}}),
+        lambda: api.patch(slow_endpoint.url, json={"fields": {}}),
+    ]
+    results = _concurrently(
+        len(calls), lambda: calls.pop()(), until=lambda: api.stats.sent == 4
+    )
+    slow_endpoint.release.set()
+    results()
+    assert api.stats.sent == 4
+    assert api.stats.coalesced == 0
+
+    assert Api("key").coalesce_requests is False
+    api.coalesce_requests = False
+    slow_endpoint.release.clear()
+    results = _concurrently(
+        2, lambda: api.get(slow_endpoint.url), until=lambda: api.stats.sent == 6
+    )
+    slow_endpoint.release.set()
+    results()
+    assert api.stats.coalesced == 0
+
+
 def test_workspace(api):
     assert api.workspace("wspFake").id == "wspFake"
 
@@ -0,0 +1,432 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests
+
+from pyairtable import Api
+from pyairtable.api.cache import (
+    CacheRefresher,
+    MemoryCache,
+    NegativeCache,
+    SchemaCache,
+    SQLiteCache,
+)
+from pyairtable.exceptions import CachedFailureError
+from pyairtable.testing import fake_record
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+
+    monkeypatch.setattr("pyairtable.api.cache.time.time", lambda: Clock.now)
+    return Clock
+
+
+@pytest.fixture
+def mock_tables_endpoint(base, requests_mock, sample_json):
+    return requests_mock.get(base.urls.tables, json=sample_json("BaseSchema"))
+
+
+def test_get_set(clock):
+    cache = SchemaCache(ttl=60)
+    assert cache.get("appFake") is None
+    cache.set("appFake", {"tables": []})
+    assert cache.get("appFake") == {"tables": []}
+    clock.now += 59
+    assert cache.get("appFake") == {"tables": []}
+    clock.now += 1
+    assert cache.get("appFake") is None
+
+
+def test_invalidate():
+    cache = SchemaCache()
+    cache.set("app1", {"tables": []})
+    cache.set("app2", {"tables": []})
+    cache.invalidate("app1")
+    assert cache.get("app1") is None
+    assert cache.get("app2") is not None
+    cache.invalidate()
+    assert cache.get("app2") is None
+
+
+def test_path(tmp_path, clock):
+    SchemaCache(path=tmp_path).set("appFake", {"tables": []})
+    assert json.loads((tmp_path / "appFake.json").read_text()) == {
+        "fetched_at": 1000.0,
+        "schema": {"tables": []},
+    }
+    # a new cache (e.g. after a restart) can read what was saved,
+    # and will respect the original time it was fetched
+    assert SchemaCache(path=tmp_path).get("appFake") == {"tables": []}
+    clock.now += 60
+    assert SchemaCache(ttl=60, path=tmp_path).get("appFake") is None
+    # invalidating removes the file
+    cache = SchemaCache(path=tmp_path)
+    cache.invalidate("appFake")
+    assert not (tmp_path / "appFake.json").exists()
+    assert cache.get("appFake") is None
+
+
+def test_path__invalidate_all(tmp_path):
+    """
+    Test that invalidate() also removes schemas saved by other processes.
+    """
+    SchemaCache(path=tmp_path).set("app1", {"tables": []})
+    cache = SchemaCache(path=tmp_path)
+    cache.set("app2", {"tables": []})
+    cache.invalidate()
+    assert list(tmp_path.iterdir()) == []
+    assert repr(cache) == f"<SchemaCache ttl=None path={tmp_path!r}>"
+
+
+def test_path__write_error(tmp_path):
+    """
+    Test that a failed write does not leave a temporary file behind.
+    """
+    cache = SchemaCache(path=tmp_path)
+    with pytest.raises(TypeError):
+        cache.set("appFake", {"tables": object()})
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_path__corrupt(tmp_path):
+    (tmp_path / "appFake.json").write_text("{")
+    assert SchemaCache(path=tmp_path).get("appFake") is None
+
+
+def test_shared_between_bases(api, base, mock_tables_endpoint):
+    """
+    Test that separate Base instances with the same ID share one cached schema.
+    """
+    api.schema_cache = SchemaCache()
+    base.schema()
+    assert api.base(base.id).schema().table("Apartments").id == "tbltp8DGLhqbUmjK1"
+    assert mock_tables_endpoint.call_count == 1
+    # force=True refreshes the cache for every instance
+    api.base(base.id).schema(force=True)
+    assert mock_tables_endpoint.call_count == 2
+    base.schema()
+    assert mock_tables_endpoint.call_count == 2
+
+
+def test_disabled(base, mock_tables_endpoint):
+    assert Api("apikey").schema_cache is None
+    assert isinstance(Api("apikey", schema_cache=True).schema_cache, SchemaCache)
+    api = Api("apikey", schema_cache=False)
+    api.base(base.id).schema()
+    api.base(base.id).schema()
+    assert mock_tables_endpoint.call_count == 2
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path, clock):
+    if request.param == "memory":
+        return MemoryCache(max_entries=3, ttl=60)
+    return SQLiteCache(tmp_path / "cache.sqlite3", max_entries=3, ttl=60)
+
+
+def test_backend__get_set(backend, clock):
+    assert backend.get("a") is None
+    backend.set("a", {"records": [1, 2]})
+    backend.set("b", [1], ttl=10)
+    assert backend.get("a") == {"records": [1, 2]}
+    clock.now += 10
+    assert backend.get("b") is None
+    assert backend.stats.to_dict() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+        "expirations": 1,
+        "invalidations": 0,
+        "hit_rate": 0.3333,
+    }
+
+
+def test_backend__evictions(backend):
+    for key in "abcd":
+        backend.set(key, key)
+    assert len(backend) == 3
+    assert backend.get("a") is None
+    assert backend.stats.evictions == 1
+
+
+def test_backend__delete(backend):
+    backend.set("tables", 3)
+    backend.delete("tables")
+    backend.delete("missing")
+    backend.set("tables", 3)
+    assert backend.clear() == 1
+    assert len(backend) == 0
+    assert backend.stats.invalidations == 2
+
+
+def test_backend__invalidate(backend):
+    backend.set("tasks_1", 1, tags=["table:Tasks", "record:rec1", "record:rec2"])
+    backend.set("tasks_2", 2, tags=["table:Tasks", "record:rec3"])
+    backend.set("tasks_old", 3, tags=["table:Tasks Old", "record:rec1"])
+    assert backend.invalidate("record:rec2", "record:rec3") == 2
+    assert backend.invalidate("table:Tasks") == 0
+    assert backend.get("tasks_old") == 3
+    # replacing a value replaces its tags
+    backend.set("tasks_old", 4, tags=["table:Tasks Old"])
+    assert backend.invalidate("record:rec1") == 0
+    assert backend.invalidate("table:Tasks Old") == 1
+    assert backend.invalidate() == 0
+    assert len(backend) == 0
+    assert backend.stats.invalidations == 3
+
+
+def test_backend__evicted_tags(backend):
+    """
+    Test that tags are forgotten when their value is evicted.
+    """
+    for key in "abcd":
+        backend.set(key, key, tags=["all"])
+    assert backend.invalidate("all") == 3
+    if isinstance(backend, MemoryCache):
+        assert backend._tagged == {}
+    else:
+        assert backend.connection.execute("SELECT * FROM tags").fetchall() == []
+
+
+def test_memory_cache__lru():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+
+def test_sqlite_cache__errors(tmp_path):
+    """
+    Test that a value which cannot be stored leaves the previous value in place,
+    and that a closed connection is reopened when needed.
+    """
+    path = tmp_path / "cache.sqlite3"
+    cache = SQLiteCache(path, max_entries=10)
+    assert repr(cache) == f"<SQLiteCache path={str(path)!r} max_entries=10>"
+    cache.set("key", 1)
+    with pytest.raises(TypeError):
+        cache.set("key", object())
+    assert not cache.connection.in_transaction
+    cache.close()
+    cache.close()
+    assert cache.get("key") == 1
+
+
+def test_sqlite_cache__shared(tmp_path):
+    """
+    Test that changes made through one SQLiteCache (e.g. in one web worker)
+    are seen by every other SQLiteCache using the same file.
+    """
+    path = tmp_path / "cache.sqlite3"
+    worker1, worker2 = SQLiteCache(path), SQLiteCache(path)
+    worker1.set("records_Tasks_1", {"id": "rec1"}, tags=["table:Tasks"])
+    assert worker2.get("records_Tasks_1") == {"id": "rec1"}
+    worker2.invalidate("table:Tasks")
+    assert worker1.get("records_Tasks_1") is None
+
+
+@pytest.fixture
+def refresher(clock):
+    refresher = CacheRefresher(MemoryCache(ttl=60), grace=30, hot_keys=1)
+    yield refresher
+    refresher.close()
+
+
+def wait_for_refreshes(refresher):
+    for future in list(refresher._inflight.values()):
+        future.exception(timeout=5)
+
+
+def test_refresher__stale_while_revalidate(refresher, clock):
+    versions = iter(range(1, 100))
+    load = mock.Mock(side_effect=lambda: next(versions))
+    assert refresher.get("key", load) == 1
+    assert refresher.get("key", load) == 1
+    # once expired, the old value is served while a new one is loaded
+    clock.now += 60
+    assert refresher.get("key", load) == 1
+    wait_for_refreshes(refresher)
+    assert refresher.get("key", load) == 2
+    # after the grace period, callers wait for the new value
+    clock.now += 90
+    assert refresher.get("key", load) == 3
+    assert load.call_count == 3
+    assert refresher.stats.to_dict() == {
+        "fresh": 2,
+        "stale": 1,
+        "misses": 2,
+        "coalesced": 0,
+        "refreshes": 1,
+        "failures": 0,
+    }
+
+
+def test_refresher__tags(refresher):
+    refresher.get("key", lambda: [1, 2], tags=lambda value: [f"len:{len(value)}"])
+    assert refresher.cache.invalidate("len:2") == 1
+
+
+def test_refresher__coalesced(refresher):
+    started, finish = threading.Event(), threading.Event()
+
+    def load():
+        started.set()
+        finish.wait(5)
+        return "value"
+
+    with ThreadPoolExecutor(2) as executor:
+        first = executor.submit(refresher.get, "key", load)
+        started.wait(5)
+        second = executor.submit(refresher.get, "key", mock.Mock())
+        while not refresher.stats.coalesced:
+            time.sleep(0.001)
+        finish.set()
+        assert first.result() == second.result() == "value"
+
+
+def test_refresher__failure(refresher):
+    with pytest.raises(ValueError):
+        refresher.get("key", mock.Mock(side_effect=ValueError))
+    assert refresher.stats.failures == 1
+    assert refresher.get("key", lambda: "value") == "value"
+
+
+def test_refresher__hot_keys(refresher, clock):
+    loads = mock.Mock(return_value="hot")
+    for _ in range(3):
+        refresher.get("hot", loads)
+    refresher.get("cold", mock.Mock(return_value="cold"))
+    refresher._refresh_hot_keys()
+    wait_for_refreshes(refresher)
+    assert loads.call_count == 1  # not close to expiring yet
+    # invalidated (or nearly expired) hot keys are reloaded in the background
+    refresher.cache.clear()
+    refresher._refresh_hot_keys()
+    wait_for_refreshes(refresher)
+    assert loads.call_count == 2
+    assert refresher.cache.get_entry("hot")[0] == "hot"
+    assert refresher.cache.get_entry("cold") is None
+
+
+@pytest.mark.parametrize("started", [False, True])
+def test_refresher__closed(clock, started):
+    """
+    Test that values are refreshed in the foreground once the refresher is closed,
+    whether or not it had started its background threads.
+    """
+    refresher = CacheRefresher(MemoryCache(ttl=60), grace=30)
+    if started:
+        refresher.get("other", lambda: "other")
+    refresher.close()
+    versions = iter(range(1, 100))
+    load = mock.Mock(side_effect=lambda: next(versions))
+    assert refresher.get("key", load) == 1
+    clock.now += 60
+    assert refresher.get("key", load) == 1
+    assert refresher._inflight == {}
+    assert refresher.get("key", load) == 2
+    assert refresher.stats.refreshes == 0
+    assert load.call_count == 2
+
+
+def test_refresher__refresh_in_flight(refresher, clock):
+    """
+    Test that a stale value is not refreshed again while it is being loaded.
+    """
+    load = mock.Mock(return_value="value")
+    refresher.get("key", load)
+    clock.now += 60
+    future, _ = refresher._claim("key")
+    assert refresher.get("key", load) == "value"
+    assert load.call_count == 1
+    assert refresher._inflight == {"key": future}
+
+
+def test_refresher__max_tracked_keys(refresher):
+    refresher.max_tracked_keys = 2
+    for key in ("a", "b", "c"):
+        refresher.get(key, lambda: key)
+    assert list(refresher._loaders) == ["b", "c"]
+    assert set(refresher._counts) == {"b", "c"}
+
+
+def test_refresher__keep_warm(clock):
+    """
+    Test that hot keys are checked every ``interval`` seconds until closed.
+    """
+    refresher = CacheRefresher(MemoryCache(), interval=0.001)
+    checked = threading.Event()
+    with mock.patch.object(refresher, "_refresh_hot_keys", side_effect=checked.set):
+        refresher.get("key", lambda: "value")
+        assert checked.wait(5)
+        refresher.close()
+    assert repr(refresher) == f"<CacheRefresher cache={refresher.cache!r} grace=60>"
+
+
+def test_negative_cache(base, requests_mock, clock):
+    api = Api("key", negative_cache=NegativeCache(ttl=60))
+    table = api.table(base.id, "Denied")
+    m = requests_mock.get(table.urls.records, status_code=403, json={"error": "x"})
+    requests_mock.get(table.urls.record("recX"), status_code=404)
+    requests_mock.post(table.urls.records, json=fake_record())
+
+    with pytest.raises(requests.HTTPError) as first:
+        table.all()
+    # the same table fails again without another request, with the same message
+    with pytest.raises(CachedFailureError) as second:
+        table.first(formula="TRUE()")
+    assert m.call_count == 1
+    assert second.value.args == first.value.args
+    assert second.value.response.status_code == 403
+    assert api.negative_cache.hits == 1
+
+    # writes, other tokens and single records are not affected
+    table.create({})
+    with pytest.raises(requests.HTTPError) as exc:
+        Api("other", negative_cache=api.negative_cache).table(base.id, "Denied").all()
+    assert not isinstance(exc.value, CachedFailureError)
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError) as exc:
+            table.get("recX")
+        assert not isinstance(exc.value, CachedFailureError)
+    assert m.call_count == 2
+
+    # failures are forgotten once they expire, or when reset
+    clock.now += 60
+    with pytest.raises(requests.HTTPError):
+        table.all()
+    assert m.call_count == 3
+    api.negative_cache.reset(base.id)
+    with pytest.raises(requests.HTTPError):
+        table.all()
+    assert m.call_count == 4
+
+
+def test_negative_cache__status_codes(api, requests_mock):
+    api.negative_cache = NegativeCache()
+    m = requests_mock.get(api.urls.bases, status_code=500)
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            api.request("GET", api.urls.bases)
+    assert m.call_count == 2
+    assert not api.negative_cache._failures
+
+
+def test_negative_cache__other_errors():
+    cache = NegativeCache()
+    url = "https://api.airtable.com/v0/appFake/Table"
+    cache.record("key", url, True, ValueError("not an HTTP error"))
+    cache.record("key", url, True, requests.HTTPError("no response"))
+    cache.check("key", url, True)
+    assert repr(cache) == "<NegativeCache ttl=300 failures=0>"
+    assert isinstance(Api("key", negative_cache=True).negative_cache, NegativeCache)
@@ -0,0 +1,236 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+import requests
+
+from pyairtable import Api
+from pyairtable.api.circuit import (
+    CLOSED,
+    HALF_OPEN,
+    META,
+    OPEN,
+    RECORDS_READ,
+    RECORDS_WRITE,
+    CircuitBreaker,
+    endpoint_class,
+)
+from pyairtable.api.concurrency import AdaptiveConcurrency
+from pyairtable.exceptions import CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(min_requests=4, reset_timeout=30, clock=clock)
+
+
+def _call(breaker, clock, failed=False, latency=0.1, endpoint=RECORDS_READ):
+    started = breaker.before_request(endpoint)
+    clock.now += latency
+    breaker.after_request(endpoint, started, failed)
+
+
+@pytest.mark.parametrize(
+    "method,path,expected",
+    [
+        ("GET", "appLkNDICXNqxSDhG/Table", RECORDS_READ),
+        ("GET", "appLkNDICXNqxSDhG/Table/recX", RECORDS_READ),
+        ("POST", "appLkNDICXNqxSDhG/Table/listRecords", RECORDS_READ),
+        ("POST", "appLkNDICXNqxSDhG/Table", RECORDS_WRITE),
+        ("DELETE", "appLkNDICXNqxSDhG/Table/recX", RECORDS_WRITE),
+        ("GET", "meta/bases/appLkNDICXNqxSDhG/tables", META),
+        ("POST", "bases/appLkNDICXNqxSDhG/webhooks", META),
+        ("GET", "meta/whoami", META),
+    ],
+)
+def test_endpoint_class(method, path, expected):
+    assert endpoint_class(method, f"https://api.airtable.com/v0/{path}") == expected
+
+
+def test_trips_on_failures(breaker, clock):
+    for failed in (False, True, False):
+        _call(breaker, clock, failed)
+    assert breaker.state(RECORDS_READ) == CLOSED
+    _call(breaker, clock, failed=True)  # 2 of 4 failed
+    assert breaker.state(RECORDS_READ) == OPEN
+    # other classes of endpoint are unaffected
+    assert breaker.state(RECORDS_WRITE) == CLOSED
+    _call(breaker, clock, endpoint=RECORDS_WRITE)
+
+    clock.now += 10
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_request(RECORDS_READ)
+    assert excinfo.value.endpoint == RECORDS_READ
+    assert excinfo.value.retry_in == pytest.approx(19.9)
+    stats = breaker.stats(RECORDS_READ)
+    assert (stats.requests, stats.failures, stats.rejected, stats.trips) == (
+        4,
+        2,
+        1,
+        1,
+    )
+
+
+def test_trips_on_latency(breaker, clock):
+    for _ in range(4):
+        _call(breaker, clock, latency=11)
+    assert breaker.state(RECORDS_READ) == OPEN
+
+
+def test_half_open(breaker, clock):
+    for _ in range(4):
+        _call(breaker, clock, failed=True)
+    clock.now += 30
+    assert breaker.state(RECORDS_READ) == HALF_OPEN
+    assert repr(breaker) == "<CircuitBreaker {'records.read': 'half_open'}>"
+
+    # only one probe is allowed in flight; if it fails, the circuit opens again
+    started = breaker.before_request(RECORDS_READ)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(RECORDS_READ)
+    breaker.after_request(RECORDS_READ, started, failed=True)
+    assert breaker.state(RECORDS_READ) == OPEN
+
+    # if it succeeds, the circuit closes
+    clock.now += 30
+    _call(breaker, clock)
+    assert breaker.state(RECORDS_READ) == CLOSED
+    _call(breaker, clock, failed=True)
+    assert breaker.state(RECORDS_READ) == CLOSED
+
+
+def test_late_responses_ignored(breaker, clock):
+    """
+    Test that requests which were in flight when the circuit opened
+    do not count as probes.
+    """
+    slow = breaker.before_request(RECORDS_READ)
+    for _ in range(4):
+        _call(breaker, clock, failed=True)
+    clock.now += 30
+    breaker.after_request(RECORDS_READ, slow, failed=False)
+    assert breaker.state(RECORDS_READ) == HALF_OPEN
+    breaker.reset()
+    assert breaker.state(RECORDS_READ) == CLOSED
+
+
+def test_cancel_request(breaker, clock):
+    """
+    Test that a probe which is never sent does not keep the circuit half-open.
+    """
+    unsent = breaker.before_request(RECORDS_READ)
+    for _ in range(4):
+        _call(breaker, clock, failed=True)
+    clock.now += 30
+    probe = breaker.before_request(RECORDS_READ)
+    # a request allowed before the circuit opened does not give back a probe
+    breaker.cancel_request(RECORDS_READ, unsent)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(RECORDS_READ)
+    breaker.cancel_request(RECORDS_READ, probe)
+    _call(breaker, clock)
+    assert breaker.state(RECORDS_READ) == CLOSED
+    assert breaker.stats(RECORDS_READ).requests == 5
+
+
+def test_api(requests_mock, breaker):
+    api = Api("key", retry_strategy=None, circuit_breaker=breaker)
+    table = api.table("appLkNDICXNqxSDhG", "Table")
+    m = requests_mock.get(table.urls.records, status_code=503)
+    requests_mock.get(table.urls.record("recX"), status_code=404)
+    requests_mock.get(api.urls.whoami, exc=requests.exceptions.ConnectTimeout)
+
+    # client errors are not failures
+    for _ in range(4):
+        with pytest.raises(requests.HTTPError):
+            table.get("recX")
+    for _ in range(4):
+        with pytest.raises(requests.HTTPError):
+            table.all()
+    assert m.call_count == 4
+    with pytest.raises(CircuitOpenError):
+        table.all()
+    assert m.call_count == 4
+    assert api.stats.sent == 8
+
+    with pytest.raises(requests.Timeout):
+        api.whoami()
+    assert breaker.stats(META).failures == 1
+    assert Api("key").circuit_breaker is None
+    assert isinstance(Api("key", circuit_breaker=True).circuit_breaker, CircuitBreaker)
+
+
+def test_api__queued_requests_not_slow(requests_mock):
+    """
+    Test that time spent waiting for a concurrency slot does not count towards
+    slow_call_duration, and that an open circuit fails before the rate limiter.
+    """
+    breaker = CircuitBreaker(min_requests=4, slow_call_duration=0.15)
+    api = Api(
+        "key",
+        retry_strategy=None,
+        circuit_breaker=breaker,
+        concurrency=AdaptiveConcurrency(1, maximum=1),
+    )
+    table = api.table("appLkNDICXNqxSDhG", "Table")
+
+    def _slow(request, context):
+        time.sleep(0.1)
+        return {"records": []}
+
+    requests_mock.get(table.urls.records, json=_slow)
+    threads = [
+        threading.Thread(target=table.all, kwargs={"view": str(n)}) for n in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert breaker.stats(RECORDS_READ).failures == 0
+    assert breaker.state(RECORDS_READ) == CLOSED
+
+    api.rate_limiter = mock.Mock()
+    breaker.reset()
+    breaker.slow_call_duration = 0
+    for _ in range(4):
+        table.all()
+    assert api.rate_limiter.acquire.call_count == 4
+    with pytest.raises(CircuitOpenError):
+        table.all()
+    assert api.rate_limiter.acquire.call_count == 4
+
+
+def test_api__probe_not_sent(requests_mock, breaker, clock):
+    """
+    Test that a probe which fails before it is sent (for example, while waiting
+    for the rate limiter) gives back its slot, so that later probes can be sent.
+    """
+    api = Api("key", retry_strategy=None, circuit_breaker=breaker)
+    table = api.table("appLkNDICXNqxSDhG", "Table")
+    requests_mock.get(table.urls.records, json={"records": []})
+    for _ in range(4):
+        _call(breaker, clock, failed=True)
+    clock.now += 30
+
+    api.rate_limiter = mock.Mock()
+    api.rate_limiter.acquire.side_effect = KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        table.all()
+    api.rate_limiter = None
+    assert table.all() == []
+    assert breaker.state(RECORDS_READ) == CLOSED
+    assert api.stats.sent == 1
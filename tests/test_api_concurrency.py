@@ -0,0 +1,168 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+import requests
+
+from pyairtable import Api
+from pyairtable.api.concurrency import AdaptiveConcurrency, is_congested
+from pyairtable.exceptions import BatchError
+from pyairtable.testing import fake_record
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _round_trip(limiter, clock, latency=0.1, congested=False):
+    """
+    Fill every slot in the limiter, then release them all after ``latency``.
+    """
+    slots = [limiter.acquire() for _ in range(int(limiter.limit))]
+    clock.now += latency
+    for started in slots:
+        limiter.release(started, congested)
+
+
+def test_additive_increase(clock):
+    limiter = AdaptiveConcurrency(2, maximum=5, clock=clock)
+    _round_trip(limiter, clock)
+    assert limiter.limit == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+    for _ in range(10):
+        _round_trip(limiter, clock)
+    assert limiter.limit == 5
+    assert limiter.in_flight == 0
+    assert repr(limiter) == "<AdaptiveConcurrency limit=5.0 in_flight=0>"
+
+
+def test_no_increase_when_idle_or_slow(clock):
+    limiter = AdaptiveConcurrency(4, clock=clock)
+    # requests which don't use every slot say nothing about the limit
+    for _ in range(10):
+        limiter.release(limiter.acquire())
+    assert limiter.limit == 4
+    # neither do requests which are much slower than usual
+    _round_trip(limiter, clock, latency=0.1)
+    limit = limiter.limit
+    _round_trip(limiter, clock, latency=1.0)
+    assert limiter.limit == limit
+
+
+def test_multiplicative_decrease(clock):
+    limiter = AdaptiveConcurrency(8, minimum=2, clock=clock)
+    # a burst of congestion from requests already in flight only cuts the limit once
+    _round_trip(limiter, clock, congested=True)
+    assert limiter.limit == 4
+    assert (limiter.stats.congested, limiter.stats.decreases) == (8, 1)
+    _round_trip(limiter, clock, congested=True)
+    assert limiter.limit == 2
+    _round_trip(limiter, clock, congested=True)
+    assert limiter.limit == 2
+
+
+def test_acquire__blocks(clock):
+    limiter = AdaptiveConcurrency(1, clock=clock)
+    started = limiter.acquire()
+    thread = threading.Thread(target=limiter.acquire)
+    thread.start()
+    time.sleep(0.05)
+    assert limiter.in_flight == 1
+    limiter.release(started)
+    thread.join(timeout=1)
+    assert limiter.in_flight == 1
+    assert limiter.stats.waited == 1
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"initial": 0}, {"initial": 4, "maximum": 2}, {"backoff": 1}],
+)
+def test_invalid(kwargs):
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(**kwargs)
+
+
+@pytest.mark.parametrize(
+    "status,history,expected",
+    [
+        (200, [], False),
+        (429, [], True),
+        (503, [], True),
+        (422, [], False),
+        (200, [429], True),
+        (200, [500], False),
+    ],
+)
+def test_is_congested(status, history, expected):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = mock.Mock()
+    response.raw.retries.history = [mock.Mock(status=code) for code in history]
+    assert is_congested(response) is expected
+
+
+def test_api__batches(requests_mock):
+    """
+    Test that batch methods send chunks concurrently when the Api has a limiter,
+    and that 429s cut the limit.
+    """
+    api = Api("key", retry_strategy=None, concurrency=AdaptiveConcurrency(8))
+    table = api.table("appLkNDICXNqxSDhG", "Table")
+    records = [{"n": n} for n in range(50)]
+
+    def _respond(request, context):
+        sent = request.json()["records"]
+        if sent[0]["fields"]["n"] == 20:
+            context.status_code = 429
+            return {"errors": [{"error": "RATE_LIMIT_REACHED"}]}
+        return {"records": [fake_record(record["fields"]) for record in sent]}
+
+    requests_mock.post(table.urls.records, json=_respond)
+    with mock.patch.object(api, "_map_chunks", wraps=api._map_chunks) as m:
+        with pytest.raises(BatchError) as excinfo:
+            table.batch_create(records)
+    assert m.call_args.args[2] is None
+    assert list(excinfo.value.failed) == [2]
+    assert api.concurrency.stats.requests == 5
+    assert api.concurrency.stats.decreases == 1
+    assert api.concurrency.limit < 8
+    assert api.concurrency.in_flight == 0
+
+
+@pytest.mark.parametrize("method", ["batch_upsert", "iter_batch_upsert"])
+def test_api__upsert_sequential(requests_mock, method):
+    """
+    Test that upserts are not sent concurrently unless max_workers is given,
+    since concurrent upserts can create duplicate records.
+    """
+    api = Api("key", retry_strategy=None, concurrency=AdaptiveConcurrency(8))
+    table = api.table("appLkNDICXNqxSDhG", "Table")
+    records = [{"fields": {"Name": str(n)}} for n in range(30)]
+    requests_mock.patch(
+        table.urls.records,
+        json={"createdRecords": [], "updatedRecords": [], "records": []},
+    )
+    with mock.patch.object(api, "_default_workers", wraps=api._default_workers) as m:
+        list(getattr(table, method)(records, key_fields=["Name"]))
+        assert m.call_args.args == (1,)
+        list(getattr(table, method)(records, key_fields=["Name"], max_workers=4))
+        assert m.call_args.args == (4,)
+
+
+def test_api__timeout(requests_mock):
+    api = Api("key", concurrency=True)
+    requests_mock.get(api.urls.whoami, exc=requests.exceptions.ConnectTimeout)
+    with pytest.raises(requests.Timeout):
+        api.whoami()
+    assert api.concurrency.stats.congested == 1
+    assert Api("key").concurrency is None
@@ -267,6 +267,7 @@ def test_group__no_collaboration(enterprise, enterprise_mocks):
     [
         (call(), N_AUDIT_PAGES * N_AUDIT_PAGE_SIZE),
         (call(page_limit=1), N_AUDIT_PAGE_SIZE),
+        (call(prefetch=2), N_AUDIT_PAGES * N_AUDIT_PAGE_SIZE),
     ],
 )
 def test_audit_log(enterprise, fncall, expected_size):
@@ -0,0 +1,218 @@
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from pyairtable import Api
+from pyairtable.api import ratelimit
+from pyairtable.api.ratelimit import FileRateLimiter, RateLimiter, TokenBucket
+from pyairtable.testing import fake_id, fake_record
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://api.airtable.com/v0/appLkNDICXNqxSDhG/Table", "appLkNDICXNqxSDhG"),
+        ("https://api.airtable.com/v0/appLkNDICXNqxSDhG", "appLkNDICXNqxSDhG"),
+        (
+            "https://api.airtable.com/v0/meta/bases/appLkNDICXNqxSDhG/tables",
+            "appLkNDICXNqxSDhG",
+        ),
+        (
+            "https://api.airtable.com/v0/bases/appLkNDICXNqxSDhG/webhooks",
+            "appLkNDICXNqxSDhG",
+        ),
+        ("https://api.airtable.com/v0/meta/whoami", None),
+        ("https://api.airtable.com/v0/appTooShort/Table", None),
+    ],
+)
+def test_base_id_from_url(url, expected):
+    assert ratelimit.base_id_from_url(url) == expected
+
+
+def test_token_bucket(clock):
+    bucket = TokenBucket(rate=5, burst=2, clock=clock)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # each subsequent reservation is spaced 1/rate seconds after the previous one
+    assert bucket.reserve() == pytest.approx(0.2)
+    assert bucket.reserve() == pytest.approx(0.4)
+    # once enough time has passed, the bucket refills (but never beyond burst)
+    clock.now += 10
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.2)
+
+
+@pytest.mark.parametrize("kwargs", [{"rate": 0}, {"rate": 1, "burst": 0.5}])
+def test_token_bucket__invalid(kwargs):
+    with pytest.raises(ValueError):
+        TokenBucket(**kwargs)
+
+
+def test_rate_limiter(clock):
+    limiter = RateLimiter(base_qps=5, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        limiter.acquire("key", "appLkNDICXNqxSDhG")
+    # a second base has its own budget
+    assert limiter.acquire("key", "appSW9R5uCNmRmfl6") == 0
+
+    assert clock.now == pytest.approx(0.8)
+    assert limiter.stats.requests == 6
+    assert limiter.stats.tokens_waited == 4
+    assert limiter.stats.time_blocked == pytest.approx(0.8)
+    assert limiter.stats.saturation == pytest.approx(4 / 6)
+    stats = limiter.stats_for("key", "appLkNDICXNqxSDhG")
+    assert (stats.requests, stats.tokens_waited) == (5, 4)
+    assert limiter.stats_for("key").requests == 0
+    assert limiter.stats_for("other", "appLkNDICXNqxSDhG").requests == 0
+
+    limiter.reset_stats()
+    assert limiter.stats.requests == 0
+    assert limiter.stats.saturation == 0
+
+
+def test_rate_limiter__token_budget(clock):
+    """
+    Test that requests to different bases still share the per-token budget.
+    """
+    limiter = RateLimiter(base_qps=5, token_qps=10, clock=clock, sleep=clock.sleep)
+    for _ in range(10):
+        limiter.acquire("key", fake_id("app"))
+    assert clock.now == pytest.approx(0.9)
+
+
+def test_default_rate_limiter():
+    assert Api("key").rate_limiter is None
+    assert Api("key", rate_limit=False).rate_limiter is None
+    api1 = Api("key1", rate_limit=True)
+    api2 = Api("key2", rate_limit=True)
+    assert api1.rate_limiter is api2.rate_limiter is ratelimit.default_rate_limiter()
+    limiter = RateLimiter()
+    assert Api("key", rate_limit=limiter).rate_limiter is limiter
+
+
+def test_api_request__acquires(requests_mock):
+    limiter = mock.Mock(spec=RateLimiter)
+    api = Api("key", rate_limit=limiter)
+    table = api.table("appLkNDICXNqxSDhG", "Table")
+    requests_mock.get(table.urls.records, json={"records": []})
+    requests_mock.get(api.urls.whoami, json={"id": "usrX", "scopes": []})
+    table.all()
+    api.whoami()
+    assert limiter.acquire.call_args_list == [
+        mock.call("key", "appLkNDICXNqxSDhG"),
+        mock.call("key", None),
+    ]
+
+
+def test_iterate_requests__acquires_per_page(requests_mock):
+    limiter = mock.Mock(spec=RateLimiter)
+    api = Api("key", rate_limit=limiter)
+    url = api.build_url("appLkNDICXNqxSDhG/Table")
+    requests_mock.get(
+        url,
+        response_list=[
+            {"json": {"records": [], "offset": "1"}},
+            {"json": {"records": [], "offset": "2"}},
+            {"json": {"records": []}},
+        ],
+    )
+    assert len(list(api.iterate_requests("GET", url))) == 3
+    assert limiter.acquire.call_count == 3
+
+
+def test_threads_share_budget(constants, mock_endpoint, mock_endpoint_server):
+    """
+    Test that many threads sharing one rate-limited Api never exceed the budget,
+    even without a retry strategy to recover from 429s.
+    """
+    mock_endpoint.qps = 20
+    mock_endpoint.timestamps = mock_endpoint.timestamps.__class__(maxlen=20)
+    mock_endpoint.canned_responses = [(200, fake_record()) for _ in range(40)]
+    api = Api(
+        constants["API_KEY"],
+        retry_strategy=None,
+        rate_limit=RateLimiter(base_qps=18),
+        endpoint_url=mock_endpoint_server.url,
+    )
+    table = api.table(constants["BASE_ID"], constants["TABLE_NAME"])
+
+    with ThreadPoolExecutor(max_workers=25) as executor:
+        results = list(executor.map(table.get, [fake_id() for _ in range(40)]))
+
+    assert len(results) == 40
+    assert mock_endpoint.throttled == 0
+    assert api.rate_limiter.stats.requests == 40
+    assert api.rate_limiter.stats.tokens_waited > 0
+
+
+def test_file_rate_limiter(tmp_path, clock):
+    """
+    Test that two FileRateLimiter instances pointing at the same
+    directory share one budget (as they would in separate processes).
+    """
+    kwargs = dict(base_qps=5, clock=clock, sleep=clock.sleep)
+    limiter1 = FileRateLimiter(tmp_path, **kwargs)
+    limiter2 = FileRateLimiter(tmp_path, **kwargs)
+    for _ in range(3):
+        limiter1.acquire("key", "appLkNDICXNqxSDhG")
+        limiter2.acquire("key", "appLkNDICXNqxSDhG")
+    assert clock.now == pytest.approx(1.0)
+    # stats are only tracked per-process
+    assert limiter1.stats.requests == limiter2.stats.requests == 3
+    assert "key" not in "".join(path.name for path in tmp_path.iterdir())
+    assert str(tmp_path) in repr(limiter1)
+
+
+def test_file_rate_limiter__corrupted(tmp_path, clock):
+    limiter = FileRateLimiter(tmp_path, clock=clock, sleep=clock.sleep)
+    limiter.acquire("key")
+    for path in tmp_path.iterdir():
+        path.write_text("garbage")
+    assert limiter.acquire("key") == 0
+
+
+def _acquire_in_subprocess(directory, count, queue):
+    limiter = FileRateLimiter(directory, base_qps=20)
+    for _ in range(count):
+        limiter.acquire("key", "appLkNDICXNqxSDhG")
+        queue.put(time.time())
+
+
+def test_file_rate_limiter__processes(tmp_path):
+    """
+    Test that several processes using the same directory stay within the budget.
+    """
+    ctx = multiprocessing.get_context()
+    queue = ctx.Queue()
+    procs = [
+        ctx.Process(target=_acquire_in_subprocess, args=(tmp_path, 5, queue))
+        for _ in range(4)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(timeout=10)
+        assert proc.exitcode == 0
+    timestamps = sorted(queue.get(timeout=1) for _ in range(20))
+    # 20 requests at 20 QPS (with burst=1) should take at least 19 intervals
+    assert timestamps[-1] - timestamps[0] >= 0.9
@@ -1,162 +1,38 @@
 """
 For these tests Mocker cannot be used because Retry is operating on a lower level.
-Instead we use a real HTTP server running in a separate thread, which we can program
-to respond with various HTTP status codes.
+Instead we use a real HTTP server running in a separate thread (see conftest.py),
+which we can program to respond with various HTTP status codes.
 """
 
-import json
-import threading
-import time
-from collections import deque
-from http import HTTPStatus
-from urllib.parse import urljoin
-from wsgiref.simple_server import WSGIRequestHandler, make_server
+from unittest import mock
 
 import pytest
 import requests
+from urllib3 import HTTPResponse
 
 from pyairtable.api import Api
-from pyairtable.api.retrying import retry_strategy
+from pyairtable.api.concurrency import AdaptiveConcurrency
+from pyairtable.api.retrying import (
+    DEFAULT_BACKOFF_MAX,
+    AdaptiveRetry,
+    RetryBudget,
+    retry_strategy,
+)
 from pyairtable.testing import fake_record
 
-
-# Adapted from https://github.com/kevin1024/pytest-httpbin
-class Server:
-    """
-    HTTP server running a WSGI application in its own thread.
-    """
-
-    def __init__(self, host="127.0.0.1", port=0, application=None, **kwargs):
-        self.app = application
-        self._server = make_server(host, port, self.app, **kwargs)
-        self.host = self._server.server_address[0]
-        self.port = self._server.server_address[1]
-        self.protocol = "http"
-
-        self._thread = threading.Thread(
-            name=self.__class__,
-            target=self._server.serve_forever,
-        )
-
-    def set_app(self, app):
-        self.app = app
-        self._server.set_app(app)
-
-    def __del__(self):
-        if hasattr(self, "_server"):
-            self.stop()
-
-    def start(self):
-        self._thread.start()
-
-    def __enter__(self):
-        self.start()
-        return self
-
-    def __exit__(self, *args, **kwargs):
-        self.stop()
-        suppress_exc = self._server.__exit__(*args, **kwargs)
-        self._thread.join()
-        return suppress_exc
-
-    def __add__(self, other):
-        return self.url + other
-
-    def stop(self):
-        self._server.shutdown()
-
-    @property
-    def url(self):
-        return f"{self.protocol}://{self.host}:{self.port}"
-
-    def join(self, url, allow_fragments=True):
-        return urljoin(self.url, url, allow_fragments=allow_fragments)
-
-
-class QuietWSGIRequestHandler(WSGIRequestHandler):
-    """
-    Silences all log messages from the WSGI server.
-    """
-
-    def log_message(self, *args, **kwargs):
-        return
-
-
-class MockApi:
-    """
-    WSGI app that returns responses from a stack.
-    """
-
-    QPS = 5
-
-    def __init__(self, responses=None, enforce_limit=True):
-        """
-        :param responses: If provided, should be a list of responses
-            for the server to respond with, in first in first out order.
-            Format should be ``list[tuple[status, serializable]]``,
-            where ``status`` is either an ``int`` or ``str``,
-            and ``serializable`` can be encoded by ``json.dumps``.
-
-        :param enforce_limit: If ``True``, the MockApi will return
-            a 429 whenever if there has been more than five requests
-            within the past second. This is an attempt to simulate
-            `Airtable's API limits <https://airtable.com/developers/web/api/rate-limits>`_.
-        """
-        self.canned_responses = responses or []
-        self.enforce_limit = enforce_limit
-        self.timestamps = deque(maxlen=self.QPS)  # limit is 5 requests/sec
-
-    def __call__(self, environ, start_response):
-        status, response = self.next_response()
-        start_response(status, [("Content-Type", "application/json")])
-        return [response]
-
-    def next_response(self):
-        if (
-            self.enforce_limit
-            and len(self.timestamps) == self.QPS
-            and (time.time() - self.timestamps[0] < 1)
-        ):
-            return ("429 Too Many Requests", b"")
-        if not self.canned_responses:
-            raise RuntimeError("MockApi.responses is empty")
-        self.timestamps.append(time.time())
-        status, jsondata = self.canned_responses.pop(0)
-        if isinstance(status, int):
-            status = f"{status} {HTTPStatus(status).phrase}"
-        response = b"" if jsondata is None else json.dumps(jsondata).encode("utf8")
-        return (status, response)
-
-
-@pytest.fixture(scope="session")
-def mock_endpoint_server():
-    """
-    Fixture that starts a simple WSGI server running in a separate thread.
-    Only created once per session; expects us to call `set_app()` on each test.
-    """
-    with Server(handler_class=QuietWSGIRequestHandler) as server:
-        yield server
-
-
-@pytest.fixture(autouse=True)
-def mock_endpoint(mock_endpoint_server):
-    """
-    Fixture that creates a MockApi and attaches it to the running server.
-    Sets ``autouse=True`` to ensure no cross-test pollution.
-    """
-    app = MockApi()
-    mock_endpoint_server.set_app(app)
-    return app
+# Ensure every test gets a fresh MockApi, so there is no cross-test pollution.
+pytestmark = pytest.mark.usefixtures("mock_endpoint")
 
 
 @pytest.fixture
 def table_with_retry_strategy(constants, mock_endpoint_server):
-    def _table_with_retry(retry_strategy):
+    def _table_with_retry(retry_strategy, **kwargs):
         api = Api(
             api_key=constants["API_KEY"],
             timeout=(0.1, 0.1),
             retry_strategy=retry_strategy,
             endpoint_url=mock_endpoint_server.url,
+            **kwargs,
         )
         return api.table(constants["BASE_ID"], constants["TABLE_NAME"])
 
@@ -255,3 +131,160 @@ def test_retry_during_iterate(table_with_retry_strategy, mock_endpoint):
 
     records = table.all()
     assert len(records) == page_count * per_page
+
+
+def test_retry_stats(table_with_retry_strategy, mock_endpoint, mock_response_single):
+    strategy = retry_strategy(status_forcelist=[429, 500], backoff_factor=0.01)
+    table = table_with_retry_strategy(strategy)
+    mock_endpoint.canned_responses = [
+        (429, None),
+        (500, None),
+        (429, None),
+        (200, mock_response_single),
+    ]
+    table.get("record")
+    stats = table.api.retry_stats
+    assert (stats.requests, stats.retries, stats.denied) == (1, 3, 0)
+    assert stats.by_status["429"].retries == 2
+    assert stats.by_status["500"].retries == 1
+    assert 0.03 <= stats.backoff < 2
+    assert stats.to_dict()["by_status"]["500"]["retries"] == 1
+    # each Api has its own budget, even if they share a strategy
+    assert Api("key", retry_strategy=strategy).retry_stats.requests == 0
+    assert Api("key", retry_strategy=None).retry_stats is None
+
+
+def test_retry_stats__shared_session(
+    table_with_retry_strategy, mock_endpoint, mock_response_single
+):
+    """
+    Test that requests are counted when every thread uses the same session.
+    """
+    strategy = retry_strategy(backoff_factor=0)
+    table = table_with_retry_strategy(strategy, thread_sessions=False)
+    mock_endpoint.canned_responses = [(429, None), (200, mock_response_single)] * 2
+    table.get("record")
+    table.get("record")
+    stats = table.api.retry_stats
+    assert (stats.requests, stats.retries) == (2, 2)
+
+
+def test_retry_budget__exhausted(table_with_retry_strategy, mock_endpoint):
+    strategy = retry_strategy(backoff_factor=0, retry_budget=0, retry_reserve=1)
+    table = table_with_retry_strategy(strategy)
+    mock_endpoint.canned_responses = [(429, None)] * 3
+    with pytest.raises(requests.exceptions.RetryError):
+        table.get("record")
+    assert len(mock_endpoint.requests) == 2
+    assert (table.api.retry_stats.retries, table.api.retry_stats.denied) == (1, 1)
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.5, reserve=2)
+    assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+    for _ in range(3):
+        budget.deposit()
+    assert [budget.withdraw() for _ in range(2)] == [True, False]
+    # the balance never exceeds the reserve
+    for _ in range(10):
+        budget.deposit()
+    assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+    assert (budget.stats.requests, budget.stats.retries, budget.stats.denied) == (
+        13,
+        5,
+        3,
+    )
+    unlimited = RetryBudget(ratio=None)
+    assert all(unlimited.withdraw() for _ in range(100))
+    assert repr(unlimited) == "<RetryBudget ratio=None reserve=10>"
+
+
+def test_decorrelated_jitter():
+    retry = AdaptiveRetry(backoff_factor=1, backoff_max=10)
+    waits = []
+    with mock.patch("random.uniform", side_effect=lambda low, high: high):
+        for _ in range(4):
+            retry = retry.increment("GET", "/", error=ConnectionError())
+            waits.append(retry.get_backoff_time())
+            assert retry.get_backoff_time() == waits[-1]
+    assert waits == [3, 9, 10, 10]
+
+    # waits never get shorter than the previous one
+    with mock.patch("random.uniform", side_effect=lambda low, high: low):
+        retry = retry.increment("GET", "/", error=ConnectionError())
+        assert retry.get_backoff_time() == 10
+    retry = AdaptiveRetry(backoff_factor=1, backoff_max=10)
+    with mock.patch("random.uniform", side_effect=lambda low, high: low):
+        for _ in range(3):
+            retry = retry.increment("GET", "/", error=ConnectionError())
+            assert retry.get_backoff_time() == 1
+
+
+def test_backoff_max__urllib3_v1():
+    """
+    urllib3 1.26 has no Retry.backoff_max, so we fall back to its default limit.
+    """
+    retry = AdaptiveRetry(backoff_factor=100, previous_backoff=100)
+    del retry.backoff_max
+    with mock.patch("random.uniform", side_effect=lambda low, high: high):
+        assert retry.get_backoff_time() == DEFAULT_BACKOFF_MAX
+
+
+@pytest.mark.parametrize(
+    "status,headers,penalty,expected",
+    [
+        (429, {"Retry-After": "5"}, 0, 5),
+        (429, {"Retry-After": "5"}, 30, 5),
+        (429, {}, 30, 30),
+        (429, {}, 0, 0),
+        (503, {}, 30, 0),
+    ],
+)
+def test_retry_after(status, headers, penalty, expected):
+    retry = AdaptiveRetry(backoff_factor=0, rate_limit_penalty=penalty)
+    response = HTTPResponse(status=status, headers=headers)
+    assert retry.wait_time(response) == expected
+
+
+def test_pool_stats(table_with_retry_strategy, mock_endpoint, mock_response_single):
+    table = table_with_retry_strategy(retry_strategy(backoff_factor=0))
+    mock_endpoint.canned_responses = [
+        (200, mock_response_single),
+        (429, None),
+        (200, mock_response_single),
+        (200, mock_response_single),
+    ]
+    for _ in range(3):
+        table.get("record")
+    stats = table.api.pool_stats
+    assert (stats.requests, stats.opened, stats.reused) == (4, 1, 3)
+    assert stats.to_dict()["reuse_rate"] == 0.75
+
+
+def test_pool_stats__discarded():
+    """
+    Test that connections which do not fit back into a full pool are counted.
+    """
+    api = Api("key", pool_maxsize=1)
+    adapter = api.session.get_adapter(api.endpoint_url)
+    pool = adapter.poolmanager.connection_from_url(api.endpoint_url)
+    connections = [pool._get_conn() for _ in range(2)]
+    for conn in connections:
+        pool._put_conn(conn)
+    assert (api.pool_stats.opened, api.pool_stats.discarded) == (2, 1)
+
+
+@pytest.mark.parametrize(
+    "kwargs,expected",
+    [
+        ({}, 10),
+        ({"pool_maxsize": 3}, 3),
+        ({"concurrency": AdaptiveConcurrency(maximum=40)}, 40),
+        ({"concurrency": AdaptiveConcurrency(maximum=40), "pool_maxsize": 50}, 50),
+    ],
+)
+def test_pool_maxsize(kwargs, expected):
+    api = Api("key", **kwargs)
+    adapter = api.session.get_adapter(api.endpoint_url)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == expected
+    assert adapter.socket_options is None
@@ -1,11 +1,15 @@
+import re
 from datetime import datetime, timezone
 from unittest import mock
 
 import pytest
-from requests import Request
+from requests import HTTPError, Request
 from requests_mock import Mocker
 
 from pyairtable import Api, Base, Table
+from pyairtable.api.cache import SchemaCache
+from pyairtable.api.table import _sort_key
+from pyairtable.exceptions import BatchError, SegmentedScanError
 from pyairtable.formulas import AND, EQ, Field
 from pyairtable.models.schema import TableSchema
 from pyairtable.testing import fake_attachment, fake_id, fake_record
@@ -162,6 +166,122 @@ def test_get(table: Table, mock_response_single):
     assert dict_equals(resp, mock_response_single)
 
 
+@pytest.fixture
+def mock_segments(table, requests_mock):
+    """
+    Simulates how Airtable would evaluate the formulas used by scan_parallel(),
+    returning only the records whose IDs belong to the requested bucket.
+    """
+    records = [fake_record({"n": n}) for n in range(300)]
+
+    def _respond(request, context):
+        formula = request.qs["filterByFormula"][0]
+        chars = re.search(r"FIND\(MID\(RECORD_ID\(\), 4, 1\), '(\w+)'\)", formula)
+        inside = formula.endswith(">0") or formula.endswith(">0)")
+        matched = [r for r in records if (r["id"][3] in chars[1]) == inside]
+        if sort := request.qs.get("sort[0][field]"):
+            descending = request.qs["sort[0][direction]"] == ["desc"]
+            matched.sort(key=lambda r: r["fields"][sort[0]], reverse=descending)
+        return {"records": matched}
+
+    m = requests_mock.get(table.urls.records, json=_respond)
+    m.records = records
+    # table.count() requests no fields, which is sent via POST
+    requests_mock.post(table.urls.records_post, json={"records": records})
+    return m
+
+
+@pytest.mark.parametrize("segments", [1, 4, 62])
+def test_scan_parallel(table: Table, mock_segments, segments):
+    result = table.scan_parallel(segments, verify=True)
+    assert mock_segments.call_count == segments + 1
+    assert sorted(r["id"] for r in result) == sorted(
+        r["id"] for r in mock_segments.records
+    )
+
+
+def test_scan_parallel__formula(table: Table, mock_segments):
+    table.scan_parallel(2, formula=EQ(Field("n"), 1), max_workers=1)
+    formulas = [r.qs["filterByFormula"][0] for r in mock_segments.request_history]
+    assert all(f.startswith("AND({n}=1, FIND(") for f in formulas)
+
+
+def test_scan_parallel__order(table: Table, mock_segments):
+    result = table.scan_parallel(4, order=True, sort=["-n"])
+    assert [r["fields"]["n"] for r in result] == list(range(299, -1, -1))
+
+
+def test_scan_parallel__formula_str(table: Table, mock_segments):
+    table.scan_parallel(2, formula="{n}=1")
+    formulas = [r.qs["filterByFormula"][0] for r in mock_segments.request_history]
+    assert all(f.startswith("AND({n}=1, FIND(") for f in formulas)
+
+
+@pytest.mark.parametrize(
+    "sort,expected",
+    [
+        (["Name"], [None, 3, 10, "apple", "Banana", "cherry"]),
+        (["-Name"], ["cherry", "Banana", "apple", 10, 3, None]),
+    ],
+)
+def test_sort_key(sort, expected):
+    """
+    Test that the order used by scan_parallel(order=True) puts blank values first,
+    ignores case in text, and compares values of different types as strings.
+    """
+    values = ["cherry", 10, None, "Banana", 3, "apple"]
+    records = [fake_record({"Name": value, "n": n}) for n, value in enumerate(values)]
+    result = sorted(records, key=_sort_key(sort))
+    assert [r["fields"]["Name"] for r in result] == expected
+
+
+def test_sort_key__ties():
+    records = [fake_record({"Name": name, "n": n}) for n, name in enumerate("aAaA")]
+    result = sorted(records, key=_sort_key(["Name"]))
+    assert [r["fields"]["n"] for r in result] == [0, 1, 2, 3]
+    result = sorted(records, key=_sort_key(["Name", "-n"]))
+    assert [r["fields"]["n"] for r in result] == [3, 2, 1, 0]
+
+
+def test_scan_parallel__verify(table: Table, requests_mock):
+    """
+    Test that verify=True detects segments which overlap.
+    """
+    requests_mock.get(table.urls.records, json={"records": [fake_record()]})
+    requests_mock.post(table.urls.records_post, json={"records": [fake_record()]})
+    assert len(table.scan_parallel(2)) == 3
+    with pytest.raises(SegmentedScanError):
+        table.scan_parallel(2, verify=True)
+
+
+def test_scan_parallel__verify_missing(table: Table, requests_mock):
+    """
+    Test that verify=True detects records which no segment returned.
+    """
+    requests_mock.get(table.urls.records, json={"records": []})
+    requests_mock.post(
+        table.urls.records_post,
+        json={"records": [fake_record() for _ in range(3)]},
+    )
+    assert table.scan_parallel(2) == []
+    with pytest.raises(SegmentedScanError, match="returned 0 records, but 3"):
+        table.scan_parallel(2, verify=True)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"segments": 0},
+        {"segments": 63},
+        {"max_records": 10},
+        {"order": True},
+    ],
+)
+def test_scan_parallel__invalid(table: Table, kwargs):
+    with pytest.raises(ValueError):
+        table.scan_parallel(**kwargs)
+
+
 def test_first(table: Table, mock_response_single):
     mock_response = {"records": [mock_response_single]}
     with Mocker() as mock:
@@ -304,7 +424,93 @@ def test_iterate__formula_conversion(table):
         options={
             "formula": "AND({Name}='Alice')",
         },
+        prefetch=0,
+    )
+
+
+def test_all__no_fields(table: Table, requests_mock):
+    """
+    Test that fields=[] is sent via POST, since an empty list cannot
+    be represented in a query string.
+    """
+    m = requests_mock.post(table.urls.records_post, json={"records": []})
+    assert table.all(fields=[]) == []
+    assert m.last_request.json() == {"fields": []}
+
+
+def test_page(table: Table, requests_mock):
+    records = [fake_record() for _ in range(3)]
+    m = requests_mock.get(
+        table.urls.records,
+        response_list=[
+            {"json": {"records": records[:2], "offset": "itr1/rec2"}},
+            {"json": {"records": records[2:]}},
+        ],
+    )
+    first = table.page(page_size=2, formula=EQ(Field("n"), 1))
+    assert first == {"records": records[:2], "offset": "itr1/rec2"}
+    assert m.last_request.qs == {"pageSize": ["2"], "filterByFormula": ["{n}=1"]}
+
+    second = table.page(first["offset"], page_size=2, formula=EQ(Field("n"), 1))
+    assert second == {"records": records[2:]}
+    assert m.last_request.qs["offset"] == ["itr1/rec2"]
+    assert m.call_count == 2
+
+
+def test_count(table: Table, requests_mock):
+    m = requests_mock.post(
+        table.urls.records_post,
+        response_list=[
+            {"json": {"records": [fake_record() for _ in range(100)], "offset": "o"}},
+            {"json": {"records": [fake_record() for _ in range(7)]}},
+        ],
+    )
+    assert table.count(EQ(Field("Status"), "Open"), view="Grid") == 107
+    assert m.call_count == 2
+    assert m.request_history[0].json() == {
+        "fields": [],
+        "pageSize": 100,
+        "filterByFormula": "{Status}='Open'",
+        "view": "Grid",
+    }
+    assert m.request_history[1].json()["offset"] == "o"
+
+
+def test_count__ttl(table: Table, requests_mock, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("pyairtable.api.table.time.monotonic", lambda: now)
+    m = requests_mock.post(
+        table.urls.records_post,
+        json={"records": [fake_record() for _ in range(3)]},
     )
+    assert table.count(ttl=60) == 3
+    # the cached count is shared with other instances of the same table
+    assert table.base.table(table.name).count(ttl=60) == 3
+    assert m.call_count == 1
+    # ...but not with other views or formulas, or callers that don't pass ttl=
+    table.count(view="Other", ttl=60)
+    table.count()
+    assert m.call_count == 3
+    now += 60
+    table.count(ttl=60)
+    assert m.call_count == 4
+
+
+def test_iterate__prefetch(table: Table, requests_mock):
+    pages = [[fake_record() for _ in range(3)] for _ in range(4)]
+    requests_mock.get(
+        table.urls.records,
+        response_list=[
+            {"json": {"records": page, "offset": f"ofs{n}"}}
+            for n, page in enumerate(pages[:-1], 1)
+        ]
+        + [{"json": {"records": pages[-1]}}],
+    )
+    with mock.patch.object(
+        table.api, "iterate_requests", wraps=table.api.iterate_requests
+    ) as m:
+        assert table.all(prefetch=2) == [r for page in pages for r in page]
+    assert m.call_args.kwargs["prefetch"] == 2
 
 
 def test_create(table: Table, mock_response_single):
@@ -443,6 +649,218 @@ def test_batch_delete(table: Table, container, mock_records):
     assert resp == expected
 
 
+def _echo_records(request, context):
+    """
+    requests_mock callback which returns the records it was sent, so that
+    responses do not depend on the order in which concurrent requests arrive.
+    """
+    records = request.json()["records"]
+    return {"records": [fake_record(record["fields"]) for record in records]}
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 4])
+def test_batch_create__max_workers(table: Table, requests_mock, max_workers):
+    records = [{"n": n} for n in range(45)]
+    m = requests_mock.post(table.urls.records, json=_echo_records)
+    resp = table.batch_create(iter(records), max_workers=max_workers)
+    assert [r["fields"] for r in resp] == records
+    assert m.call_count == 5
+
+
+def test_batch_update__max_workers(table: Table, requests_mock):
+    records = [fake_record({"n": n}) for n in range(45)]
+    requests_mock.patch(
+        table.urls.records,
+        json=lambda r, c: {
+            "records": [{**rec, "createdTime": NOW} for rec in r.json()["records"]]
+        },
+    )
+    resp = table.batch_update(records, max_workers=3)
+    assert [r["id"] for r in resp] == [r["id"] for r in records]
+
+
+def test_batch_delete__max_workers(table: Table, requests_mock):
+    ids = [fake_id() for _ in range(25)]
+
+    def _deleted(request, context):
+        return {
+            "records": [{"id": id_, "deleted": True} for id_ in request.qs["records[]"]]
+        }
+
+    requests_mock.delete(table.urls.records, json=_deleted)
+    resp = table.batch_delete(ids, max_workers=3)
+    assert [r["id"].lower() for r in resp] == [id_.lower() for id_ in ids]
+
+
+def test_batch_create__max_workers__error(table: Table, requests_mock):
+    """
+    Test that when one chunk fails, the other chunks are still sent and
+    BatchError reports which records were committed.
+    """
+    records = [{"n": n} for n in range(30)]
+
+    def _respond(request, context):
+        if request.json()["records"][0]["fields"]["n"] == 10:
+            context.status_code = 422
+            return {"error": {"type": "INVALID_VALUE_FOR_COLUMN"}}
+        return _echo_records(request, context)
+
+    m = requests_mock.post(table.urls.records, json=_respond)
+    with pytest.raises(BatchError) as excinfo:
+        table.batch_create(records, max_workers=3)
+
+    assert m.call_count == 3
+    exc = excinfo.value
+    assert sorted(exc.succeeded) == [0, 2]
+    assert list(exc.failed) == [1]
+    chunk, error = exc.failed[1]
+    assert list(chunk) == records[10:20]
+    assert isinstance(error, HTTPError)
+    assert "INVALID_VALUE_FOR_COLUMN" in str(exc)
+    assert [r["fields"] for r in exc.committed] == records[:10] + records[20:]
+
+
+def test_batch_upsert__max_workers__error(table: Table, requests_mock):
+    records = [{"fields": {"Name": str(n)}} for n in range(20)]
+    requests_mock.patch(
+        table.urls.records,
+        response_list=[
+            {"status_code": 500},
+            {"json": {"createdRecords": [], "updatedRecords": [], "records": []}},
+        ],
+    )
+    with pytest.raises(BatchError) as excinfo:
+        table.batch_upsert(records, key_fields=["Name"], max_workers=2)
+    assert len(excinfo.value.failed) == len(excinfo.value.succeeded) == 1
+
+
+@pytest.mark.parametrize("max_workers", [None, 3])
+def test_iter_batch_create(table: Table, requests_mock, max_workers):
+    """
+    Test that iter_batch_create pulls from a generator one chunk at a time
+    and yields each chunk's results in input order.
+    """
+    consumed = []
+
+    def _gen():
+        for n in range(95):
+            consumed.append(n)
+            yield {"n": n}
+
+    requests_mock.post(table.urls.records, json=_echo_records)
+    stream = table.iter_batch_create(_gen(), max_workers=max_workers)
+    first = next(stream)
+    assert [r["fields"]["n"] for r in first] == list(range(10))
+    assert len(consumed) <= 10 * (max_workers or 1)
+
+    rest = list(stream)
+    assert [len(chunk) for chunk in rest] == [10] * 8 + [5]
+    assert [r["fields"]["n"] for chunk in rest for r in chunk] == list(range(10, 95))
+
+
+def test_iter_batch_update(table: Table, requests_mock):
+    records = [fake_record({"n": n}) for n in range(15)]
+    m = requests_mock.put(
+        table.urls.records,
+        json=lambda r, c: {
+            "records": [{**rec, "createdTime": NOW} for rec in r.json()["records"]]
+        },
+    )
+    stream = table.iter_batch_update(iter(records), replace=True, typecast=True)
+    assert [len(chunk) for chunk in stream] == [10, 5]
+    assert m.call_count == 2
+    assert m.last_request.json()["typecast"] is True
+
+
+def test_iter_batch_upsert(table: Table, requests_mock):
+    records = ({"fields": {"Name": str(n)}} for n in range(15))
+
+    def _respond(request, context):
+        created = [fake_record(r["fields"]) for r in request.json()["records"]]
+        return {
+            "createdRecords": [r["id"] for r in created],
+            "updatedRecords": [],
+            "records": created,
+        }
+
+    requests_mock.patch(table.urls.records, json=_respond)
+    results = list(table.iter_batch_upsert(records, key_fields=["Name"]))
+    assert [len(result["createdRecords"]) for result in results] == [10, 5]
+    assert results[1]["records"][0]["fields"] == {"Name": "10"}
+
+
+def test_iter_batch_upsert__missing_field(table: Table, requests_mock):
+    """
+    Test that iter_batch_upsert validates key_fields for each chunk before sending it,
+    even though it cannot validate the entire input in advance.
+    """
+    records = [{"fields": {"Name": str(n)}} for n in range(15)]
+    records[12] = {"fields": {"Other": "x"}}
+    m = requests_mock.patch(
+        table.urls.records,
+        json={"createdRecords": [], "updatedRecords": [], "records": []},
+    )
+    stream = table.iter_batch_upsert(iter(records), key_fields=["Name"])
+    assert next(stream)
+    with pytest.raises(ValueError):
+        next(stream)
+    assert m.call_count == 1
+
+
+def test_iter_batch_upsert__missing_field__max_workers(table: Table, requests_mock):
+    """
+    Test that if a chunk fails validation while others are in flight,
+    the chunks which were committed are reported via BatchError.
+    """
+    records = [{"fields": {"Name": str(n)}} for n in range(25)]
+    records[22] = {"fields": {"Other": "x"}}
+    m = requests_mock.patch(
+        table.urls.records,
+        json={"createdRecords": [], "updatedRecords": [], "records": []},
+    )
+    stream = table.iter_batch_upsert(iter(records), key_fields=["Name"], max_workers=4)
+    with pytest.raises(BatchError) as excinfo:
+        list(stream)
+    assert m.call_count == 2
+    assert sorted(excinfo.value.succeeded) == [0, 1]
+    chunk, exc = excinfo.value.failed[2]
+    assert isinstance(exc, ValueError)
+    assert chunk[2] == {"fields": {"Other": "x"}}
+
+
+def test_iter_batch_upsert__missing_field__first_chunk(table: Table, requests_mock):
+    """
+    Test that if the first chunk fails validation, nothing is sent and
+    the original error is raised, since no chunks need to be reported.
+    """
+    records = [{"fields": {"Other": "x"}}] + [{"fields": {"Name": "y"}}] * 20
+    m = requests_mock.patch(table.urls.records, json={})
+    stream = table.iter_batch_upsert(iter(records), key_fields=["Name"], max_workers=4)
+    with pytest.raises(ValueError):
+        list(stream)
+    assert m.call_count == 0
+
+
+def test_iter_batch_create__max_workers__error(table: Table, requests_mock):
+    records = [{"n": n} for n in range(50)]
+
+    def _respond(request, context):
+        if request.json()["records"][0]["fields"]["n"] == 20:
+            context.status_code = 422
+            return {"error": {"type": "INVALID_VALUE_FOR_COLUMN"}}
+        return _echo_records(request, context)
+
+    requests_mock.post(table.urls.records, json=_respond)
+    yielded = []
+    with pytest.raises(BatchError) as excinfo:
+        for chunk in table.iter_batch_create(iter(records), max_workers=2):
+            yielded.append(chunk)
+
+    assert len(yielded) == 2
+    assert 2 in excinfo.value.failed
+    assert all(index > 2 for index in excinfo.value.succeeded)
+
+
 def test_create_field(table, mock_table_schema, requests_mock, sample_json):
     """
     Tests the API for creating a field (but without actually performing the operation).
@@ -453,8 +871,10 @@ def test_create_field(table, mock_table_schema, requests_mock, sample_json):
     )
 
     # Ensure we have pre-loaded our schema
+    table.api.schema_cache = SchemaCache()
     table.schema()
     assert mock_table_schema.call_count == 1
+    assert table.api.schema_cache.get(table.base.id)
 
     # Create the field
     choices = ["Todo", "In progress", "Done"]
@@ -484,6 +904,9 @@ def test_create_field(table, mock_table_schema, requests_mock, sample_json):
     assert table._schema.field(fld.id).name == "Status"
     assert mock_table_schema.call_count == 1
 
+    # ...but other Base/Table instances will need to retrieve the schema again
+    assert table.api.schema_cache.get(table.base.id) is None
+
 
 def test_delete_view(table, mock_table_schema, requests_mock):
     view = table.schema().view("Grid view")
@@ -5,12 +5,14 @@ Run with: pytest tests/test_client.py -v
 """
 
 import os
+import socket
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from pyairtable import AirtableClient
 from pyairtable.api import Api
+from pyairtable.api.ratelimit import FileRateLimiter, RateLimiter
 
 
 class TestAirtableClient:
@@ -68,6 +70,44 @@ class TestAirtableClient:
         # The API should be initialized
         assert isinstance(client._api, Api)
     
+    def test_init_with_rate_limit(self):
+        """Test that rate_limit is passed through to the Api."""
+        limiter = RateLimiter()
+        client = AirtableClient(
+            token="patTEST123",
+            base_id="appTEST123",
+            rate_limit=limiter,
+        )
+
+        assert client._api.rate_limiter is limiter
+
+    def test_init_with_rate_limit_dir_env(self, tmp_path):
+        """Test that AIRTABLE_RATE_LIMIT_DIR enables a cross-process limiter."""
+        with patch.dict(os.environ, {
+            "AIRTABLE_TOKEN": "patENV123",
+            "AIRTABLE_BASE_ID": "appENV123",
+            "AIRTABLE_RATE_LIMIT_DIR": str(tmp_path),
+        }, clear=True):
+            client = AirtableClient()
+
+        assert isinstance(client._api.rate_limiter, FileRateLimiter)
+        assert client._api.rate_limiter.directory == tmp_path
+
+    def test_init_with_pool_settings(self):
+        """Test that connection pool settings are passed to the session's adapter."""
+        client = AirtableClient(
+            token="patTEST123",
+            base_id="appTEST123",
+            pool_maxsize=25,
+            pool_block=True,
+            tcp_keepalive=30,
+        )
+
+        adapter = client._api.session.get_adapter("https://api.airtable.com")
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 25
+        assert adapter.poolmanager.connection_pool_kw["block"] is True
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in adapter.socket_options
+
     def test_init_with_verify_ssl_param(self):
         """Test that verify_ssl parameter disables TLS verification."""
         client = AirtableClient(
@@ -103,6 +143,41 @@ class TestAirtableClient:
 
         assert client._api.session.verify == str(bundle)
 
+    def test_init_with_verify_ssl_env_enabled(self):
+        """Test that AIRTABLE_VERIFY_SSL can explicitly enable TLS verification."""
+        with patch.dict(os.environ, {
+            "AIRTABLE_TOKEN": "patENV123",
+            "AIRTABLE_BASE_ID": "appENV123",
+            "AIRTABLE_VERIFY_SSL": "on",
+        }, clear=True):
+            client = AirtableClient()
+
+        assert client._api.session.verify is True
+        assert client.verify_ssl is True
+
+    def test_init_with_suppressed_ssl_warnings(self):
+        """Test that AIRTABLE_SUPPRESS_SSL_WARNINGS silences urllib3's warnings."""
+        with patch.dict(os.environ, {
+            "AIRTABLE_TOKEN": "patENV123",
+            "AIRTABLE_BASE_ID": "appENV123",
+            "AIRTABLE_SUPPRESS_SSL_WARNINGS": "yes",
+        }, clear=True), patch("urllib3.disable_warnings") as disable_warnings:
+            AirtableClient(verify_ssl=False)
+
+        disable_warnings.assert_called_once()
+
+    def test_init_with_missing_ca_bundle(self, tmp_path):
+        """Test that a CA bundle which does not exist is ignored."""
+        with patch.dict(os.environ, {
+            "AIRTABLE_TOKEN": "patENV123",
+            "AIRTABLE_BASE_ID": "appENV123",
+            "AIRTABLE_CA_BUNDLE": str(tmp_path / "missing.pem"),
+        }, clear=True):
+            client = AirtableClient()
+
+        assert client.ca_bundle is None
+        assert client._api.session.verify is True
+
     def test_repr(self):
         """Test string representation of client."""
         client = AirtableClient(token="patTEST123", base_id="appTEST123")
@@ -149,7 +224,8 @@ class TestAirtableClientMethods:
             filters="{Status} = 'Active'",
             fields=["Name", "Email"],
             sort=[("Name", "asc")],
-            max_records=10
+            max_records=10,
+            view="Grid view",
         )
         
         call_kwargs = mock_table.all.call_args[1]
@@ -157,6 +233,7 @@ class TestAirtableClientMethods:
         assert call_kwargs["fields"] == ["Name", "Email"]
         assert call_kwargs["sort"] == ["Name:asc"]
         assert call_kwargs["max_records"] == 10
+        assert call_kwargs["view"] == "Grid view"
     
     def test_create_record(self, client, mock_table):
         """Test create_record."""
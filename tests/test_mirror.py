@@ -0,0 +1,283 @@
+import json
+import sqlite3
+
+import pytest
+
+from pyairtable import Api
+from pyairtable.mirror import Mirror, MirroredTable
+from pyairtable.sync import SyncResult
+from pyairtable.testing import fake_id, fake_record
+
+TABLE_ID = fake_id("tbl")
+
+
+@pytest.fixture
+def schema():
+    return {
+        "id": TABLE_ID,
+        "name": "Incidents",
+        "primaryFieldId": "fldName",
+        "views": [],
+        "fields": [
+            {"id": "fldName", "name": "Name", "type": "singleLineText"},
+            {"id": "fldSite", "name": "Site", "type": "singleLineText"},
+            {
+                "id": "fldHours",
+                "name": "Hours",
+                "type": "number",
+                "options": {"precision": 1},
+            },
+            {
+                "id": "fldDone",
+                "name": "Done",
+                "type": "checkbox",
+                "options": {"color": "greenBright", "icon": "check"},
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def server(base, schema, requests_mock):
+    """
+    Simulates the base schema and list records endpoints.
+    """
+
+    class Server:
+        records = [
+            fake_record(Name="A", Site="North", Hours=2.5, Done=True),
+            fake_record(Name="B", Site="South", Hours=1),
+            fake_record(Name="C", Site="North", Hours=4),
+            fake_record(Name="D", Site="East"),
+        ]
+        changed = []
+
+    def _list(request, context):
+        if request.method == "POST":
+            return {"records": [{**r, "fields": {}} for r in Server.records]}
+        formula = request.qs.get("filterByFormula", [""])[0]
+        if "LAST_MODIFIED_TIME()" in formula:
+            return {"records": Server.changed}
+        return {"records": Server.records}
+
+    url = base.table(TABLE_ID).urls
+    Server.schema = requests_mock.get(
+        base.urls.tables + "?include=visibleFieldIds",
+        json={"tables": [schema]},
+    )
+    Server.get = requests_mock.get(url.records, json=_list)
+    Server.post = requests_mock.post(url.records_post, json=_list)
+    return Server
+
+
+@pytest.fixture
+def mirror(base, server, tmp_path):
+    mirror = Mirror(base, tmp_path / "mirror.sqlite3", deletion_interval=0)
+    yield mirror
+    mirror.close()
+
+
+def names(records):
+    return [record["fields"]["Name"] for record in records]
+
+
+def test_query(mirror, server):
+    table = mirror.table("Incidents", indexes=["Site"])
+    assert names(table.query()) == ["A", "B", "C", "D"]
+    assert names(table.query({"Site": "North"})) == ["A", "C"]
+    assert names(table.query({"Site": ["South", "East"]})) == ["B", "D"]
+    assert names(table.query({"Hours": None})) == ["D"]
+    assert names(table.query({"Done": True})) == ["A"]
+    assert names(table.query(filters=[("Hours", ">=", 2.5)])) == ["A", "C"]
+    assert names(table.query(filters=[("Name", "!=", "A")])) == ["B", "C", "D"]
+    assert names(table.query(sort=["-Hours"])) == ["C", "A", "B", "D"]
+    assert names(table.query(sort=["Site", "-Name"])) == ["D", "C", "A", "B"]
+    assert names(table.query(sort=["Name"], limit=2, offset=1)) == ["B", "C"]
+    assert names(table.query(sort=["Name"], offset=3)) == ["D"]
+    assert table.get(server.records[1]["id"]) == server.records[1]
+    assert table.get(fake_id()) is None
+    # everything after the first query was served from the mirror
+    assert server.get.call_count == 1
+
+
+def test_iterate(mirror, server):
+    table = mirror.table("Incidents")
+    pages = table.iterate(page_size=3)
+    assert [names(page) for page in pages] == [["A", "B", "C"], ["D"]]
+    pages = table.iterate({"Site": "North"}, sort=["-Name"], page_size=1)
+    assert [names(page) for page in pages] == [["C"], ["A"]]
+    pages = table.iterate(filters=[("Hours", ">", 0)], limit=2)
+    assert [names(page) for page in pages] == [["A", "B"]]
+    assert server.get.call_count == 1
+
+
+def test_query__invalid(mirror):
+    table = mirror.table("Incidents")
+    with pytest.raises(ValueError):
+        table.query(filters=[("Name", "; DROP TABLE", "A")])
+    with pytest.raises(KeyError):
+        table.query({"Missing": 1})
+
+
+def test_aggregate(mirror):
+    table = mirror.table(TABLE_ID)
+    assert table.count() == 4
+    assert table.count({"Site": "North"}) == 2
+    assert table.aggregate("Hours", "sum") == 7.5
+    assert table.aggregate("Hours", "max", filters=[("Site", "=", "South")]) == 1
+    assert table.aggregate("Hours", "sum", group_by="Site") == {
+        "East": None,
+        "North": 6.5,
+        "South": 1,
+    }
+    with pytest.raises(ValueError):
+        table.aggregate("Hours", "median")
+
+
+def test_aggregate__group_by_json(mirror, server, schema):
+    """
+    Test that grouping by fields whose values are stored as JSON returns keys
+    which can be used in a dict.
+    """
+    schema["fields"] += [
+        {
+            "id": "fldTags",
+            "name": "Tags",
+            "type": "multipleSelects",
+            "options": {"choices": []},
+        },
+        {"id": "fldOwner", "name": "Owner", "type": "singleCollaborator"},
+    ]
+    owner = {"id": "usrX", "email": "x@example.com", "name": "X"}
+    server.records = [
+        fake_record(Name="[draft] A", Tags=["a", "b"], Owner=owner),
+        fake_record(Name="B", Tags=["a", "b"]),
+    ]
+    table = mirror.table("Incidents")
+    assert table.aggregate(None, "count", group_by="Tags") == {("a", "b"): 2}
+    assert table.aggregate(None, "count", group_by="Name") == {"B": 1, "[draft] A": 1}
+    assert table.aggregate(None, "count", group_by="Owner") == {
+        None: 1,
+        json.dumps(owner): 1,
+    }
+
+
+def test_refresh(mirror, server):
+    table = mirror.table("Incidents")
+    assert table.synced_at is None
+    result = table.refresh()
+    assert result.full
+    assert len(result.created) == 4
+    assert table.synced_at is not None
+
+    # refreshes within max_age are skipped
+    assert table.refresh(max_age=60) == SyncResult()
+    assert server.get.call_count == 1
+
+    updated = fake_record(Name="B", Site="West", Hours=3, id=server.records[1]["id"])
+    server.changed = [updated]
+    server.records[1] = updated
+    deleted = server.records.pop()
+    result = table.refresh()
+    assert result == SyncResult(updated=[updated["id"]], deleted=[deleted["id"]])
+    assert server.post.call_count == 1
+    assert names(table.query({"Site": "West"})) == ["B"]
+    assert table.count() == 3
+
+
+def test_refresh__new_field(mirror, server, schema):
+    """
+    Test that a field which is added to the table after the mirror is created
+    gets its own column once a record containing it is retrieved.
+    """
+    table = mirror.table("Incidents")
+    table.refresh()
+    schema["fields"].append(
+        {"id": "fldNotes", "name": "Notes", "type": "multilineText"}
+    )
+    server.changed = [fake_record(Name="E", Notes="new")]
+    table.refresh()
+    assert names(table.query({"Notes": "new"})) == ["E"]
+
+
+def test_shared_file(base, server, tmp_path):
+    """
+    Test that a second mirror (e.g. in another process) sees data written by the first.
+    """
+    path = tmp_path / "shared.sqlite3"
+    Mirror(base, path).table("Incidents").refresh()
+    other = Mirror(base, path, max_age=60)
+    assert other.table("Incidents").count() == 4
+    assert server.get.call_count == 1
+
+
+def test_refresh__concurrent(base, server, tmp_path, requests_mock):
+    """
+    Test that the database is not locked while records are retrieved from Airtable,
+    and that a refresh which finishes after a more recent one is discarded.
+    """
+    path = tmp_path / "shared.sqlite3"
+    table = Mirror(base, path).table("Incidents")
+    table.refresh()
+    # another process, with its own connection to Airtable
+    other_api = Api(base.api.api_key)
+    other = Mirror(other_api.base(base.id), path).table("Incidents")
+    server.changed = [fake_record(Name="E")]
+    fetches = []
+
+    def _list_changed(request, context):
+        fetches.append(request)
+        if len(fetches) == 1:
+            conn = sqlite3.connect(path, timeout=0)
+            conn.execute("BEGIN IMMEDIATE")  # raises if the write lock is held
+            conn.execute("ROLLBACK")
+            conn.close()
+            other.refresh()
+        return {"records": server.changed}
+
+    requests_mock.get(table.table.urls.records, json=_list_changed)
+    assert table.refresh() == SyncResult()
+    assert other.count() == 5
+    assert len(fetches) == 2
+
+
+def test_options(base, server):
+    mirror = Mirror(base, ":memory:", max_age=None)
+    table = mirror.table("Incidents", view="Open")
+    assert table.count() == 0
+    table.refresh()
+    assert server.get.last_request.qs == {"view": ["Open"]}
+    with pytest.raises(ValueError):
+        MirroredTable(mirror, table.table, sort=["Name"])
+
+
+def test_write__rollback(mirror, server):
+    table = mirror.table("Incidents")
+    table.refresh()
+    with pytest.raises(RuntimeError):
+        with mirror._write() as conn:
+            conn.execute(f"DELETE FROM {table._sql_name}")
+            raise RuntimeError
+    assert table.count() == 4
+
+
+def test_repr(base, mirror, server, tmp_path):
+    path = str(tmp_path / "mirror.sqlite3")
+    assert repr(mirror) == f"<Mirror base={base.id!r} path={path!r}>"
+    table = mirror.table("Incidents")
+    assert repr(table) == f"<MirroredTable {TABLE_ID!r} path={path!r}>"
+    with pytest.raises(ValueError):
+        MirroredTable(mirror, base.table("Bad Name"))
+
+
+def test_store_discard(mirror, server):
+    table = mirror.table("Incidents")
+    table.refresh()
+    created = fake_record(Name="E", Site="North")
+    table.store([created])
+    table.discard([server.records[0]["id"]])
+    assert names(table.query({"Site": "North"})) == ["C", "E"]
+    # updated records keep their position
+    table.store([{**server.records[2], "fields": {"Name": "C2", "Site": "North"}}])
+    assert names(table.query({"Site": "North"})) == ["C2", "E"]
+    assert server.get.call_count == 1
@@ -6,6 +6,7 @@ from operator import attrgetter
 import pytest
 
 import pyairtable.models.webhook
+from pyairtable.api.cache import SchemaCache
 from pyairtable.models.webhook import Webhook, WebhookNotification, WebhookPayload
 
 
@@ -150,6 +151,34 @@ def test_payloads(webhook: Webhook, requests_mock, payload_json, test_case):
     assert request_cursors == [[str(n)] for n in test_case["expect_cursors"]]
 
 
+def test_payloads__prefetch(webhook: Webhook, requests_mock, payload_json):
+    """
+    Test that prefetching pages does not change which payloads are returned,
+    even if it requests a page beyond the last one.
+    """
+    pages = [
+        [{**payload_json, "baseTransactionNumber": n} for n in (1, 2)],
+        [{**payload_json, "baseTransactionNumber": n} for n in (3, 4)],
+        [{**payload_json, "baseTransactionNumber": 5}],
+    ]
+    requests_mock.get(
+        webhook._url + "/payloads",
+        response_list=[
+            {
+                "json": {
+                    "cursor": page[-1]["baseTransactionNumber"] + 1,
+                    "mightHaveMore": index < len(pages),
+                    "payloads": page,
+                }
+            }
+            for index, page in enumerate(pages, 1)
+        ]
+        + [{"json": {"cursor": 6, "mightHaveMore": False, "payloads": []}}] * 3,
+    )
+    payloads = list(webhook.payloads(prefetch=2))
+    assert [p.cursor for p in payloads] == [1, 2, 3, 4, 5]
+
+
 @pytest.mark.parametrize("argname", ["cursor", "limit"])
 def test_payloads__invalid_args(webhook: Webhook, requests_mock, argname):
     with pytest.raises(ValueError):
@@ -174,6 +203,49 @@ def test_payloads__stop_on_empty_list(webhook: Webhook, requests_mock, payload_j
     assert len(payloads) == 1
 
 
+@pytest.mark.parametrize(
+    "changes,expected",
+    [
+        ({}, False),
+        ({"destroyedTableIds": ["tbl00000000000000"]}, True),
+        ({"createdTablesById": {"tbl00000000000000": {}}}, True),
+        (
+            {
+                "changedTablesById": {
+                    "tbl00000000000000": {"changedRecordsById": {}},
+                }
+            },
+            False,
+        ),
+        (
+            {
+                "changedTablesById": {
+                    "tbl00000000000000": {"destroyedFieldIds": ["fld00000000000000"]},
+                }
+            },
+            True,
+        ),
+    ],
+)
+def test_payloads__schema_cache(
+    webhook: Webhook, api, base, requests_mock, payload_json, changes, expected
+):
+    """
+    Test that payloads which report schema changes invalidate the API's schema cache.
+    """
+    payload_json.pop("destroyedTableIds")
+    payload_json.update(changes)
+    requests_mock.get(
+        webhook._url + "/payloads",
+        json={"cursor": 2, "mightHaveMore": False, "payloads": [payload_json]},
+    )
+    api.schema_cache = SchemaCache()
+    api.schema_cache.set(base.id, {"tables": []})
+    (payload,) = webhook.payloads()
+    assert payload.changes_schema is expected
+    assert (api.schema_cache.get(base.id) is None) is expected
+
+
 @pytest.mark.parametrize("secret", [b"secret-key", "c2VjcmV0LWtleQ=="])
 def test_notification_from_request(secret):
     notification_json = {
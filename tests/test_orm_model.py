@@ -243,6 +243,7 @@ def test_from_ids(mock_api):
                 "OR(%s)" % ", ".join(f"RECORD_ID()='{id}'" for id in sorted(fake_ids))
             ),
         },
+        prefetch=0,
     )
     assert len(contacts) == len(fake_records)
     assert {c.id for c in contacts} == {r["id"] for r in fake_records}
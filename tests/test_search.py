@@ -0,0 +1,106 @@
+import pytest
+
+from pyairtable.formulas import to_formula_str
+from pyairtable.search import SearchIndex, search_formula, searchable_fields
+from pyairtable.sync import SyncResult
+from pyairtable.testing import fake_record
+
+
+@pytest.fixture
+def records():
+    return [
+        fake_record(Name="Slip near loading bay", Site="North", Hours=2),
+        fake_record(Name="Trip hazard", Site="South", Tags=["Floor", "Slippery"]),
+        fake_record(Name="Ladder inspection", Site="North", Done=True),
+        fake_record(Name="Spill", Owner={"id": "usr1", "name": "Alice Smith"}),
+    ]
+
+
+def names(records):
+    return [record["fields"]["Name"] for record in records]
+
+
+def test_searchable_fields(table_schema):
+    assert searchable_fields(table_schema) == [
+        field.name
+        for field in table_schema.fields
+        if field.type in ("singleLineText", "multilineText", "singleSelect")
+        or field.type in ("email", "url", "phoneNumber", "richText", "multipleSelects")
+    ]
+
+
+def test_search_formula():
+    formula = search_formula(" Slip  HAZARD ", ["Name", "Notes"])
+    assert to_formula_str(formula) == (
+        "AND("
+        "OR(SEARCH('slip', LOWER({Name})), SEARCH('slip', LOWER({Notes}))), "
+        "OR(SEARCH('hazard', LOWER({Name})), SEARCH('hazard', LOWER({Notes})))"
+        ")"
+    )
+
+
+@pytest.mark.parametrize("query,fields", [("", ["Name"]), ("slip", [])])
+def test_search_formula__invalid(query, fields):
+    with pytest.raises(ValueError):
+        search_formula(query, fields)
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("slip", ["Slip near loading bay", "Trip hazard"]),
+        ("SLIP north", ["Slip near loading bay"]),
+        ("north", ["Slip near loading bay", "Ladder inspection"]),
+        ("alice", ["Spill"]),
+        ("2", ["Slip near loading bay"]),
+        ("true", []),
+        ("slip south north", []),
+        ("", ["Slip near loading bay", "Trip hazard", "Ladder inspection", "Spill"]),
+    ],
+)
+def test_search(records, query, expected):
+    assert names(SearchIndex(records).search(query)) == expected
+
+
+def test_search__limit(records):
+    assert names(SearchIndex(records).search("", limit=2)) == [
+        "Slip near loading bay",
+        "Trip hazard",
+    ]
+
+
+def test_search__fields(records):
+    index = SearchIndex(records, fields=["Name"])
+    assert names(index.search("slip")) == ["Slip near loading bay"]
+    assert index.search("north") == []
+
+
+def test_add_remove(records):
+    index = SearchIndex(records)
+    changed = fake_record(Name="Slip resolved", id=records[0]["id"])
+    index.add(changed)
+    index.remove(records[1]["id"])
+    index.remove("recDoesNotExist")
+    assert len(index) == 3
+    assert repr(index) == f"<SearchIndex records=3 words={len(index._words)}>"
+    assert records[1]["id"] not in index
+    assert index.search("slip") == [changed]
+    assert index.search("loading") == []
+    # words no longer used by any record are dropped entirely
+    assert "loading" not in index._postings
+    assert "trip" not in index._words
+
+
+def test_apply(records):
+    index = SearchIndex(records)
+    created = fake_record(Name="New slip")
+    updated = fake_record(Name="Ladder replaced", id=records[2]["id"])
+    source = {r["id"]: r for r in (created, updated)}
+    result = SyncResult(
+        created=[created["id"]],
+        updated=[updated["id"]],
+        deleted=[records[0]["id"]],
+    )
+    index.apply(result, source)
+    assert names(index.search("slip")) == ["Trip hazard", "New slip"]
+    assert names(index.search("ladder")) == ["Ladder replaced"]
@@ -0,0 +1,73 @@
+"""
+Tests for the dashboard's record listing in server.py.
+"""
+
+import json
+
+import pytest
+
+from pyairtable.mirror import Mirror, MirroredTable
+from pyairtable.testing import fake_id, fake_record
+
+pytest.importorskip("flask")
+
+TABLE_ID = fake_id("tbl")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # server.py reads its configuration from the environment when imported
+    monkeypatch.delenv("AIRTABLE_API_TOKEN", raising=False)
+    monkeypatch.delenv("AIRTABLE_VERIFY_SSL", raising=False)
+    import server
+
+    monkeypatch.setattr(server, "AIRTABLE_CONNECTED", True)
+    return server
+
+
+@pytest.fixture
+def mirror(base, requests_mock, tmp_path):
+    schema = {
+        "id": TABLE_ID,
+        "name": "Incidents",
+        "primaryFieldId": "fldName",
+        "views": [],
+        "fields": [
+            {"id": "fldName", "name": "Name", "type": "singleLineText"},
+            {"id": "fldSite", "name": "Site", "type": "singleLineText"},
+        ],
+    }
+    requests_mock.get(
+        base.urls.tables + "?include=visibleFieldIds",
+        json={"tables": [schema]},
+    )
+    records = [fake_record(Name=str(n), Site="North") for n in range(5)]
+    requests_mock.get(base.table(TABLE_ID).urls.records, json={"records": records})
+    mirror = Mirror(base, tmp_path / "mirror.sqlite3")
+    yield mirror
+    mirror.close()
+
+
+def test_get_records__mirror(server, mirror, monkeypatch):
+    """
+    Test that records are read from the mirror and sent one page at a time.
+    """
+    monkeypatch.setattr(server, "mirror", mirror)
+    monkeypatch.setattr(server, "MIRROR_PAGE_SIZE", 2)
+    monkeypatch.setattr(
+        MirroredTable, "query", lambda *_, **__: pytest.fail("loaded the whole table")
+    )
+    client = server.app.test_client()
+    response = client.get("/api/tables/Incidents/records?fields=Name", buffered=False)
+    chunks = [chunk for chunk in response.response if chunk]
+    # the opening of the JSON object, three pages of records, and the closing
+    assert len(chunks) == 5
+    data = json.loads(b"".join(chunks))
+    assert [r["fields"] for r in data["records"]] == [
+        {"Name": str(n)} for n in range(5)
+    ]
+    assert data["count"] == 5
+
+    response = client.get("/api/tables/Incidents/records?max_records=3&format=ndjson")
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["fields"]["Name"] for line in lines] == ["0", "1", "2"]
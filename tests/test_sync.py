@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pyairtable.sync import SyncResult, TableSnapshot
+from pyairtable.testing import fake_record
+
+
+@pytest.fixture
+def server(table, requests_mock):
+    """
+    Simulates the list records endpoint. ``changed`` are returned by any
+    request with a LAST_MODIFIED_TIME() formula; ``records`` are returned otherwise.
+    """
+
+    class Server:
+        records = [fake_record({"n": n}) for n in range(5)]
+        changed = []
+
+    def _list(request, context):
+        if request.method == "POST":
+            body = request.json()
+            assert body["fields"] == []
+            return {"records": [{**r, "fields": {}} for r in Server.records]}
+        formula = request.qs.get("filterByFormula", [""])[0]
+        if "LAST_MODIFIED_TIME()" in formula:
+            return {"records": Server.changed}
+        if "RECORD_ID()" in formula:
+            return {"records": [r for r in Server.records if f"'{r['id']}'" in formula]}
+        return {"records": Server.records}
+
+    Server.get = requests_mock.get(table.urls.records, json=_list)
+    Server.post = requests_mock.post(table.urls.records_post, json=_list)
+    return Server
+
+
+def test_refresh(table, server):
+    snapshot = TableSnapshot(table, deletion_interval=None)
+    result = snapshot.refresh()
+    assert result.full
+    assert result.created == [r["id"] for r in server.records]
+    assert snapshot.all() == server.records
+    assert len(snapshot) == 5
+    assert server.records[0]["id"] in snapshot
+    assert snapshot.get(server.records[0]["id"]) == server.records[0]
+    assert snapshot.watermark is not None
+
+    # the next refresh only retrieves changes since the watermark
+    updated = fake_record({"n": 100}, id=server.records[0]["id"])
+    created = fake_record({"n": 5})
+    server.changed = [updated, created]
+    result = snapshot.refresh()
+    assert result == SyncResult(created=[created["id"]], updated=[updated["id"]])
+    assert server.get.call_count == 2
+    assert server.post.call_count == 0
+    assert snapshot.get(updated["id"]) == updated
+    assert len(snapshot) == 6
+
+    formula = server.get.last_request.qs["filterByFormula"][0]
+    assert formula.startswith("OR(IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE(")
+
+
+def test_refresh__no_changes(table, server):
+    snapshot = TableSnapshot(table, deletion_interval=None)
+    assert repr(snapshot) == (
+        f"<TableSnapshot table={table.name!r} records=0 watermark=None>"
+    )
+    snapshot.refresh()
+    assert not snapshot.refresh()
+    assert repr(snapshot).startswith(
+        f"<TableSnapshot table={table.name!r} records=5 watermark=datetime."
+    )
+
+
+def test_refresh__watermark(table, server):
+    snapshot = TableSnapshot(table, clock_skew=30)
+    before = datetime.now(timezone.utc)
+    snapshot.refresh()
+    assert before - timedelta(seconds=31) < snapshot.watermark < before
+
+
+def test_refresh__deletions(table, server):
+    """
+    Test that deleted records are detected via an ID-only request, and that
+    records which appear in that request without having been modified are fetched.
+    """
+    snapshot = TableSnapshot(table, deletion_interval=0)
+    snapshot.refresh()
+    deleted = server.records.pop(1)
+    appeared = fake_record({"n": 6})
+    server.records.append(appeared)
+
+    result = snapshot.refresh()
+    assert result == SyncResult(created=[appeared["id"]], deleted=[deleted["id"]])
+    assert server.post.call_count == 1
+    assert snapshot.all()[-1] == appeared
+    assert deleted["id"] not in snapshot
+
+
+def test_refresh__deletion_interval(table, server, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("pyairtable.sync.time.monotonic", lambda: now)
+    snapshot = TableSnapshot(table)  # checks for deletions every five minutes
+    snapshot.refresh()
+    snapshot.refresh()
+    assert server.post.call_count == 0
+    now += 300
+    snapshot.refresh()
+    assert server.post.call_count == 1
+
+
+def test_refresh__full(table, server):
+    snapshot = TableSnapshot(table, deletion_interval=None)
+    snapshot.refresh()
+    deleted = server.records.pop()
+    result = snapshot.refresh(full=True)
+    assert result == SyncResult(deleted=[deleted["id"]], full=True)
+    assert snapshot.all() == server.records
+
+
+def test_options(table, server):
+    snapshot = TableSnapshot(table, deletion_interval=0, view="Open", formula="{n} > 1")
+    snapshot.refresh()
+    snapshot.refresh()
+    first, second = server.get.request_history
+    assert first.qs == {"view": ["Open"], "filterByFormula": ["{n} > 1"]}
+    assert second.qs["filterByFormula"][0].startswith("AND({n} > 1, OR(")
+    assert server.post.last_request.json() == {
+        "view": "Open",
+        "filterByFormula": "{n} > 1",
+        "fields": [],
+        "pageSize": 100,
+    }
+
+
+@pytest.mark.parametrize("kwargs", [{"sort": ["n"]}, {"max_records": 1}])
+def test_options__invalid(table, kwargs):
+    with pytest.raises(ValueError):
+        TableSnapshot(table, **kwargs)
@@ -50,6 +50,28 @@ def test_attachment():
         }
 
 
+@pytest.mark.parametrize("container", [list, tuple, iter])
+def test_chunked(container):
+    chunks = utils.chunked(container(range(7)), 3)
+    assert [list(chunk) for chunk in chunks] == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_chunked__lazy():
+    """
+    Test that chunked() does not consume more of an iterator than it needs to.
+    """
+    consumed = []
+
+    def _gen():
+        for n in range(100):
+            consumed.append(n)
+            yield n
+
+    chunks = utils.chunked(_gen(), 10)
+    assert next(chunks) == list(range(10))
+    assert len(consumed) == 10
+
+
 @pytest.mark.parametrize(
     "func,value,expected",
     [